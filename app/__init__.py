@@ -6,15 +6,26 @@ from dotenv import load_dotenv
 from .config import load_config
 from .db import init_db
 from .services.events import register_event_logging
+from .services.timing import register_request_timing
+from .services.metrics import register_metrics
+from .services.profiler import register_profiling
+from .services.http_cache import register_http_caching
+from .services.payload import FastJSONProvider, register_compression
+from .services.tmdb_replay import record_command
+from .services.warmup import register_warmup
+from .services.maintenance import COMMANDS as maintenance_commands
+from .services.event_partitions import events_cli
 
 from .blueprints.pages import bp as pages_bp
 from .blueprints.auth import bp as auth_bp
 from .blueprints.api import bp as api_bp
+from .blueprints.images import bp as images_bp
 
 def create_app():
     load_dotenv()
 
     app = Flask(__name__, template_folder="templates", static_folder="static")
+    app.json = FastJSONProvider(app)
     load_config(app)
     app.secret_key = app.config["SECRET_KEY"]
 
@@ -25,10 +36,23 @@ def create_app():
     )
 
     init_db()
+    # after_request ters sırada çalışır: önce ETag/304, sonra sıkıştırma,
+    # olay kaydı, Server-Timing, /metrics (nihai durum kodu) ve profiler
+    register_profiling(app)
+    register_metrics(app)
+    register_request_timing(app)
     register_event_logging(app)
+    register_compression(app)
+    register_http_caching(app)
 
     app.register_blueprint(pages_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(api_bp)
+    app.register_blueprint(images_bp)
+    app.cli.add_command(record_command)
+    app.cli.add_command(events_cli)
+    for cmd in maintenance_commands:
+        app.cli.add_command(cmd)
+    register_warmup(app)
 
     return app
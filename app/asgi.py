@@ -0,0 +1,175 @@
+# app/asgi.py
+"""Opsiyonel ASGI modu.
+
+I/O ağırlıklı, oturum gerektirmeyen JSON uçları async handler olarak çalışır
+(httpx + psycopg AsyncConnectionPool); diğer tüm rotalar mevcut Flask
+uygulamasına WSGI köprüsüyle devredilir. Köprülenen rotalar asgiref'in
+varsayılanı olan tek paylaşılan thread yerine ASGI_WSGI_THREADS boyutlu bir
+havuzda çalışır. Çalıştırma:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+import json
+import asyncio
+import time
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route, Mount
+
+from . import create_app
+from .db import open_async_pool, close_async_pool, adb
+from .blueprints.api import discover_params, suggest_items, featured_items, merge_suggestions, valid_page
+from .services import typeahead, query_cache, event_partitions
+from .services.discover import local_discover
+from .services.payload import orjson, trim_list
+from .services.tmdb_async import AsyncTMDB
+from .services.utils import sha1, now_utc
+
+def _flask_session(flask_app, request):
+    cookie = request.cookies.get(flask_app.config["SESSION_COOKIE_NAME"])
+    if not cookie:
+        return {}
+    s = flask_app.session_interface.get_signing_serializer(flask_app)
+    try:
+        return s.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except Exception:
+        return {}
+
+async def _log_http_event(flask_app, request, status, ms):
+    try:
+        sess = _flask_session(flask_app, request)
+        ip = request.headers.get("X-Forwarded-For") or (request.client.host if request.client else "")
+        payload = {"ms": ms, "qs": {k: v[:80] for k, v in request.query_params.items()}}
+        if event_partitions.due():
+            await asyncio.to_thread(event_partitions.maybe_extend, flask_app.config)
+        async with adb() as con:
+            await con.execute("""
+                INSERT INTO user_events(user_id, session_id, event_type, path, method, status,
+                                        ip_hash, ua_hash, referrer, payload, created_at)
+                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            """, (
+                sess.get("user_id"), sess.get("sid"), "http_request",
+                request.url.path, request.method, status,
+                sha1(ip), sha1(request.headers.get("User-Agent", "")),
+                (request.headers.get("Referer") or "")[:300],
+                json.dumps(payload), now_utc(),
+            ))
+    except Exception as e:
+        print("[user_events] ERROR:", e)
+
+# asgiref bu metodu @sync_to_async ile sarar (thread_sensitive=True: tüm
+# köprülenen istekler tek thread'de sıraya girer); sarılmamış hali havuzda çalışır
+_run_wsgi_app = WsgiToAsgiInstance.__dict__["run_wsgi_app"].__wrapped__
+
+class _PooledWsgiInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=self.executor)(self, body)
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi; Flask istekleri verilen thread havuzunda eşzamanlı çalışır."""
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        await _PooledWsgiInstance(self.wsgi_application, self.executor)(scope, receive, send)
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def create_asgi_app(flask_app=None, tmdb_transport=None, log_events: bool = True):
+    flask_app = flask_app or create_app()
+    tmdb = None
+    wsgi_pool = ThreadPoolExecutor(max_workers=flask_app.config["ASGI_WSGI_THREADS"],
+                                   thread_name_prefix="asgi-wsgi")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app):
+        nonlocal tmdb
+        tmdb = AsyncTMDB(flask_app.config, transport=tmdb_transport)
+        if log_events:
+            await open_async_pool()
+        try:
+            yield
+        finally:
+            await tmdb.aclose()
+            if log_events:
+                await close_async_pool()
+            wsgi_pool.shutdown(wait=False)
+
+    def route(fn):
+        async def endpoint(request):
+            t0 = time.monotonic()
+            data = await fn(request)
+            if isinstance(data, Response):
+                return data
+            task = None
+            if log_events:
+                ms = int((time.monotonic() - t0) * 1000)
+                task = BackgroundTask(_log_http_event, flask_app, request, 200, ms)
+            return FastJSONResponse(data, background=task)
+        return endpoint
+
+    @route
+    async def api_discover(request):
+        if not valid_page(request.query_params):
+            return JSONResponse({"error": "invalid_page"}, status_code=400)
+        with flask_app.app_context():
+            data = local_discover(request.query_params, build=False)
+        if data is None:
+            data = await tmdb.get("/discover/movie", discover_params(request.query_params))
+        return trim_list(data)
+
+    @route
+    async def api_search_suggest(request):
+        q = (request.query_params.get("q") or "").strip()
+        if not q:
+            return {"results": []}
+        typeahead.ensure_built(flask_app.config["TYPEAHEAD_RETRY_SEC"])
+        local = typeahead.suggest(q)
+        if len(local) >= flask_app.config["TYPEAHEAD_MIN_HITS"]:
+            return {"results": local}
+        data = query_cache.lookup("search_suggest", q, 1, need=8)
+        if data is None:
+            data = await tmdb.get("/search/movie", {"query": q, "page": 1, "include_adult": False})
+            with flask_app.app_context():
+                query_cache.store("search_suggest", q, 1, data)
+        typeahead.add_items(data.get("results"))
+        return {"results": merge_suggestions(local, suggest_items(data))}
+
+    @route
+    async def api_featured(request):
+        popular, nowp = await asyncio.gather(
+            tmdb.get("/movie/popular", {"page": 1}),
+            tmdb.get("/movie/now_playing", {"page": 1}),
+        )
+        return {"results": featured_items(popular, nowp)}
+
+    return Starlette(
+        routes=[
+            Route("/api/discover", api_discover),
+            Route("/api/search_suggest", api_search_suggest),
+            Route("/api/featured", api_featured),
+            Mount("/", app=PooledWsgiToAsgi(flask_app, wsgi_pool)),
+        ],
+        # Flask'ın zaten sıkıştırdığı yanıtlar (Content-Encoding var) atlanır
+        middleware=[Middleware(GZipMiddleware, minimum_size=flask_app.config["COMPRESS_MIN_SIZE"],
+                               compresslevel=flask_app.config["COMPRESS_LEVEL"])]
+        if flask_app.config["COMPRESS"] else [],
+        lifespan=lifespan,
+    )
@@ -1,38 +1,34 @@
 # app/blueprints/api.py
-import json
-from flask import Blueprint, request, jsonify, session
-from ..services.tmdb import tmdb_get
+from flask import Blueprint, request, jsonify, session, current_app
+from ..services.tmdb import tmdb_get, tmdb_get_cached
 from ..services.auth import login_required
 from ..services.events import log_event
-from ..services.recommender import invalidate_user_cache, get_or_build_user_profile, get_candidate_cache, user_signals_hash
-from ..services.embeddings import SentenceTransformer  # optional
+from ..services.recommender import (invalidate_user_cache, get_or_build_user_profile, user_signals_hash, pool_version,
+                                     rank_candidates, score_user)
+from ..services.embeddings import embeddings_available
+from ..services import typeahead
+from ..services.query_cache import cached_search
+from ..services.discover import local_discover
+from ..services.payload import card, trim_list
+from ..services.http_cache import conditional, make_tag, time_bucket, args_key, mark_degraded
+from ..services.metrics import inc
 from ..db import db
 from ..services.utils import now_utc
 
 bp = Blueprint("api", __name__)
 
-@bp.get("/api/discover")
-def api_discover():
-    genre_id = request.args.get("genre_id")
-    year = request.args.get("year")
-    sort_by = request.args.get("sort_by", "popularity.desc")
-    vote_gte = request.args.get("vote_gte")
-    page = int(request.args.get("page", 1))
-
-    params = {"sort_by": sort_by, "page": page, "with_original_language": "en|tr"}
-    if genre_id: params["with_genres"] = genre_id
-    if year: params["primary_release_year"] = year
-    if vote_gte: params["vote_average.gte"] = vote_gte
-
-    return jsonify(tmdb_get("/discover/movie", params))
-
-@bp.get("/api/search_suggest")
-def api_search_suggest():
-    q = (request.args.get("q") or "").strip()
-    if not q:
-        return jsonify({"results": []})
-
-    data = tmdb_get("/search/movie", {"query": q, "page": 1, "include_adult": False})
+def discover_params(args):
+    params = {
+        "sort_by": args.get("sort_by", "popularity.desc"),
+        "page": int(args.get("page", 1)),
+        "with_original_language": "en|tr",
+    }
+    if args.get("genre_id"): params["with_genres"] = args.get("genre_id")
+    if args.get("year"): params["primary_release_year"] = args.get("year")
+    if args.get("vote_gte"): params["vote_average.gte"] = args.get("vote_gte")
+    return params
+
+def suggest_items(data):
     results = []
     for m in (data.get("results") or [])[:8]:
         results.append({
@@ -42,22 +38,108 @@ def api_search_suggest():
             "vote_average": m.get("vote_average"),
             "release_date": m.get("release_date"),
         })
-    return jsonify({"results": results})
+    return results
 
-@bp.get("/api/featured")
-def api_featured():
-    popular = tmdb_get("/movie/popular", {"page": 1})
-    nowp    = tmdb_get("/movie/now_playing", {"page": 1})
+def merge_suggestions(local, remote, limit=8):
+    seen = {m["id"] for m in local}
+    return (local + [m for m in remote if m["id"] not in seen])[:limit]
 
+def featured_items(popular, nowp):
     seen, results = set(), []
     for lst in (popular.get("results", []) + nowp.get("results", [])):
         mid = lst.get("id")
         if mid and mid not in seen and (lst.get("backdrop_path") or lst.get("poster_path")):
             seen.add(mid)
-            results.append(lst)
+            results.append(card(lst))
         if len(results) >= 20:
             break
-    return jsonify({"results": results})
+    return results
+
+def valid_page(args) -> bool:
+    try:
+        return 1 <= int(args.get("page", 1)) <= 500  # TMDB sayfa aralığı
+    except ValueError:
+        return False
+
+def _list_bucket():
+    return time_bucket(current_app.config["TMDB_LIST_TTL"])
+
+def _personal_tag():
+    if "user_id" not in session:
+        return "anon"
+    return user_signals_hash(session["user_id"])
+
+@bp.get("/api/discover")
+@conditional(lambda: make_tag("discover", args_key(), pool_version(), _list_bucket()),
+             "public, max-age=300")
+def api_discover():
+    if not valid_page(request.args):
+        return jsonify({"error": "invalid_page"}), 400
+    data = local_discover(request.args)
+    if data is None:
+        data = tmdb_get("/discover/movie", discover_params(request.args))
+    return jsonify(trim_list(data))
+
+@bp.get("/api/search_suggest")
+@conditional(lambda: make_tag("suggest", args_key(), _list_bucket()), "public, max-age=300")
+def api_search_suggest():
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"results": []})
+
+    typeahead.ensure_built(current_app.config["TYPEAHEAD_RETRY_SEC"])
+    local = typeahead.suggest(q)
+    if len(local) >= current_app.config["TYPEAHEAD_MIN_HITS"]:
+        return jsonify({"results": local})
+
+    data = cached_search(
+        "search_suggest", q, 1,
+        lambda: tmdb_get("/search/movie", {"query": q, "page": 1, "include_adult": False}),
+        need=8,
+    )
+    typeahead.add_items(data.get("results"))
+    return jsonify({"results": merge_suggestions(local, suggest_items(data))})
+
+def _featured():
+    popular = tmdb_get_cached("/movie/popular", {"page": 1})
+    nowp    = tmdb_get_cached("/movie/now_playing", {"page": 1})
+    return featured_items(popular, nowp)
+
+@bp.get("/api/featured")
+@conditional(lambda: make_tag("featured", _list_bucket()), "public, max-age=60")
+def api_featured():
+    return jsonify({"results": _featured()})
+
+@bp.get("/api/home")
+@conditional(lambda: make_tag("home", _list_bucket(), pool_version(), _personal_tag()),
+             "private, no-cache", vary=("Cookie",))
+def api_home():
+    """Ana sayfa açılışı: öne çıkanlar + kişisel öneriler + varsayılan keşif tek istekte.
+
+    Bölümler birbirinden bağımsızdır; biri başarısız olursa boş liste + note döner.
+    """
+    out = {"featured": None, "personalized": None, "discover": None}
+    try:
+        out["featured"] = _featured()
+    except Exception as e:
+        print("[home] featured ERROR:", e)
+        out["featured"] = []
+        out["featured_note"] = "error"
+        mark_degraded()
+    try:
+        out["discover"] = trim_list(local_discover({}) or tmdb_get_cached("/discover/movie", discover_params({})))
+    except Exception as e:
+        print("[home] discover ERROR:", e)
+        out["discover"] = {"results": [], "note": "error"}
+        mark_degraded()
+    if "user_id" in session:
+        try:
+            out["personalized"], _status = personalized_payload(session["user_id"])
+        except Exception as e:
+            print("[home] personalized ERROR:", e)
+            out["personalized"] = {"results": [], "note": "error"}
+            mark_degraded()
+    return jsonify(out)
 
 @bp.post("/api/trailer_event")
 @login_required
@@ -80,18 +162,16 @@ def api_trailer_event():
     invalidate_user_cache(session["user_id"])
     return jsonify({"ok": True})
 
-@bp.get("/api/personalized")
-@login_required
-def api_personalized():
-    if SentenceTransformer is None:
+def personalized_payload(uid):
+    """(yanıt, durum kodu); /api/personalized ve /api/home ortak kullanır."""
+    if not embeddings_available():
         log_event("personalized", {"note": "sentence_transformers_missing"})
-        return jsonify({"results": [], "note": "sentence_transformers_missing"}), 503
+        return {"results": [], "note": "sentence_transformers_missing"}, 503
 
-    uid = session["user_id"]
     sig, user_vec = get_or_build_user_profile(uid)
     if user_vec is None:
         log_event("personalized", {"note": "no_signals"})
-        return jsonify({"results": [], "note": "no_signals"})
+        return {"results": [], "note": "no_signals"}, 200
 
     with db() as con, con.cursor() as cur:
         cur.execute("""
@@ -104,58 +184,28 @@ def api_personalized():
         rows = cur.fetchall()
 
     if rows:
+        inc("cache_hits_total", (("cache", "user_recommendations"),))
         results = []
         for r in rows:
             d = r["data"]
             d["sim"] = round(float(r["score"]), 4)
             results.append(d)
         log_event("personalized", {"note": "from_cache", "top_n": len(results)})
-        return jsonify({"results": results, "note": "from_cache"})
+        return {"results": results, "note": "from_cache"}, 200
 
-    cand = get_candidate_cache(force=False, limit=240)
-    mat, ids, meta = cand["mat"], cand["ids"], cand["meta"]
-    if mat is None or not ids:
+    inc("cache_misses_total", (("cache", "user_recommendations"),))
+    results = score_user(uid, sig, user_vec)
+    if results is None:
         log_event("personalized", {"note": "no_candidates"})
-        return jsonify({"results": [], "note": "no_candidates"})
-
-    seen = set()
-    with db() as con, con.cursor() as cur:
-        cur.execute("SELECT movie_id FROM favorites WHERE user_id=%s", (uid,))
-        seen.update([r["movie_id"] for r in cur.fetchall()])
-        cur.execute("SELECT movie_id FROM ratings WHERE user_id=%s", (uid,))
-        seen.update([r["movie_id"] for r in cur.fetchall()])
-        cur.execute("SELECT movie_id FROM trailer_events WHERE user_id=%s", (uid,))
-        seen.update([r["movie_id"] for r in cur.fetchall()])
-
-    scores = mat @ user_vec
-    pairs = [(float(scores[i]), mid) for i, mid in enumerate(ids) if mid not in seen]
-    pairs.sort(reverse=True, key=lambda x: x[0])
-    top = pairs[:12]
-
-    results = []
-    now = now_utc()
-    with db() as con, con.cursor() as cur:
-        for score, mid in top:
-            d = meta.get(mid) or {"id": mid}
-            item = {
-                "id": d.get("id", mid),
-                "title": d.get("title"),
-                "poster_path": d.get("poster_path"),
-                "vote_average": d.get("vote_average"),
-                "release_date": d.get("release_date"),
-            }
-            results.append({**item, "sim": round(score, 4)})
-
-            cur.execute("""
-                INSERT INTO user_recommendations(user_id, movie_id, score, data, signals_hash, updated_at)
-                VALUES (%s,%s,%s,%s,%s,%s)
-                ON CONFLICT (user_id, movie_id)
-                DO UPDATE SET score=EXCLUDED.score,
-                              data=EXCLUDED.data,
-                              signals_hash=EXCLUDED.signals_hash,
-                              updated_at=EXCLUDED.updated_at
-            """, (uid, mid, score, json.dumps(item), sig, now))
-        con.commit()
+        return {"results": [], "note": "no_candidates"}, 200
 
     log_event("personalized", {"note": "fresh", "top_n": len(results)})
-    return jsonify({"results": results, "note": "fresh"})
+    return {"results": results, "note": "fresh"}, 200
+
+@bp.get("/api/personalized")
+@login_required
+@conditional(lambda: make_tag("personalized", pool_version(), _personal_tag()),
+             "private, no-cache", vary=("Cookie",))
+def api_personalized():
+    data, status = personalized_payload(session["user_id"])
+    return jsonify(data), status
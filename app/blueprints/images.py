@@ -0,0 +1,44 @@
+# app/blueprints/images.py
+import click
+from flask import Blueprint, abort, current_app, redirect, request, send_file, url_for
+from ..services import images
+
+bp = Blueprint("images", __name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+@bp.app_template_global()
+def img_url(path, variant="card"):
+    """Şablonlar için görsel adresi: proxy açıksa /img/..., değilse doğrudan TMDB."""
+    if not path:
+        return ""
+    filename = path.lstrip("/")
+    if not current_app.config["IMAGE_PROXY"]:
+        return images.tmdb_url(variant, filename)
+    return url_for("images.image", variant=variant, filename=filename)
+
+@bp.get("/img/<variant>/<filename>")
+def image(variant, filename):
+    if variant not in current_app.config["IMAGE_VARIANTS"] or not images.valid_file(filename):
+        abort(404)
+    if not current_app.config["IMAGE_PROXY"]:
+        return redirect(images.tmdb_url(variant, filename))
+
+    # quality() image/* ve */* ile de eşleşir; yalnız açıkça image/webp diyen istemciye WebP
+    webp = any(mt == "image/webp" and q > 0 for mt, q in request.accept_mimetypes)
+    try:
+        path, mimetype, etag = images.get_image(variant, filename, webp=webp)
+    except Exception as e:
+        print(f"[images] {variant}/{filename} alınamadı: {e}")
+        return redirect(images.tmdb_url(variant, filename))
+
+    resp = send_file(path, mimetype=mimetype, etag=etag, conditional=True)
+    resp.headers["Cache-Control"] = IMMUTABLE
+    resp.vary.add("Accept")
+    return resp
+
+@bp.cli.command("prefetch")
+@click.option("--limit", type=int, default=None, help="En fazla kaç görsel ısıtılsın.")
+def prefetch_command(limit):
+    """Aday havuzu ve trend listelerinin posterlerini disk önbelleğine ısıtır."""
+    images.prefetch(limit)
@@ -1,10 +1,15 @@
 # app/blueprints/pages.py
 import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app
-from ..services.tmdb import tmdb_get, get_genres
+from ..services.tmdb import tmdb_get, tmdb_get_cached, get_genres
 from ..services.events import log_event
 from ..services.auth import login_required, current_user
 from ..services.recommender import invalidate_user_cache
+from ..services.movies import get_movies
+from ..services.render_cache import cached_page, fragment, invalidate
+from ..services.query_cache import cached_search
+from ..services.timing import span
+from ..services.detail_reads import movie_detail_reads
 from ..db import db
 from ..services.utils import now_utc
 from app import sentiment
@@ -14,17 +19,29 @@ bp = Blueprint("pages", __name__)
 
 @bp.get("/")
 def home():
+    return cached_page("home", _render_home)
+
+def _render_home():
     page = int(request.args.get("page", 1))
-    yeni = tmdb_get("/movie/now_playing", {"page": page})
-    trend = tmdb_get("/trending/movie/week", {"page": 1})
+    new_movies_html = fragment(
+        "home_new", (page,),
+        lambda: render_template("partials/_new_movies.html", yeni=tmdb_get_cached("/movie/now_playing", {"page": page})),
+    )
+    trend_html = fragment(
+        "home_trend", (),
+        lambda: render_template("partials/_trend.html", trend=tmdb_get_cached("/trending/movie/week", {"page": 1})),
+    )
     genres = get_genres()
     years = list(range(datetime.datetime.now().year, 1970, -1))
-    return render_template("index.html", yeni=yeni, trend=trend, genres=genres, years=years, user=current_user())
+    return render_template("index.html", new_movies_html=new_movies_html, trend_html=trend_html,
+                           genres=genres, years=years, user=current_user())
 
 @bp.get("/movie/<int:movie_id>")
 def movie_detail(movie_id):
     log_event("view_movie", {"movie_id": movie_id})
+    return cached_page("movie_detail", lambda: _render_movie_detail(movie_id), movie_id)
 
+def _render_movie_detail(movie_id):
     detail = tmdb_get(
         f"/movie/{movie_id}",
         {
@@ -32,7 +49,6 @@ def movie_detail(movie_id):
             "include_video_language": "tr-TR,en-US,en,null",
         },
     )
-    recs = tmdb_get(f"/movie/{movie_id}/recommendations", {"page": 1})
 
     def _pref_list(vs):
         allowed = {"Trailer", "Teaser", "Clip"}
@@ -50,24 +66,20 @@ def movie_detail(movie_id):
         chosen = _pref_list(en_only)
     detail.setdefault("videos", {})["results"] = chosen
 
+    meta_html = fragment(
+        "detail_meta", (movie_id,),
+        lambda: render_template("partials/_detail_meta.html", movie=detail),
+    )
+    recs_html = fragment(
+        "detail_recs", (movie_id,),
+        lambda: render_template("partials/_detail_recs.html",
+                                recs=tmdb_get(f"/movie/{movie_id}/recommendations", {"page": 1})),
+    )
+
     tz = current_app.config.get("TZ", "Europe/Istanbul")
 
-    with db() as con, con.cursor() as cur:
-        cur.execute(f"""
-            SELECT c.id,
-                   c.content,
-                   c.is_spoiler,
-                   c.created_at,
-                   to_char(c.created_at AT TIME ZONE %s,'YYYY-MM-DD HH24:MI:SS') AS created_at_str,
-                   c.sentiment_label,
-                   c.sentiment_score,
-                   u.username
-            FROM comments c
-            JOIN users u ON u.id = c.user_id
-            WHERE c.movie_id = %s
-            ORDER BY c.id DESC
-        """, (tz, movie_id))
-        comments = cur.fetchall()
+    reads = movie_detail_reads(movie_id, session.get("user_id"), tz)
+    comments = reads["comments"]
 
     total = len(comments)
     pos = sum(1 for c in comments if c["sentiment_label"] == "POS")
@@ -75,33 +87,16 @@ def movie_detail(movie_id):
     neu = sum(1 for c in comments if c["sentiment_label"] == "NEU")
     like_pct = round((pos / total * 100.0), 1) if total else None
 
-    my_fav = False
-    my_rating = None
-    with db() as con, con.cursor() as cur:
-        cur.execute("SELECT COUNT(*) AS c FROM ratings WHERE movie_id=%s AND value=1", (movie_id,))
-        likes = cur.fetchone()["c"]
-        cur.execute("SELECT COUNT(*) AS c FROM ratings WHERE movie_id=%s AND value=-1", (movie_id,))
-        dislikes = cur.fetchone()["c"]
-
-        if "user_id" in session:
-            cur.execute("SELECT 1 FROM favorites WHERE user_id=%s AND movie_id=%s",
-                        (session["user_id"], movie_id))
-            my_fav = cur.fetchone() is not None
-
-            cur.execute("SELECT value FROM ratings WHERE user_id=%s AND movie_id=%s",
-                        (session["user_id"], movie_id))
-            r = cur.fetchone()
-            my_rating = r["value"] if r else None
-
     return render_template(
         "detail.html",
         movie=detail,
-        recs=recs,
+        meta_html=meta_html,
+        recs_html=recs_html,
         comments=comments,
         stats={"total": total, "pos": pos, "neg": neg, "neu": neu, "like_pct": like_pct},
-        fav_state={"is_favorite": my_fav},
-        rating_state={"my": my_rating, "likes": likes, "dislikes": dislikes},
-        user=current_user(),
+        fav_state={"is_favorite": reads["my_fav"]},
+        rating_state={"my": reads["my_rating"], "likes": reads["likes"], "dislikes": reads["dislikes"]},
+        user=reads["user"],
     )
 
 @bp.post("/movie/<int:movie_id>/comment")
@@ -114,7 +109,8 @@ def add_comment(movie_id):
         return redirect(url_for("pages.movie_detail", movie_id=movie_id))
 
     try:
-        label, score = sentiment.analyze(content)
+        with span("sentiment"):
+            label, score = sentiment.analyze(content)
     except Exception as e:
         print("[sentiment] ERROR:", e)
         label, score = "NEU", 0.0
@@ -126,6 +122,7 @@ def add_comment(movie_id):
         """, (movie_id, session["user_id"], content, is_spoiler, now_utc(), label, score))
         con.commit()
 
+    invalidate("movie_detail", movie_id)
     log_event("comment_add", {"movie_id": movie_id, "is_spoiler": bool(is_spoiler), "sentiment": label, "score": float(score)})
     flash("Yorumunuz kaydedildi.", "ok")
     return redirect(url_for("pages.movie_detail", movie_id=movie_id))
@@ -143,8 +140,14 @@ def search():
         empty = {"results": [], "page": 1, "total_pages": 1}
         return render_template("search.html", q=q, results=empty, user=current_user())
 
-    results = tmdb_get("/search/movie", {"query": q, "page": page, "include_adult": False})
-    return render_template("search.html", q=q, results=results, user=current_user())
+    def render():
+        results = cached_search(
+            "search", q, page,
+            lambda: tmdb_get("/search/movie", {"query": q, "page": page, "include_adult": False}),
+        )
+        return render_template("search.html", q=q, results=results, user=current_user())
+
+    return cached_page("search", render)
 
 @bp.get("/favorites")
 @login_required
@@ -154,12 +157,8 @@ def favorites_page():
         cur.execute("SELECT movie_id FROM favorites WHERE user_id=%s ORDER BY id DESC", (session["user_id"],))
         ids = [r["movie_id"] for r in cur.fetchall()]
 
-    movies = []
-    for mid in ids:
-        try:
-            movies.append(tmdb_get(f"/movie/{mid}"))
-        except Exception:
-            pass
+    found = get_movies(ids)
+    movies = [found[mid] for mid in ids if mid in found]
 
     return render_template("favorites.html", movies=movies, user=current_user())
 
@@ -215,6 +214,7 @@ def rate_movie(movie_id):
             action = "rate_like" if val == 1 else "rate_dislike"
         con.commit()
 
+    invalidate("movie_detail", movie_id)
     log_event(action, {"movie_id": movie_id, "value": val})
     flash("Kaydedildi.", "ok")
     invalidate_user_cache(session["user_id"])
@@ -1,5 +1,43 @@
 # app/config.py
 import os
+import json
+
+# Aday havuzu kaynakları: (endpoint, sayfa sayısı, ağırlık).
+# CAND_SOURCES ortam değişkeni ile JSON liste olarak ezilebilir.
+DEFAULT_CAND_SOURCES = [
+    {"path": "/movie/popular",       "pages": 3, "weight": 1.0},
+    {"path": "/movie/top_rated",     "pages": 3, "weight": 1.0},
+    {"path": "/trending/movie/week", "pages": 3, "weight": 1.2},
+    {"path": "/movie/now_playing",   "pages": 2, "weight": 0.8},
+]
+
+def _json_env(name, default):
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return json.loads(raw)
+    except ValueError:
+        print(f"[config] {name} geçersiz JSON, varsayılan kullanılıyor.")
+        return default
+
+DEFAULT_RENDER_CACHE_TTLS = {
+    "home": 60,
+    "search": 300,
+    "movie_detail": 60,
+    "home_new": 300,
+    "home_trend": 600,
+    "detail_meta": 3600,
+    "detail_recs": 1800,
+}
+
+# Görsel varyantı -> piksel genişliği (gösterim boyutu x ~2 DPR)
+DEFAULT_IMAGE_VARIANTS = {
+    "thumb": 96,      # trend listesi, arama önerileri (48px)
+    "card": 342,      # poster kartları
+    "detail": 500,    # detay sayfası posteri
+    "backdrop": 780,  # öne çıkanlar carousel'i
+}
 
 class Config:
     SECRET_KEY = os.getenv("APP_SECRET", "dev-secret-change-me")
@@ -7,6 +45,108 @@ class Config:
     TMDB_BASE = "https://api.themoviedb.org/3"
     TZ = os.getenv("TZ", "Europe/Istanbul")
     AUTO_WARMUP = os.getenv("AUTO_WARMUP", "0")
+    WARMUP = os.getenv("WARMUP", "background" if AUTO_WARMUP == "1" else "off")  # off | background | post_fork
+    PRELOAD = os.getenv("PRELOAD", "0") == "1"  # gunicorn.conf.py preload_app ile birlikte
+    WARMUP_RETRY_SEC = float(os.getenv("WARMUP_RETRY_SEC", "60"))  # başarısız ısınma yeniden denemesi
+    WARMUP_TASKS = [t.strip() for t in os.getenv("WARMUP_TASKS", "sbert,sentiment,tmdb,candidates,typeahead").split(",") if t.strip()]
+
+    TMDB_CONNECT_TIMEOUT = float(os.getenv("TMDB_CONNECT_TIMEOUT", "3.05"))
+    TMDB_READ_TIMEOUT = float(os.getenv("TMDB_READ_TIMEOUT", "6"))
+    TMDB_RPS = float(os.getenv("TMDB_RPS", "35"))
+    TMDB_BURST = int(os.getenv("TMDB_BURST", "20"))
+    TMDB_ACQUIRE_TIMEOUT = float(os.getenv("TMDB_ACQUIRE_TIMEOUT", "5"))
+    TMDB_RETRIES = int(os.getenv("TMDB_RETRIES", "2"))
+    TMDB_BACKOFF_BASE = float(os.getenv("TMDB_BACKOFF_BASE", "0.25"))
+    TMDB_BREAKER_WINDOW = int(os.getenv("TMDB_BREAKER_WINDOW", "20"))
+    TMDB_BREAKER_MIN_CALLS = int(os.getenv("TMDB_BREAKER_MIN_CALLS", "10"))
+    TMDB_BREAKER_THRESHOLD = float(os.getenv("TMDB_BREAKER_THRESHOLD", "0.5"))
+    TMDB_BREAKER_COOLDOWN = float(os.getenv("TMDB_BREAKER_COOLDOWN", "30"))
+    TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "16"))
+    TMDB_STALE_MAX = int(os.getenv("TMDB_STALE_MAX", "2048"))
+    TMDB_LIST_TTL = int(os.getenv("TMDB_LIST_TTL", "300"))
+
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "16"))  # ASGI modunda köprülenen Flask rotaları
+
+    TMDB_MODE = os.getenv("TMDB_MODE", "live")  # live | record | replay
+    TMDB_FIXTURES = os.getenv("TMDB_FIXTURES", os.path.join(os.getcwd(), "fixtures", "tmdb"))
+    TMDB_REPLAY_LATENCY_MS = float(os.getenv("TMDB_REPLAY_LATENCY_MS", "0"))
+    TMDB_REPLAY_JITTER_MS = float(os.getenv("TMDB_REPLAY_JITTER_MS", "0"))
+    TMDB_REPLAY_ERROR_RATE = float(os.getenv("TMDB_REPLAY_ERROR_RATE", "0"))
+    TMDB_REPLAY_THROTTLE_RATE = float(os.getenv("TMDB_REPLAY_THROTTLE_RATE", "0"))
+    TMDB_REPLAY_SEED = int(os.getenv("TMDB_REPLAY_SEED", "42"))
+    TMDB_REPLAY_MISS = os.getenv("TMDB_REPLAY_MISS", "route")  # route | 404
+
+    MOVIE_STORE = os.getenv("MOVIE_STORE", "1") == "1"
+    MOVIE_TTL_SEC = int(os.getenv("MOVIE_TTL_SEC", str(24 * 60 * 60)))
+
+    DB_PIPELINE = os.getenv("DB_PIPELINE", "1") == "1"  # detay sayfası okumaları tek gidiş-dönüş (libpq 14+)
+
+    # user_events bölümleme/saklama (bkz. app/services/event_partitions.py)
+    EVENTS_PARTITION = os.getenv("EVENTS_PARTITION", "month")  # off | day | month
+    EVENTS_PARTITIONS_AHEAD = int(os.getenv("EVENTS_PARTITIONS_AHEAD", "2"))  # şimdiki + N dönem hazır
+    EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", "0"))  # 0: sınırsız
+    EVENTS_ARCHIVE_DIR = os.getenv("EVENTS_ARCHIVE_DIR", "")  # ayarlıysa düşürmeden önce gzip CSV
+
+    RENDER_CACHE = os.getenv("RENDER_CACHE", "1") == "1"
+    RENDER_CACHE_MAX = int(os.getenv("RENDER_CACHE_MAX", "2048"))
+    RENDER_CACHE_TTLS = {**DEFAULT_RENDER_CACHE_TTLS, **_json_env("RENDER_CACHE_TTLS", {})}
+
+    TYPEAHEAD_MIN_HITS = int(os.getenv("TYPEAHEAD_MIN_HITS", "5"))
+    TYPEAHEAD_RETRY_SEC = float(os.getenv("TYPEAHEAD_RETRY_SEC", "60"))  # başarısız indeks kuruluşu sonrası
+    QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "600"))
+    QUERY_CACHE_MAX = int(os.getenv("QUERY_CACHE_MAX", "4096"))
+    DISCOVER_CATALOG_TTL = int(os.getenv("DISCOVER_CATALOG_TTL", "900"))
+    DISCOVER_LOCAL_MIN_RESULTS = int(os.getenv("DISCOVER_LOCAL_MIN_RESULTS", "40"))
+
+    IMAGE_PROXY = os.getenv("IMAGE_PROXY", "1") == "1"
+    IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(os.getcwd(), ".cache", "images"))
+    IMAGE_CACHE_MAX_MB = int(os.getenv("IMAGE_CACHE_MAX_MB", "2048"))
+    IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+    IMAGE_VARIANTS = {**DEFAULT_IMAGE_VARIANTS, **_json_env("IMAGE_VARIANTS", {})}
+    IMAGE_PREFETCH = os.getenv("IMAGE_PREFETCH", "1") == "1"
+    IMAGE_PREFETCH_WORKERS = int(os.getenv("IMAGE_PREFETCH_WORKERS", "8"))
+
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+    SLOW_REQUEST_SAMPLE = float(os.getenv("SLOW_REQUEST_SAMPLE", "1.0"))
+
+    METRICS = os.getenv("METRICS", "1") == "1"
+    METRICS_DIR = os.getenv("METRICS_DIR", "")  # gunicorn çoklu worker: ortak dizin
+    METRICS_FLUSH_SEC = float(os.getenv("METRICS_FLUSH_SEC", "5"))
+    METRICS_BUCKETS = _json_env("METRICS_BUCKETS", [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+
+    PROFILING = os.getenv("PROFILING", "0") == "1"
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.getcwd(), ".cache", "profiles"))
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_MAX_SEC = float(os.getenv("PROFILE_MAX_SEC", "60"))
+
+    COMPRESS = os.getenv("COMPRESS", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_MIMETYPES = ("application/json", "text/html", "text/css", "application/javascript", "text/javascript")
+
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+
+    INFERENCE_URL = os.getenv("INFERENCE_URL", "")  # unix:/yol.sock | tcp:host:port; boşsa süreç içi
+    INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "5"))
+    INFERENCE_BULK_TIMEOUT = float(os.getenv("INFERENCE_BULK_TIMEOUT", "120"))  # gömme toplu işleri (aday havuzu, reembed)
+    INFERENCE_FALLBACK = os.getenv("INFERENCE_FALLBACK", "local")  # local | none
+    INFERENCE_RETRY_SEC = float(os.getenv("INFERENCE_RETRY_SEC", "10"))
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "64"))
+    INFERENCE_BATCH_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "5"))
+    INFERENCE_QUEUE_MAX = int(os.getenv("INFERENCE_QUEUE_MAX", "256"))
+    INFERENCE_MAX_TEXTS = int(os.getenv("INFERENCE_MAX_TEXTS", "256"))
+
+    CAND_SOURCES = _json_env("CAND_SOURCES", DEFAULT_CAND_SOURCES)
+    CAND_DISCOVER_GENRES = os.getenv("CAND_DISCOVER_GENRES", "1") == "1"
+    CAND_DISCOVER_YEARS = int(os.getenv("CAND_DISCOVER_YEARS", "10"))
+    CAND_DISCOVER_PAGES = int(os.getenv("CAND_DISCOVER_PAGES", "2"))
+    CAND_DISCOVER_WEIGHT = float(os.getenv("CAND_DISCOVER_WEIGHT", "0.5"))
+    CAND_MAX_PAGES = int(os.getenv("CAND_MAX_PAGES", "400"))
+    CAND_CRAWL_SEC = float(os.getenv("CAND_CRAWL_SEC", "10"))  # yenileme, limiter'ın bu sürede verebileceği kadar sayfa çeker
+    CAND_FETCH_WORKERS = int(os.getenv("CAND_FETCH_WORKERS", "8"))
+    CAND_POOL_LIMIT = int(os.getenv("CAND_POOL_LIMIT", "240"))
 
 def load_config(app):
     app.config.from_object(Config)
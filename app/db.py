@@ -2,6 +2,9 @@
 import os
 import psycopg
 from psycopg.rows import dict_row
+from .services.timing import span
+from .services.metrics import inc, gauge_add
+from .config import Config
 
 def _pg_conninfo():
     url = os.getenv("DATABASE_URL")
@@ -14,8 +17,80 @@ def _pg_conninfo():
     dbn  = os.getenv("PGDATABASE", "postgres")
     return f"postgresql://{user}:{pwd}@{host}:{port}/{dbn}"
 
+class TimedCursor(psycopg.Cursor):
+    """Sorgu süre/sayısını isteğin Server-Timing özetine ekler."""
+
+    def execute(self, query, params=None, **kwargs):
+        with span("db"):
+            return super().execute(query, params, **kwargs)
+
+    def executemany(self, query, params_seq, **kwargs):
+        with span("db"):
+            return super().executemany(query, params_seq, **kwargs)
+
+class TrackedConnection(psycopg.Connection):
+    """Açık bağlantı sayısını /metrics'e bildirir."""
+    _tracked = False
+
+    @classmethod
+    def connect(cls, *args, **kwargs):
+        con = super().connect(*args, **kwargs)
+        con._tracked = True
+        inc("db_connections_total")
+        gauge_add("db_connections_open", 1)
+        return con
+
+    def _untrack(self):
+        if self._tracked:
+            self._tracked = False
+            gauge_add("db_connections_open", -1)
+
+    def close(self):
+        self._untrack()
+        super().close()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            super().__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._untrack()
+
 def db():
-    return psycopg.connect(_pg_conninfo(), row_factory=dict_row)
+    with span("db_connect"):
+        return TrackedConnection.connect(_pg_conninfo(), row_factory=dict_row, cursor_factory=TimedCursor)
+
+# ASGI modu: tek süreçte paylaşılan async bağlantı havuzu (psycopg_pool gerekir)
+_apool = None
+
+async def open_async_pool():
+    global _apool
+    if _apool is None:
+        from psycopg_pool import AsyncConnectionPool
+        _apool = AsyncConnectionPool(
+            _pg_conninfo(),
+            kwargs={"row_factory": dict_row},
+            min_size=1,
+            max_size=int(os.getenv("PG_ASYNC_POOL_MAX", "20")),
+            open=False,
+        )
+        await _apool.open()
+    return _apool
+
+async def close_async_pool():
+    global _apool
+    if _apool is not None:
+        await _apool.close()
+        _apool = None
+
+def adb():
+    """`async with adb() as con:` — open_async_pool() sonrası kullanılır."""
+    return _apool.connection()
+
+def async_pool_metrics():
+    """pool_size, pool_available, requests_waiting ...; havuz yoksa boş."""
+    if _apool is None:
+        return {}
+    return _apool.get_stats()
 
 def _column_exists(con, table, column):
     with con.cursor() as cur:
@@ -110,6 +185,17 @@ def init_db():
             );
             """)
 
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS movies(
+                movie_id   INTEGER NOT NULL,
+                variant    TEXT NOT NULL,
+                data       JSONB NOT NULL,
+                etag       TEXT,
+                fetched_at TIMESTAMPTZ NOT NULL,
+                PRIMARY KEY(movie_id, variant)
+            );
+            """)
+
             cur.execute("""
             CREATE TABLE IF NOT EXISTS user_profiles(
                 user_id      BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
@@ -137,23 +223,28 @@ def init_db():
             cur.execute("CREATE INDEX IF NOT EXISTS idx_ratings_movie ON ratings(movie_id, value);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_comments_movie ON comments(movie_id, id DESC);")
 
-            cur.execute("""
-            CREATE TABLE IF NOT EXISTS user_events(
-                id         BIGSERIAL PRIMARY KEY,
-                user_id    BIGINT REFERENCES users(id) ON DELETE SET NULL,
-                session_id TEXT,
-                event_type TEXT NOT NULL,
-                path       TEXT,
-                method     TEXT,
-                status     INTEGER,
-                ip_hash    TEXT,
-                ua_hash    TEXT,
-                referrer   TEXT,
-                payload    JSONB,
-                created_at TIMESTAMPTZ NOT NULL
-            );
-            """)
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_user_events_user ON user_events(user_id, created_at DESC);")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_user_events_type ON user_events(event_type, created_at DESC);")
+            if Config.EVENTS_PARTITION == "off":
+                cur.execute("""
+                CREATE TABLE IF NOT EXISTS user_events(
+                    id         BIGSERIAL PRIMARY KEY,
+                    user_id    BIGINT REFERENCES users(id) ON DELETE SET NULL,
+                    session_id TEXT,
+                    event_type TEXT NOT NULL,
+                    path       TEXT,
+                    method     TEXT,
+                    status     INTEGER,
+                    ip_hash    TEXT,
+                    ua_hash    TEXT,
+                    referrer   TEXT,
+                    payload    JSONB,
+                    created_at TIMESTAMPTZ NOT NULL
+                );
+                """)
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_user_events_user ON user_events(user_id, created_at DESC);")
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_user_events_type ON user_events(event_type, created_at DESC);")
+
+        if Config.EVENTS_PARTITION != "off":
+            from .services.event_partitions import setup
+            setup(con, Config.EVENTS_PARTITION, Config.EVENTS_PARTITIONS_AHEAD)
 
         con.commit()
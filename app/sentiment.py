@@ -1,12 +1,21 @@
 from typing import Tuple, Dict
 import os
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
+import threading
 
+# transformers (torch dahil) birkaç saniyelik import; ilk kullanımda yüklenir
 _PIPE = None
+_PIPE_LOCK = threading.Lock()
 
 
 def _load_pipeline():
     """Load the RoBERTa-Large sentiment model (SiEBERT) for maximum general accuracy."""
+    if _PIPE is not None:
+        return _PIPE
+    with _PIPE_LOCK:
+        return _load_pipeline_locked()
+
+
+def _load_pipeline_locked():
     global _PIPE
     if _PIPE is not None:
         return _PIPE
@@ -18,6 +27,8 @@ def _load_pipeline():
     device = 0 if os.environ.get("HF_USE_CPU") is None and os.cpu_count() is not None else -1
 
     try:
+        from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
+
         model = AutoModelForSequenceClassification.from_pretrained(model_name)
         tokenizer = AutoTokenizer.from_pretrained(model_name)
 
@@ -89,25 +100,7 @@ def analyze_sentiment(text: str) -> Tuple[str, float]:
             if not text_l:
                 return "neu", 0.5
 
-            out = pipe(text_l)[0]
-            # 2 skor bekleniyor
-            pos_score, neg_score = _extract_pos_neg(out)
-
-            # Nötr (NEU) Karar Marjı (SiEBERT için gereklidir)
-            neu_margin = float(os.environ.get("NEU_MARGIN", "0.05"))  # Varsayılan marj
-
-            # Nötr Kararı: Skorlar birbirine yeterince yakınsa Nötr'dür.
-            if abs(pos_score - neg_score) <= neu_margin:
-                print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> NEU (pos={pos_score:.3f}, neg={neg_score:.3f})")
-                return "neu", max(pos_score, neg_score)
-
-            # Pozitif/Negatif Kararı
-            if pos_score > neg_score:
-                print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> POS (pos={pos_score:.3f}, neg={neg_score:.3f})")
-                return "pos", pos_score
-            else:
-                print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> NEG (pos={pos_score:.3f}, neg={neg_score:.3f})")
-                return "neg", neg_score
+            return _decide(text_l, pipe(text_l)[0])
 
         except Exception as e:
             print(f"[DEBUG] Sentiment analysis error: {e} -> using fallback")
@@ -115,6 +108,46 @@ def analyze_sentiment(text: str) -> Tuple[str, float]:
     return "neu", 0.5
 
 
+def _decide(text_l: str, out) -> Tuple[str, float]:
+    # 2 skor bekleniyor
+    pos_score, neg_score = _extract_pos_neg(out)
+
+    # Nötr (NEU) Karar Marjı (SiEBERT için gereklidir)
+    neu_margin = float(os.environ.get("NEU_MARGIN", "0.05"))  # Varsayılan marj
+
+    # Nötr Kararı: Skorlar birbirine yeterince yakınsa Nötr'dür.
+    if abs(pos_score - neg_score) <= neu_margin:
+        print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> NEU (pos={pos_score:.3f}, neg={neg_score:.3f})")
+        return "neu", max(pos_score, neg_score)
+
+    # Pozitif/Negatif Kararı
+    if pos_score > neg_score:
+        print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> POS (pos={pos_score:.3f}, neg={neg_score:.3f})")
+        return "pos", pos_score
+    else:
+        print(f"[SENTIMENT DEBUG] '{text_l[:60]}...' -> NEG (pos={pos_score:.3f}, neg={neg_score:.3f})")
+        return "neg", neg_score
+
+
+# --- Toplu Analiz (çıkarım sunucusunun dinamik batch'i için) ---
+def analyze_many(texts) -> list:
+    """
+    analyze() ile aynı çıktı, metin listesi için tek pipeline çağrısı.
+    """
+    out = [("NEU", 0.5)] * len(texts)
+    stripped = [t.strip() for t in texts]
+    idx = [i for i, t in enumerate(stripped) if t]
+    pipe = _load_pipeline()
+    if pipe and idx:
+        try:
+            for i, res in zip(idx, pipe([stripped[i] for i in idx])):
+                lab, score = _decide(stripped[i], res)
+                out[i] = (_UP[lab], score)
+        except Exception as e:
+            print(f"[DEBUG] Sentiment batch error: {e} -> using fallback")
+    return out
+
+
 # --- Olasılıkları Döndüren Fonksiyon (SiEBERT için Sadeleştirildi) ---
 def analyze_sentiment_probs(text: str) -> Tuple[str, float, Dict[str, float]]:
     """
@@ -136,10 +169,20 @@ def analyze_sentiment_probs(text: str) -> Tuple[str, float, Dict[str, float]]:
 
 
 # --- app.py ile uyumlu wrapper ---
+_UP = {"pos": "POS", "neg": "NEG", "neu": "NEU"}
+
+
 def analyze(text: str):
     """
     app.py eski arayüz: ("POS" | "NEG" | "NEU", confidence)
+    INFERENCE_URL ayarlıysa çıkarım sunucusuna sorulur.
     """
+    from .services import inference
+    if inference.enabled():
+        try:
+            return inference.sentiment([text])[0]
+        except inference.InferenceUnavailable:
+            if not inference.local_fallback():
+                return "NEU", 0.5
     lab, score = analyze_sentiment(text)
-    lab_up = {"pos": "POS", "neg": "NEG", "neu": "NEU"}[lab]
-    return lab_up, score
\ No newline at end of file
+    return _UP[lab], score
\ No newline at end of file
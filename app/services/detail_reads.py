@@ -0,0 +1,69 @@
+# app/services/detail_reads.py
+"""Film detay sayfasının DB okumaları tek bağlantı ve tek ağ gidiş-dönüşünde.
+
+Yorumlar, beğeni sayıları + kullanıcının oyu/favorisi ve oturumdaki kullanıcı
+psycopg pipeline modunda art arda gönderilir; sunucu yanıtları tek Sync ile
+döner. libpq 14'ten eskiyse ya da DB_PIPELINE=0 ise aynı sorgular aynı
+bağlantıda sırayla çalışır. Bağlantı havuzlandığında (ASGI) psycopg sık
+çalışan sorguları kendiliğinden sunucu tarafında hazırlar (prepare_threshold).
+"""
+import psycopg
+from flask import current_app
+from ..db import db
+from .timing import span
+
+COMMENTS_SQL = """
+    SELECT c.id,
+           c.content,
+           c.is_spoiler,
+           c.created_at,
+           to_char(c.created_at AT TIME ZONE %(tz)s,'YYYY-MM-DD HH24:MI:SS') AS created_at_str,
+           c.sentiment_label,
+           c.sentiment_score,
+           u.username
+    FROM comments c
+    JOIN users u ON u.id = c.user_id
+    WHERE c.movie_id = %(mid)s
+    ORDER BY c.id DESC
+"""
+
+# iki COUNT + kullanıcının oyu + favori kontrolü tek taramada
+RATINGS_SQL = """
+    SELECT COUNT(*) FILTER (WHERE value = 1)  AS likes,
+           COUNT(*) FILTER (WHERE value = -1) AS dislikes,
+           MAX(value) FILTER (WHERE user_id = %(uid)s) AS my_rating,
+           EXISTS (SELECT 1 FROM favorites WHERE user_id = %(uid)s AND movie_id = %(mid)s) AS my_fav
+    FROM ratings
+    WHERE movie_id = %(mid)s
+"""
+
+USER_SQL = "SELECT id, username, email FROM users WHERE id = %(uid)s"
+
+def movie_detail_reads(movie_id: int, uid: int | None, tz: str) -> dict:
+    """{"comments", "likes", "dislikes", "my_rating", "my_fav", "user"}"""
+    params = {"mid": movie_id, "uid": uid, "tz": tz}
+    stmts = [COMMENTS_SQL, RATINGS_SQL] + ([USER_SQL] if uid is not None else [])
+
+    with db() as con:
+        # TimedCursor her execute'u ayrı sayar; burada tek "db" ölçümü = tek gidiş-dönüş
+        with span("db"):
+            curs = [psycopg.Cursor(con) for _ in stmts]
+            if current_app.config["DB_PIPELINE"] and psycopg.Pipeline.is_supported():
+                with con.pipeline():
+                    for cur, sql in zip(curs, stmts):
+                        cur.execute(sql, params)
+            else:
+                for cur, sql in zip(curs, stmts):
+                    cur.execute(sql, params)
+            comments = curs[0].fetchall()
+            r = curs[1].fetchone()
+            user = curs[2].fetchone() if uid is not None else None
+
+    return {
+        "comments": comments,
+        "likes": r["likes"],
+        "dislikes": r["dislikes"],
+        "my_rating": r["my_rating"],
+        "my_fav": bool(r["my_fav"]),
+        "user": user,
+    }
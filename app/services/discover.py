@@ -0,0 +1,153 @@
+# app/services/discover.py
+"""/api/discover için yerel keşif motoru.
+
+candidate_movies kataloğu NumPy sütunlarına çevrilir (tür bit kümesi,
+yıl, puan, popülerlik, çıkış tarihi). Filtreler vektörel maskelerle,
+sıralama argsort ile yapılır. Yerel kapsam yetersizse (az eşleşme, bilinmeyen
+tür/sıralama, sayfa aralık dışı) None döner ve çağıran TMDB'ye düşer.
+
+Aday havuzu en-US çekilir; kartlar `movies` deposundaki tr-TR kayıtlarından
+yerelleştirilir. Sayfadaki bir filmin tr-TR kaydı yoksa sayfa TMDB'den gelir
+ve eksikler arka planda depoya çekilir (katalog yenilenince yerelden sunulur).
+"""
+import time
+import datetime
+import threading
+import numpy as np
+from flask import current_app
+from ..db import db
+from .movies import schedule_fetch
+
+TR = {"language": "tr-TR"}
+
+PAGE_SIZE = 20
+_LANGS = ("en", "tr")
+_SORT_KEYS = {
+    "popularity.desc": "popularity",
+    "vote_average.desc": "vote",
+    "release_date.desc": "released",
+}
+
+_lock = threading.Lock()
+_cat = {"ts": 0.0, "n": 0}
+
+def _ordinal(date_str):
+    try:
+        return datetime.date.fromisoformat(date_str).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+def build_catalog():
+    with db() as con, con.cursor() as cur:
+        cur.execute("SELECT data FROM candidate_movies")
+        rows = [r["data"] for r in cur.fetchall()]
+        cur.execute(
+            "SELECT movie_id, data->>'title' AS title, data->>'poster_path' AS poster_path "
+            "FROM movies WHERE variant LIKE %s",
+            ("%language=tr-TR",),
+        )
+        tr = {r["movie_id"]: r for r in cur.fetchall() if r["title"]}
+
+    bits = {}
+    n = len(rows)
+    genres = np.zeros(n, dtype=np.uint64)
+    year = np.zeros(n, dtype=np.int16)
+    released = np.zeros(n, dtype=np.int32)
+    vote = np.zeros(n, dtype=np.float32)
+    popularity = np.zeros(n, dtype=np.float32)
+    lang_ok = np.zeros(n, dtype=bool)
+    localized = np.zeros(n, dtype=bool)
+    cards = []
+    for i, d in enumerate(rows):
+        mask = 0
+        for gid in d.get("genre_ids") or []:
+            if gid not in bits and len(bits) < 64:
+                bits[gid] = len(bits)
+            if gid in bits:
+                mask |= 1 << bits[gid]
+        genres[i] = mask
+        rd = d.get("release_date") or ""
+        year[i] = int(rd[:4]) if rd[:4].isdigit() else 0
+        released[i] = _ordinal(rd)
+        vote[i] = d.get("vote_average") or 0.0
+        popularity[i] = d.get("popularity") or 0.0
+        lang_ok[i] = d.get("original_language") in _LANGS
+        t = tr.get(d["id"])
+        localized[i] = t is not None
+        cards.append({
+            "id": d["id"],
+            "title": t["title"] if t else d.get("title"),
+            "poster_path": (t and t["poster_path"]) or d.get("poster_path"),
+            "backdrop_path": d.get("backdrop_path"),
+            "vote_average": d.get("vote_average"),
+            "release_date": d.get("release_date"),
+            "genre_ids": d.get("genre_ids") or [],
+        })
+
+    return {
+        "ts": time.time(), "n": n, "bits": bits, "genres": genres,
+        "year": year, "released": released, "vote": vote, "popularity": popularity,
+        "lang_ok": lang_ok, "localized": localized, "cards": cards,
+    }
+
+def get_catalog(build: bool = True):
+    global _cat
+    ttl = current_app.config["DISCOVER_CATALOG_TTL"]
+    if _cat["n"] and time.time() - _cat["ts"] < ttl:
+        return _cat
+    if not build:
+        return _cat if _cat["n"] else None
+    with _lock:
+        if not (_cat["n"] and time.time() - _cat["ts"] < ttl):
+            try:
+                _cat = build_catalog()
+            except Exception as e:
+                print("[discover] katalog kurulamadı:", e)
+    return _cat if _cat["n"] else None
+
+def local_discover(args, build: bool = True):
+    """TMDB /discover/movie biçiminde yanıt ya da kapsam yetersizse None."""
+    cat = get_catalog(build=build)
+    sort_key = _SORT_KEYS.get(args.get("sort_by", "popularity.desc"))
+    if cat is None or sort_key is None:
+        return None
+
+    mask = cat["lang_ok"].copy()
+    genre_id = args.get("genre_id")
+    if genre_id:
+        try:
+            bit = cat["bits"][int(genre_id)]
+        except (KeyError, ValueError):
+            return None
+        mask &= (cat["genres"] & np.uint64(1 << bit)) != 0
+    try:
+        if args.get("year"):
+            mask &= cat["year"] == int(args.get("year"))
+        if args.get("vote_gte"):
+            mask &= cat["vote"] >= float(args.get("vote_gte"))
+    except ValueError:
+        return None
+
+    try:
+        page = int(args.get("page", 1))
+    except ValueError:
+        return None
+    idx = np.flatnonzero(mask)
+    total = len(idx)
+    total_pages = max(1, -(-total // PAGE_SIZE))
+    if total < current_app.config["DISCOVER_LOCAL_MIN_RESULTS"] or not 1 <= page <= total_pages:
+        return None
+
+    order = idx[np.argsort(-cat[sort_key][idx], kind="stable")]
+    sl = order[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+    missing = [cat["cards"][i]["id"] for i in sl if not cat["localized"][i]]
+    if missing:
+        # İngilizce başlık sunma: bu sayfa TMDB'den, eksik tr-TR kayıtlar arka planda
+        schedule_fetch(missing, TR)
+        return None
+    return {
+        "page": page,
+        "results": [cat["cards"][i] for i in sl],
+        "total_pages": total_pages,
+        "total_results": total,
+    }
@@ -1,40 +1,67 @@
 # app/services/embeddings.py
 import json
 import hashlib
+import importlib.util
 import numpy as np
 from functools import lru_cache
+from flask import current_app
 from .tmdb import tmdb_get
+from .movies import get_movies
 from ..db import db
 from .utils import now_utc
+from .timing import span
+from . import inference
 
-try:
-    from sentence_transformers import SentenceTransformer
-except Exception:
-    SentenceTransformer = None
+# sentence_transformers (torch dahil) ilk sbert() çağrısında import edilir;
+# burada yalnızca kurulu olup olmadığına bakılır
+SBERT_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
 
 @lru_cache(maxsize=1)
 def sbert():
-    if SentenceTransformer is None:
+    if not SBERT_AVAILABLE:
         raise RuntimeError("sentence-transformers kurulu değil. `pip install sentence-transformers numpy`")
+    from sentence_transformers import SentenceTransformer
     return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
+def embeddings_available() -> bool:
+    """Süreç içi model kurulu ya da çıkarım sunucusu ayarlı."""
+    return SBERT_AVAILABLE or inference.enabled()
+
 def _hash_text(s: str) -> str:
     return hashlib.sha1(s.encode("utf-8", "ignore")).hexdigest()
 
-@lru_cache(maxsize=8192)
-def movie_text_en(movie_id: int) -> str:
-    d = tmdb_get(f"/movie/{movie_id}", {"language": "en-US"})
+def _detail_text(d) -> str:
     title = (d.get("title") or d.get("original_title") or "").strip()
     overview = (d.get("overview") or "").strip()
     genres = ", ".join([g.get("name","") for g in (d.get("genres") or []) if g.get("name")])
     parts = [title, overview, genres]
     return " [SEP] ".join([p for p in parts if p])
 
-def embed_texts(texts):
-    vecs = sbert().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+@lru_cache(maxsize=8192)
+def movie_text_en(movie_id: int) -> str:
+    return _detail_text(tmdb_get(f"/movie/{movie_id}", {"language": "en-US"}))
+
+def movie_texts_en(movie_ids) -> dict:
+    """Toplu sürüm: yerel `movies` tablosundan tek sorguda okur."""
+    if not current_app.config["MOVIE_STORE"]:
+        return {mid: movie_text_en(mid) for mid in movie_ids}
+    return {mid: _detail_text(d) for mid, d in get_movies(movie_ids, {"language": "en-US"}).items()}
+
+def embed_texts(texts, batch_size: int | None = None, timeout: float | None = None):
+    """timeout: çıkarım sunucusu için (varsayılan INFERENCE_TIMEOUT)."""
+    batch_size = batch_size or current_app.config["EMBED_BATCH_SIZE"]
+    with span("model"):
+        if inference.enabled():
+            try:
+                return inference.embed(texts, timeout)
+            except inference.InferenceUnavailable as e:
+                if not inference.local_fallback():
+                    raise RuntimeError(f"çıkarım sunucusu kullanılamıyor: {e}")
+        vecs = sbert().encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
     return np.asarray(vecs, dtype=np.float32)
 
-def ensure_embeddings(movie_ids):
+def ensure_embeddings(movie_ids, force: bool = False):
+    """force=True metin değişmemiş olsa da gömmeleri yeniden hesaplar (model değişimi)."""
     movie_ids = [int(x) for x in set(movie_ids or []) if x]
     if not movie_ids:
         return {}
@@ -50,16 +77,16 @@ def ensure_embeddings(movie_ids):
                 existing[r["movie_id"]] = r
 
         need, texts = [], []
-        for mid in movie_ids:
-            text = movie_text_en(mid)
+        for mid, text in movie_texts_en(movie_ids).items():
             h = _hash_text(text)
             row = existing.get(mid)
-            if (row is None) or (row.get("text_hash") != h) or (row.get("embedding") is None):
+            if force or (row is None) or (row.get("text_hash") != h) or (row.get("embedding") is None):
                 need.append((mid, h, text))
                 texts.append(text)
 
         if need:
-            vecs = embed_texts(texts)
+            # aday havuzu/reembed yüzlerce metin gönderir: kısa istek süresi yerine toplu süre
+            vecs = embed_texts(texts, timeout=current_app.config["INFERENCE_BULK_TIMEOUT"])
             with con.cursor() as cur:
                 for (mid, h, _text), vec in zip(need, vecs):
                     cur.execute(
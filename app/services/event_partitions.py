@@ -0,0 +1,339 @@
+# app/services/event_partitions.py
+"""user_events: zamana göre bölümlenmiş tablo ve saklama politikası.
+
+EVENTS_PARTITION=day|month ise user_events created_at üzerinde RANGE
+bölümlü bir tablodur (bölümler UTC sınırlı: user_events_p202610,
+user_events_p20261019). Yeni kayıtlar yalnız son bölümün küçük indekslerini
+günceller. created_at için BRIN, kullanıcı sorguları için (user_id,
+created_at) btree vardır. Sorgular zaman aralığıyla bölüm budamasından
+yararlanır.
+
+- init_db boş veritabanında bölümlü tabloyu kurar; var olan tabloda yalnız
+  eksik ileri bölümleri açar. Eski düz tablo varsa açılışta dokunulmaz
+  (kayıtlar düz tabloya yazılmaya devam eder). Taşıma bakım komutudur:
+  `flask events migrate` tabloyu user_events_legacy adıyla (MINVALUE, ilk
+  bölüm) aralığına bağlar. Uzun işler (indeksler, aralık doğrulaması)
+  yazmaları durdurmadan önceden yapılır. Yalnız son adım kısa bir ACCESS
+  EXCLUSIVE kilidi alır.
+- Aralık dışındaki kayıtlar user_events_default bölümüne düşer, INSERT
+  hata vermez.
+- Şimdiki + EVENTS_PARTITIONS_AHEAD dönem hazır tutulur. Süreçler bunu
+  saatte bir kontrol eder (maybe_extend), cron gerekmez.
+- EVENTS_RETENTION_DAYS'ten eski bölümler `flask events maintain` ile
+  düşürülür. EVENTS_ARCHIVE_DIR ayarlıysa bölüm önce gzip'li CSV'ye yazılır.
+
+    flask events migrate           # düz tablo -> bölümlü (bir kez, dağıtımda)
+    flask events partitions        # bölümler, satır tahmini, boyut
+    flask events maintain          # ileri bölümler + saklama (cron: günde bir)
+"""
+import os
+import re
+import gzip
+import time
+import datetime
+import threading
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from psycopg import sql
+from ..db import db
+from .utils import now_utc
+
+PERIODS = ("day", "month")
+LOCK_KEY = 7270501  # pg_advisory_xact_lock: worker'lar aynı anda DDL çalıştırmasın
+CHECK_EVERY_SEC = 3600
+
+COLUMNS = """
+    id         BIGINT NOT NULL DEFAULT nextval('user_events_id_seq'),
+    user_id    BIGINT REFERENCES users(id) ON DELETE SET NULL,
+    session_id TEXT,
+    event_type TEXT NOT NULL,
+    path       TEXT,
+    method     TEXT,
+    status     INTEGER,
+    ip_hash    TEXT,
+    ua_hash    TEXT,
+    referrer   TEXT,
+    payload    JSONB,
+    created_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (id, created_at)
+"""
+
+DEFAULT_PARTITION = "user_events_default"
+
+# bölümlü üst tablonun indeksleri; eşdeğer indeksi olan bölümlerde yeniden kurulmaz, bağlanır
+PARENT_INDEXES = (
+    ("idx_user_events_user", "(user_id, created_at DESC)"),
+    ("idx_user_events_type", "(event_type, created_at DESC)"),
+    ("idx_user_events_created_brin", "USING brin(created_at)"),
+)
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+_check_lock = threading.Lock()
+_next_check = {"at": 0.0}
+
+def period_start(ts, period: str):
+    ts = ts.astimezone(datetime.timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts if period == "day" else ts.replace(day=1)
+
+def next_start(start, period: str):
+    if period == "day":
+        return start + datetime.timedelta(days=1)
+    return (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+def partition_name(start, period: str) -> str:
+    return f"user_events_p{start:%Y%m%d}" if period == "day" else f"user_events_p{start:%Y%m}"
+
+def _bound(v: str):
+    v = v.strip()
+    if v in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.datetime.fromisoformat(v.strip("'"))
+
+def _relkind(cur, name: str):
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (name,))
+    row = cur.fetchone()
+    return row["relkind"] if row else None
+
+def partitions(cur) -> list:
+    """[{"name", "lower", "upper"}] — None: MINVALUE/MAXVALUE; DEFAULT bölümü atlanır."""
+    cur.execute("SET LOCAL TIME ZONE 'UTC'")
+    cur.execute("""
+        SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('user_events')
+    """)
+    out = []
+    for r in cur.fetchall():
+        m = _BOUND_RE.search(r["bound"] or "")
+        if m:
+            out.append({"name": r["name"], "lower": _bound(m.group(1)), "upper": _bound(m.group(2))})
+    out.sort(key=lambda p: p["lower"] or datetime.datetime.min.replace(tzinfo=datetime.timezone.utc))
+    return out
+
+def ensure_partitions(cur, period: str, ahead: int, since=None) -> list:
+    """since (varsayılan: şimdi) ile şimdi + `ahead` dönem arasındaki eksik bölümleri açar."""
+    if _relkind(cur, "user_events") != "p":
+        return []  # düz tablo: `flask events migrate` bekleniyor
+    existing = partitions(cur)
+    start = period_start(since or now_utc(), period)
+    end = period_start(now_utc(), period)
+    for _ in range(ahead + 1):
+        end = next_start(end, period)
+
+    created = []
+    while start < end:
+        stop = next_start(start, period)
+        overlaps = any((p["upper"] is None or start < p["upper"]) and (p["lower"] is None or stop > p["lower"])
+                       for p in existing)
+        if not overlaps:
+            name = partition_name(start, period)
+            cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF user_events FOR VALUES FROM ({}) TO ({})").format(
+                sql.Identifier(name), sql.Literal(start), sql.Literal(stop)))
+            created.append(name)
+        start = stop
+    return created
+
+def _create_parent(cur):
+    cur.execute("CREATE SEQUENCE IF NOT EXISTS user_events_id_seq")
+    cur.execute(f"CREATE TABLE user_events ({COLUMNS}) PARTITION BY RANGE (created_at)")
+    cur.execute("ALTER SEQUENCE user_events_id_seq OWNED BY user_events.id")
+
+def _ensure_parent_objects(cur):
+    """Üst tablonun indeksleri ve DEFAULT bölümü (yoksa)."""
+    for name, spec in PARENT_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON user_events {spec}")
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF user_events DEFAULT")
+
+def setup(con, period: str, ahead: int):
+    """init_db'den: boş veritabanında bölümlü tabloyu kurar, aksi halde yalnız ileri bölümleri açar."""
+    if period not in PERIODS:
+        raise ValueError(f"Geçersiz EVENTS_PARTITION: {period}")
+    with con.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+        kind = _relkind(cur, "user_events")
+        if kind == "r":
+            print("[events] user_events düz tablo; bölümlemek için `flask events migrate` çalıştırın.")
+            return
+        if kind is None:
+            _create_parent(cur)
+            _ensure_parent_objects(cur)
+        created = ensure_partitions(cur, period, ahead)
+    if created:
+        print(f"[events] yeni bölümler: {', '.join(created)}")
+    _next_check["at"] = time.monotonic() + CHECK_EVERY_SEC
+
+def migrate(con, period: str, ahead: int):
+    """Düz user_events -> bölümlü; eski tablo (MINVALUE, dönem sonu) bölümü olur.
+
+    1. PK ve BRIN'in bölümlü karşılıkları CONCURRENTLY kurulur.
+    2. Aralık CHECK'i NOT VALID eklenip ayrı işlemde doğrulanır; yazmalar sürer.
+    3. Kısa işlem: yeniden adlandırma, PK takası, üst tablo, ATTACH (CHECK
+       sayesinde tarama yok), DEFAULT ve ileri bölümler.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Geçersiz EVENTS_PARTITION: {period}")
+    with con.cursor() as cur:
+        kind = _relkind(cur, "user_events")
+    con.commit()
+    if kind != "r":
+        with con.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+            if _relkind(cur, "user_events") is None:
+                _create_parent(cur)
+            _ensure_parent_objects(cur)
+            created = ensure_partitions(cur, period, ahead)
+        con.commit()
+        print(f"[events] user_events zaten bölümlü; yeni bölümler: {', '.join(created) or 'yok'}")
+        return
+
+    # şimdiki dönemin sonuna kadar eski tabloda kalır; sonraki kayıtlar yeni bölümlere
+    upper = next_start(period_start(now_utc(), period), period)
+    autocommit = con.autocommit
+    con.autocommit = True
+    try:
+        print("[events] 1/3 indeksler (CONCURRENTLY)")
+        con.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS user_events_legacy_pkey_new "
+                    "ON user_events(id, created_at)")
+        con.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_events_legacy_brin "
+                    "ON user_events USING brin(created_at)")
+        print(f"[events] 2/3 aralık doğrulaması (< {upper:%Y-%m-%d})")
+        con.execute("ALTER TABLE user_events DROP CONSTRAINT IF EXISTS user_events_legacy_range")
+        con.execute(sql.SQL("ALTER TABLE user_events ADD CONSTRAINT user_events_legacy_range "
+                            "CHECK (created_at IS NOT NULL AND created_at < {}) NOT VALID")
+                    .format(sql.Literal(upper)))
+        con.execute("ALTER TABLE user_events VALIDATE CONSTRAINT user_events_legacy_range")
+    finally:
+        con.autocommit = autocommit
+
+    print("[events] 3/3 bölümlü tabloya geçiş")
+    with con.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+        cur.execute("ALTER TABLE user_events RENAME TO user_events_legacy")
+        # bölümlü üst tablonun PK'si (id, created_at); ATTACH aynısını bekler
+        cur.execute("ALTER TABLE user_events_legacy DROP CONSTRAINT user_events_pkey")
+        cur.execute("ALTER TABLE user_events_legacy ADD CONSTRAINT user_events_legacy_pkey "
+                    "PRIMARY KEY USING INDEX user_events_legacy_pkey_new")
+        cur.execute("ALTER INDEX IF EXISTS idx_user_events_user RENAME TO idx_user_events_legacy_user")
+        cur.execute("ALTER INDEX IF EXISTS idx_user_events_type RENAME TO idx_user_events_legacy_type")
+        _create_parent(cur)
+        cur.execute(sql.SQL("ALTER TABLE user_events ATTACH PARTITION user_events_legacy "
+                            "FOR VALUES FROM (MINVALUE) TO ({})").format(sql.Literal(upper)))
+        cur.execute("ALTER TABLE user_events_legacy DROP CONSTRAINT user_events_legacy_range")
+        # eski tablonun eşdeğer indeksleri üst tablo indekslerine bağlanır (yeniden kurulmaz)
+        _ensure_parent_objects(cur)
+        created = ensure_partitions(cur, period, ahead)
+    con.commit()
+    print(f"[events] taşındı: user_events_legacy < {upper:%Y-%m-%d}; yeni bölümler: {', '.join(created) or 'yok'}")
+
+def due() -> bool:
+    return time.monotonic() >= _next_check["at"]
+
+def maybe_extend(cfg):
+    """Saatte bir (süreç başına) ileri bölümleri açar; log_event yolundan çağrılır."""
+    period = cfg["EVENTS_PARTITION"]
+    if period == "off" or not due() or not _check_lock.acquire(blocking=False):
+        return
+    try:
+        _next_check["at"] = time.monotonic() + CHECK_EVERY_SEC
+        with db() as con, con.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+            created = ensure_partitions(cur, period, cfg["EVENTS_PARTITIONS_AHEAD"])
+            con.commit()
+        if created:
+            print(f"[events] yeni bölümler: {', '.join(created)}")
+    except Exception as e:
+        _next_check["at"] = time.monotonic() + 60
+        print("[events] bölüm kontrolü ERROR:", e)
+    finally:
+        _check_lock.release()
+
+def _archive(cur, name: str, archive_dir: str) -> str:
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wb") as f, cur.copy(
+            sql.SQL("COPY {} TO STDOUT (FORMAT csv, HEADER)").format(sql.Identifier(name))) as cp:
+        for chunk in cp:
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+def apply_retention(con, retention_days: int, archive_dir: str = "") -> list:
+    """Üst sınırı saklama süresinden eski bölümleri (arşivleyip) düşürür."""
+    if retention_days <= 0:
+        return []
+    cutoff = now_utc() - datetime.timedelta(days=retention_days)
+    dropped = []
+    with con.cursor() as cur:
+        old = [p["name"] for p in partitions(cur) if p["upper"] is not None and p["upper"] <= cutoff]
+    con.commit()
+    for name in old:
+        # her bölüm kendi işleminde: arşiv yazıldıktan sonra düşürülür
+        with con.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+            note = f" -> {_archive(cur, name, archive_dir)}" if archive_dir else ""
+            cur.execute(sql.SQL("ALTER TABLE user_events DETACH PARTITION {}").format(sql.Identifier(name)))
+            cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+        con.commit()
+        print(f"[events] {name} düşürüldü{note}")
+        dropped.append(name)
+    return dropped
+
+@click.group("events")
+def events_cli():
+    """user_events bölümleri ve saklama politikası."""
+
+@events_cli.command("migrate")
+@with_appcontext
+def migrate_command():
+    """Düz user_events tablosunu bölümlü tabloya taşır (bir kez, dağıtım sırasında)."""
+    period = current_app.config["EVENTS_PARTITION"]
+    if period == "off":
+        raise click.ClickException("EVENTS_PARTITION=off")
+    t0 = time.perf_counter()
+    with db() as con:
+        migrate(con, period, current_app.config["EVENTS_PARTITIONS_AHEAD"])
+    print(f"[events] migrate: {time.perf_counter() - t0:.1f} sn")
+
+@events_cli.command("partitions")
+@with_appcontext
+def partitions_command():
+    """Bölümleri, tahmini satır sayısını ve boyutlarını listeler."""
+    with db() as con, con.cursor() as cur:
+        parts = partitions(cur)
+        for p in parts:
+            cur.execute("SELECT reltuples::bigint AS n, pg_total_relation_size(oid) AS b "
+                        "FROM pg_class WHERE oid = to_regclass(%s)", (p["name"],))
+            r = cur.fetchone()
+            lo = f"{p['lower']:%Y-%m-%d}" if p["lower"] else "-inf"
+            hi = f"{p['upper']:%Y-%m-%d}" if p["upper"] else "+inf"
+            print(f"{p['name']:28s} {lo:>10s} .. {hi:<10s} ~{max(r['n'], 0):>12,} satır {r['b'] / 1048576:9.1f} MB")
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL AS ok", (DEFAULT_PARTITION,))
+        if cur.fetchone()["ok"]:
+            cur.execute(sql.SQL("SELECT COUNT(*) AS n FROM {}").format(sql.Identifier(DEFAULT_PARTITION)))
+            n = cur.fetchone()["n"]
+            print(f"{DEFAULT_PARTITION:28s} {'DEFAULT':>24s} {n:>13,} satır"
+                  + ("  (aralık dışı kayıtlar; bölümleri `maintain --since` ile açın)" if n else ""))
+    if not parts:
+        print("[events] user_events bölümlü değil (EVENTS_PARTITION=off ya da `flask events migrate`?)")
+
+@events_cli.command("maintain")
+@click.option("--since", type=click.DateTime(), default=None,
+              help="Bu tarihten itibaren eksik bölümleri de aç (geçmiş veri yüklerken).")
+@with_appcontext
+def maintain_command(since):
+    """İleri bölümleri açar ve EVENTS_RETENTION_DAYS'ten eski bölümleri düşürür."""
+    cfg = current_app.config
+    if cfg["EVENTS_PARTITION"] == "off":
+        raise click.ClickException("EVENTS_PARTITION=off")
+    if since is not None:
+        since = since.replace(tzinfo=datetime.timezone.utc)
+    with db() as con:
+        with con.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+            created = ensure_partitions(cur, cfg["EVENTS_PARTITION"], cfg["EVENTS_PARTITIONS_AHEAD"], since)
+        con.commit()
+        print(f"[events] yeni bölümler: {', '.join(created) if created else 'yok'}")
+        dropped = apply_retention(con, cfg["EVENTS_RETENTION_DAYS"], cfg["EVENTS_ARCHIVE_DIR"])
+        print(f"[events] düşürülen: {len(dropped)} bölüm")
@@ -2,27 +2,33 @@
 import json
 import uuid
 import time
-from flask import request, session, g
+from flask import request, session, g, current_app
 from ..db import db
 from .utils import sha1, now_utc
+from .timing import summary, span
+from .metrics import inc, gauge_add
+from . import event_partitions
 
-def _session_id():
+def _session_id(create: bool = True):
     sid = session.get("sid")
-    if not sid:
+    if not sid and create:
         sid = uuid.uuid4().hex
         session["sid"] = sid
     return sid
 
 def log_event(event_type: str, payload: dict | None = None, status: int | None = None,
-              path: str | None = None, method: str | None = None):
+              path: str | None = None, method: str | None = None, new_sid: bool = True):
+    gauge_add("events_pending", 1)
     try:
         uid = session.get("user_id")
-        sid = _session_id()
+        sid = _session_id(new_sid)
         ip  = request.headers.get("X-Forwarded-For", request.remote_addr) or ""
         ua  = request.headers.get("User-Agent", "") or ""
         ref = request.headers.get("Referer", "") or ""
+        if event_partitions.due():
+            event_partitions.maybe_extend(current_app.config)
 
-        with db() as con, con.cursor() as cur:
+        with span("events"), db() as con, con.cursor() as cur:
             cur.execute("""
                 INSERT INTO user_events(user_id, session_id, event_type, path, method, status,
                                         ip_hash, ua_hash, referrer, payload, created_at)
@@ -39,8 +45,12 @@ def log_event(event_type: str, payload: dict | None = None, status: int | None =
                 now_utc(),
             ))
             con.commit()
+        inc("events_written_total", (("result", "ok"),))
     except Exception as e:
+        inc("events_written_total", (("result", "error"),))
         print("[user_events] ERROR:", e)
+    finally:
+        gauge_add("events_pending", -1)
 
 def register_event_logging(app):
     @app.before_request
@@ -49,14 +59,20 @@ def register_event_logging(app):
 
     @app.after_request
     def _ev_after(resp):
-        if request.path.startswith("/static"):
+        if request.path.startswith("/static") or request.path in ("/metrics", "/healthz", "/readyz"):
             return resp
 
         sensitive = (request.path in ("/login", "/register")) and request.method == "POST"
         ms = int((time.monotonic() - getattr(g, "_t0", time.monotonic())) * 1000)
         payload = {"ms": ms}
+        timing = summary()
+        if timing:
+            payload["timing"] = {k: v for k, v in timing.items() if k != "ms"}
         if not sensitive:
             payload["qs"] = {k: (v[:80] if isinstance(v, str) else v) for k, v in request.args.items()}
 
-        log_event("http_request", payload=payload, status=resp.status_code)
+        # paylaşılan önbelleğe girebilen yanıta Set-Cookie eklenmesin: yeni
+        # ziyaretçiye sid yalnız önbelleklenmeyen bir yanıtta verilir
+        public = resp.cache_control.public
+        log_event("http_request", payload=payload, status=resp.status_code, new_sid=not public)
         return resp
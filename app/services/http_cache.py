@@ -0,0 +1,63 @@
+# app/services/http_cache.py
+"""HTTP önbellek semantiği: ETag, Cache-Control, Vary ve ucuz 304 yanıtları.
+
+JSON uçlarında ETag, yanıtı üretmeden önce bilinen önbellek sürümlerinden
+(signals_hash, aday havuzu zamanı, liste TTL dilimi) hesaplanır; istemcinin
+If-None-Match'i eşleşirse view hiç çalışmaz (TMDB/DB işi yapılmaz).
+HTML sayfalarında ETag gövdeden türetilir; bu da en azından bant
+genişliğini kurtarır.
+"""
+import time
+import hashlib
+from functools import wraps
+from flask import current_app, request, make_response, g
+
+def make_tag(*parts) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+def time_bucket(ttl: int) -> int:
+    return int(time.time() // max(1, ttl))
+
+def args_key() -> str:
+    return "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+
+def mark_degraded():
+    """Yanıtın bir kısmı hata nedeniyle boş: ETag verilmez, önbelleğe alınmaz."""
+    g._degraded = True
+
+def conditional(validator, cache_control: str, vary=()):
+    """`validator()` -> ETag (ya da None). Eşleşirse 304, aksi halde view çalışır."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            tag = validator()
+            if tag and request.if_none_match.contains_weak(tag):
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+                if g.get("_degraded"):
+                    # 304 ile bozuk gövde tutulmasın; sonraki istek yeniden denesin
+                    resp.headers["Cache-Control"] = "no-store"
+                    return resp
+            if tag:
+                resp.set_etag(tag)
+            resp.headers["Cache-Control"] = cache_control
+            resp.vary.update(vary)
+            return resp
+        return wrapper
+    return deco
+
+def register_http_caching(app):
+    @app.after_request
+    def _html_validators(resp):
+        if request.method != "GET" or request.path.startswith("/static"):
+            return resp
+        if resp.status_code != 200 or resp.mimetype != "text/html" or resp.get_etag()[0]:
+            return resp
+        resp.headers.setdefault("Cache-Control", "private, no-cache")
+        resp.vary.add("Cookie")
+        resp.add_etag()
+        return resp.make_conditional(request)
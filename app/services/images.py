@@ -0,0 +1,249 @@
+# app/services/images.py
+"""TMDB poster/backdrop görselleri için yerel proxy + disk önbelleği.
+
+Her (varyant, dosya, biçim) üçlüsü sha1 anahtarıyla IMAGE_CACHE_DIR altında
+tek dosya olarak saklanır; TMDB dosya adları içerik özeti olduğundan anahtar
+değişmez ve güçlü ETag / immutable Cache-Control olarak kullanılabilir.
+Varyant genişlikleri kartların gerçek gösterim boyutlarına göre seçilir
+(Config.IMAGE_VARIANTS). Pillow kuruluysa görsel bu genişliğe küçültülüp
+(istemci kabul ediyorsa) WebP'ye çevrilir; değilse TMDB'nin en yakın
+hazır boyutu olduğu gibi saklanır.
+"""
+import io
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+from ..db import db
+from .utils import sha1
+from .tmdb import tmdb_get_cached
+
+try:
+    from PIL import Image
+except ImportError:  # opsiyonel
+    Image = None
+
+TMDB_IMG_BASE = "https://image.tmdb.org/t/p"
+TMDB_SIZES = (92, 154, 185, 342, 500, 780, 1280)
+_FILE_RE = re.compile(r"^[A-Za-z0-9_-]+\.(jpg|jpeg|png)$")
+_MIMETYPES = {"webp": "image/webp", "jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png"}
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_key_locks = {}
+_key_locks_lock = threading.Lock()
+_stats = {"hit": 0, "miss": 0, "errors": 0, "pruned": 0}
+_stats_lock = threading.Lock()
+_written = 0        # son prune'dan beri diske yazılan bayt
+_pruning = False
+
+def _bump(key, n=1):
+    with _stats_lock:
+        _stats[key] += n
+
+def valid_file(filename: str) -> bool:
+    return bool(_FILE_RE.match(filename or ""))
+
+def tmdb_size(width: int) -> str:
+    """`width` pikseli karşılayan en küçük TMDB boyutu."""
+    for w in TMDB_SIZES:
+        if w >= width:
+            return f"w{w}"
+    return "original"
+
+def tmdb_url(variant: str, filename: str) -> str:
+    width = current_app.config["IMAGE_VARIANTS"][variant]
+    return f"{TMDB_IMG_BASE}/{tmdb_size(width)}/{filename}"
+
+def _fmt(filename: str, webp: bool) -> str:
+    if Image is not None and webp:
+        return "webp"
+    return filename.rsplit(".", 1)[1].lower()
+
+def _path(key: str, fmt: str) -> str:
+    return os.path.join(current_app.config["IMAGE_CACHE_DIR"], key[:2], f"{key}.{fmt}")
+
+def _key_lock(key: str):
+    with _key_locks_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+def _transform(raw: bytes, width: int, fmt: str) -> bytes:
+    if Image is None:
+        return raw
+    img = Image.open(io.BytesIO(raw))
+    if img.width > width:
+        img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == "webp":
+        img.save(out, "WEBP", quality=current_app.config["IMAGE_QUALITY"], method=4)
+    elif fmt == "png":
+        img.save(out, "PNG", optimize=True)
+    else:
+        img.convert("RGB").save(out, "JPEG", quality=current_app.config["IMAGE_QUALITY"],
+                                optimize=True, progressive=True)
+    return out.getvalue()
+
+def _fetch(variant: str, filename: str, fmt: str) -> bytes:
+    cfg = current_app.config
+    r = _session.get(
+        tmdb_url(variant, filename),
+        timeout=(cfg["TMDB_CONNECT_TIMEOUT"], cfg["TMDB_READ_TIMEOUT"]),
+    )
+    r.raise_for_status()
+    return _transform(r.content, cfg["IMAGE_VARIANTS"][variant], fmt)
+
+def get_image(variant: str, filename: str, webp: bool = True):
+    """(disk yolu, mimetype, etag); gerekirse TMDB'den çekip önbelleğe yazar."""
+    fmt = _fmt(filename, webp)
+    key = sha1(f"{variant}|{filename}|{fmt}")
+    path = _path(key, fmt)
+    if os.path.exists(path):
+        _bump("hit")
+        return path, _MIMETYPES[fmt], key
+
+    with _key_lock(key):
+        if not os.path.exists(path):
+            _bump("miss")
+            try:
+                data = _fetch(variant, filename, fmt)
+            except Exception:
+                _bump("errors")
+                raise
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            _wrote(len(data))
+    with _key_locks_lock:
+        _key_locks.pop(key, None)
+    return path, _MIMETYPES[fmt], key
+
+def _wrote(nbytes: int):
+    """Sınırın %5'i kadar yeni veri yazılınca prune arka planda (tek seferde bir) çalışır."""
+    global _written, _pruning
+    cfg = current_app.config
+    max_bytes = cfg["IMAGE_CACHE_MAX_MB"] << 20
+    with _stats_lock:
+        _written += nbytes
+        if _pruning or _written < max_bytes // 20:
+            return
+        _written = 0
+        _pruning = True
+    root = cfg["IMAGE_CACHE_DIR"]
+
+    def run():
+        global _pruning
+        try:
+            prune(max_bytes, root)
+        except Exception as e:
+            print("[images] prune ERROR:", e)
+        finally:
+            _pruning = False
+
+    threading.Thread(target=run, name="image-prune", daemon=True).start()
+
+def image_metrics():
+    with _stats_lock:
+        return {**_stats, "pillow": Image is not None}
+
+# ---------------- Prefetch ----------------
+
+def _prefetch_targets():
+    """Aday havuzu + ana sayfa listelerindeki (varyant, dosya) çiftleri."""
+    with db() as con, con.cursor() as cur:
+        cur.execute("""
+            SELECT data->>'poster_path' AS poster, data->>'backdrop_path' AS backdrop
+            FROM candidate_movies
+            ORDER BY (data->>'pool_weight')::float DESC NULLS LAST
+            LIMIT %s
+        """, (current_app.config["CAND_POOL_LIMIT"],))
+        rows = cur.fetchall()
+
+    for path in ("/trending/movie/week", "/movie/now_playing", "/movie/popular"):
+        try:
+            rows += [
+                {"poster": m.get("poster_path"), "backdrop": m.get("backdrop_path")}
+                for m in tmdb_get_cached(path, {"page": 1}).get("results") or []
+            ]
+        except Exception as e:
+            print(f"[images] {path} alınamadı: {e}")
+
+    targets = {}
+    for r in rows:
+        for variant in ("card", "thumb"):
+            if r["poster"]:
+                targets[(variant, r["poster"].lstrip("/"))] = None
+        if r["backdrop"]:
+            targets[("backdrop", r["backdrop"].lstrip("/"))] = None
+    return [t for t in targets if valid_file(t[1])]
+
+def prune(max_bytes: int, root: str | None = None):
+    """Önbellek boyutu sınırı aşarsa en eski erişilen dosyaları siler."""
+    root = root or current_app.config["IMAGE_CACHE_DIR"]
+    files = []
+    for dirpath, _dirs, names in os.walk(root):
+        for n in names:
+            p = os.path.join(dirpath, n)
+            try:
+                st = os.stat(p)
+            except FileNotFoundError:  # eşzamanlı yazımın .tmp dosyası
+                continue
+            files.append((st.st_atime, st.st_size, p))
+    total = sum(f[1] for f in files)
+    removed = 0
+    for _atime, size, p in sorted(files):
+        if total <= max_bytes:
+            break
+        if p.endswith(".tmp"):
+            continue
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    _bump("pruned", removed)
+    if removed:
+        print(f"[images] {removed} dosya silindi, önbellek {total // (1 << 20)} MB.")
+
+def prefetch(limit: int | None = None):
+    """Aday havuzu ve trend listelerinin posterlerini önbelleğe ısıtır."""
+    cfg = current_app.config
+    targets = _prefetch_targets()[:limit]
+    app = current_app._get_current_object()
+
+    def job(t):
+        with app.app_context():
+            get_image(*t)
+
+    t0, failed = time.time(), 0
+    with ThreadPoolExecutor(max_workers=max(1, cfg["IMAGE_PREFETCH_WORKERS"])) as ex:
+        for fut in [ex.submit(job, t) for t in targets]:
+            try:
+                fut.result()
+            except Exception as e:
+                failed += 1
+                if failed <= 5:
+                    print(f"[images] prefetch hatası: {e}")
+    prune(cfg["IMAGE_CACHE_MAX_MB"] << 20)
+    print(f"[images] {len(targets)} görsel ısıtıldı ({failed} hata), {time.time() - t0:.1f} sn.")
+
+def schedule_prefetch():
+    """prefetch()'i arka plan thread'inde başlatır (aday havuzu yenilendikten sonra)."""
+    if not current_app.config["IMAGE_PREFETCH"]:
+        return
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                prefetch()
+        except Exception as e:
+            print("[images] prefetch ERROR:", e)
+
+    threading.Thread(target=run, name="image-prefetch", daemon=True).start()
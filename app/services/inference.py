@@ -0,0 +1,329 @@
+# app/services/inference.py
+"""Yerel çıkarım sunucusu: SBERT gömmeleri + duygu analizi tek süreçte.
+
+INFERENCE_URL ayarlıysa web worker'ları model yüklemez; embed_texts ve
+sentiment.analyze bu sunucuya kısa bir istek atan ince istemcilerdir
+(INFERENCE_TIMEOUT). Sunucu tüm worker'lardan gelen metinleri model başına
+sınırlı bir kuyrukta (INFERENCE_QUEUE_MAX) toplar, INFERENCE_BATCH_WAIT_MS
+bekleyip INFERENCE_MAX_BATCH'e kadar birleştirerek çalıştırır. Kuyruk
+doluysa "busy" döner; istemci INFERENCE_FALLBACK=local ise modeli süreç
+içinde çalıştırır, none ise hata/NEU döner. Bağlantı hatasından sonra
+sunucu INFERENCE_RETRY_SEC boyunca denenmez.
+
+    python inference_server.py                      # INFERENCE_URL'i dinler
+    INFERENCE_URL=unix:/tmp/filmapp-infer.sock gunicorn wsgi:app
+
+Protokol (yalnız yerel soket / iç ağ; kimlik doğrulama yok): 8 bayt
+(başlık uzunluğu, gövde uzunluğu) + JSON başlık + ham gövde (float32).
+"""
+import os
+import json
+import time
+import queue
+import socket
+import struct
+import argparse
+import threading
+import socketserver
+import numpy as np
+from flask import current_app, has_app_context
+from .metrics import inc
+
+DEFAULT_URL = "unix:/tmp/filmapp-infer.sock"
+
+class InferenceUnavailable(Exception):
+    """Sunucu kapalı, meşgul ya da zaman aşımı; çağıran fallback'e geçer."""
+
+# ---------------- Çerçeveleme ----------------
+
+def _send(sock, header: dict, blob: bytes = b""):
+    h = json.dumps(header).encode("utf-8")
+    sock.sendall(struct.pack(">II", len(h), len(blob)) + h + blob)
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("bağlantı kapandı")
+        buf += chunk
+    return bytes(buf)
+
+def _recv(sock):
+    hl, bl = struct.unpack(">II", _recv_exact(sock, 8))
+    header = json.loads(_recv_exact(sock, hl))
+    return header, (_recv_exact(sock, bl) if bl else b"")
+
+def _parse(url: str):
+    kind, _, rest = url.partition(":")
+    if kind == "unix" and rest:
+        return socket.AF_UNIX, rest
+    if kind == "tcp":
+        host, _, port = rest.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    raise ValueError(f"Geçersiz INFERENCE_URL: {url}")
+
+# ---------------- İstemci ----------------
+
+_local = threading.local()
+_down = {"until": 0.0}
+
+def _cfg():
+    if not has_app_context() or not current_app.config["INFERENCE_URL"]:
+        return None
+    return current_app.config
+
+def enabled() -> bool:
+    return _cfg() is not None
+
+def local_fallback() -> bool:
+    cfg = _cfg()
+    return cfg is None or cfg["INFERENCE_FALLBACK"] == "local"
+
+def _close():
+    sock = getattr(_local, "sock", None)
+    _local.sock = None
+    if sock is not None:
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+def _call(header: dict, timeout: float | None = None):
+    """timeout: istemci soket süresi; sunucu işi bunun %90'ında bitirmeye çalışır."""
+    cfg = _cfg()
+    timeout = timeout or cfg["INFERENCE_TIMEOUT"]
+    header = {**header, "timeout": timeout * 0.9}
+    if time.monotonic() < _down["until"]:
+        inc("inference_fallback_total", (("reason", "down"),))
+        raise InferenceUnavailable("sunucu kısa süre önce yanıt vermedi")
+    for attempt in (0, 1):
+        reused = getattr(_local, "sock", None) is not None
+        try:
+            if not reused:
+                family, addr = _parse(cfg["INFERENCE_URL"])
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.settimeout(cfg["INFERENCE_TIMEOUT"])
+                sock.connect(addr)
+                _local.sock = sock
+            _local.sock.settimeout(timeout)
+            _send(_local.sock, header)
+            resp, blob = _recv(_local.sock)
+            break
+        except (OSError, ValueError, struct.error) as e:
+            _close()
+            if reused and attempt == 0:
+                continue  # sunucu yeniden başlamış olabilir; taze bağlantıyla bir kez daha
+            _down["until"] = time.monotonic() + cfg["INFERENCE_RETRY_SEC"]
+            inc("inference_fallback_total", (("reason", "error"),))
+            print(f"[inference] sunucuya ulaşılamadı ({e}); {cfg['INFERENCE_RETRY_SEC']:.0f} sn fallback")
+            raise InferenceUnavailable(str(e))
+    if not resp.get("ok"):
+        inc("inference_fallback_total", (("reason", "busy" if resp.get("error") == "busy" else "error"),))
+        raise InferenceUnavailable(resp.get("error"))
+    return resp, blob
+
+def _chunks(texts):
+    texts = list(texts)
+    n = _cfg()["INFERENCE_MAX_TEXTS"]  # sunucunun istek başına sınırı
+    return [texts[i:i + n] for i in range(0, len(texts), n)] or [[]]
+
+def embed(texts, timeout: float | None = None) -> np.ndarray:
+    """timeout: parça başına; toplu/çevrimdışı çağıranlar INFERENCE_BULK_TIMEOUT verir."""
+    out = []
+    for part in _chunks(texts):
+        resp, blob = _call({"op": "embed", "texts": part}, timeout)
+        out.append(np.frombuffer(blob, dtype=np.float32).reshape(resp["shape"]))
+    return out[0] if len(out) == 1 else np.vstack(out)
+
+def sentiment(texts, timeout: float | None = None) -> list:
+    out = []
+    for part in _chunks(texts):
+        resp, _ = _call({"op": "sentiment", "texts": part}, timeout)
+        out.extend(tuple(r) for r in resp["results"])
+    return out
+
+def ping() -> dict:
+    return _call({"op": "ping"})[0]
+
+# ---------------- Sunucu ----------------
+
+class Busy(Exception):
+    pass
+
+class Batcher:
+    """Tek model için sınırlı kuyruk + dinamik batching thread'i."""
+
+    def __init__(self, name: str, fn, max_batch: int, wait: float, maxsize: int):
+        self.name = name
+        self.fn = fn
+        self.max_batch = max_batch
+        self.wait = wait
+        self.q = queue.Queue(maxsize=maxsize)
+        self.stats = {"requests": 0, "texts": 0, "batches": 0, "rejected": 0, "errors": 0}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._loop, name=f"batch-{name}", daemon=True).start()
+
+    def _count(self, **kw):
+        with self._lock:
+            for k, v in kw.items():
+                self.stats[k] += v
+
+    def submit(self, texts: list, timeout: float):
+        item = {"texts": texts, "done": threading.Event(), "out": None, "err": None}
+        try:
+            self.q.put_nowait(item)
+        except queue.Full:
+            self._count(rejected=1)
+            raise Busy()
+        if not item["done"].wait(timeout):
+            raise TimeoutError(f"{self.name} {timeout} sn içinde bitmedi")
+        if item["err"] is not None:
+            raise RuntimeError(item["err"])
+        return item["out"]
+
+    def _loop(self):
+        while True:
+            batch = [self.q.get()]
+            n = len(batch[0]["texts"])
+            deadline = time.monotonic() + self.wait
+            while n < self.max_batch:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    item = self.q.get(timeout=left)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n += len(item["texts"])
+
+            texts = [t for it in batch for t in it["texts"]]
+            try:
+                out = self.fn(texts)
+                i = 0
+                for it in batch:
+                    k = len(it["texts"])
+                    it["out"] = out[i:i + k]
+                    i += k
+            except Exception as e:
+                self._count(errors=1)
+                for it in batch:
+                    it["err"] = str(e)
+            self._count(requests=len(batch), texts=n, batches=1)
+            for it in batch:
+                it["done"].set()
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        srv = self.server
+        while True:
+            try:
+                header, _ = _recv(self.request)
+            except (OSError, ValueError, struct.error):
+                return
+            try:
+                self._dispatch(srv, header)
+            except Busy:
+                _send(self.request, {"ok": False, "error": "busy"})
+            except Exception as e:
+                _send(self.request, {"ok": False, "error": str(e)})
+
+    def _dispatch(self, srv, header):
+        op = header.get("op")
+        if op == "ping":
+            _send(self.request, {"ok": True, "pid": os.getpid()})
+            return
+        if op == "stats":
+            _send(self.request, {"ok": True, "stats": {b.name: {**b.stats, "queued": b.q.qsize()}
+                                                        for b in (srv.embedder, srv.sentiment)}})
+            return
+        texts = header.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise ValueError("texts bir metin listesi olmalı")
+        if len(texts) > srv.max_texts:
+            raise ValueError(f"istek başına en fazla {srv.max_texts} metin")
+        # istemcinin soket süresinden önce yanıt verilsin; üst sınır INFERENCE_BULK_TIMEOUT
+        timeout = min(float(header.get("timeout") or srv.timeout), srv.max_timeout)
+        if op == "embed":
+            vecs = np.asarray(srv.embedder.submit(texts, timeout), dtype=np.float32)
+            _send(self.request, {"ok": True, "shape": list(vecs.shape)}, vecs.tobytes())
+        elif op == "sentiment":
+            _send(self.request, {"ok": True, "results": srv.sentiment.submit(texts, timeout)})
+        else:
+            raise ValueError(f"bilinmeyen op: {op}")
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve(url: str, cfg):
+    from .. import sentiment as sentiment_mod
+    from .embeddings import sbert
+
+    def embed_fn(texts):
+        return sbert().encode(texts, batch_size=cfg.EMBED_BATCH_SIZE,
+                              convert_to_numpy=True, normalize_embeddings=True)
+
+    family, addr = _parse(url)
+    if family == socket.AF_UNIX:
+        if os.path.exists(addr):
+            os.unlink(addr)
+        server = _UnixServer(addr, _Handler)
+        os.chmod(addr, 0o660)
+    else:
+        server = _TCPServer(addr, _Handler)
+
+    wait = cfg.INFERENCE_BATCH_WAIT_MS / 1000.0
+    server.embedder = Batcher("embed", embed_fn, cfg.INFERENCE_MAX_BATCH, wait, cfg.INFERENCE_QUEUE_MAX)
+    server.sentiment = Batcher("sentiment", sentiment_mod.analyze_many, cfg.INFERENCE_MAX_BATCH, wait,
+                               cfg.INFERENCE_QUEUE_MAX)
+    # eski istemciler süre göndermez; onlar için varsayılan
+    server.timeout = cfg.INFERENCE_TIMEOUT * 0.9
+    server.max_timeout = cfg.INFERENCE_BULK_TIMEOUT * 0.9
+    server.max_texts = cfg.INFERENCE_MAX_TEXTS
+
+    for name, fn in (("sbert", embed_fn), ("sentiment", sentiment_mod.analyze_many)):
+        t0 = time.perf_counter()
+        try:
+            fn(["warmup"])
+            print(f"[inference] {name} hazır: {time.perf_counter() - t0:.1f} sn")
+        except Exception as e:
+            print(f"[inference] {name} yüklenemedi (istekler hata döner): {e}")
+
+    print(f"[inference] dinleniyor: {url} (pid {os.getpid()}, batch {cfg.INFERENCE_MAX_BATCH}, "
+          f"bekleme {cfg.INFERENCE_BATCH_WAIT_MS} ms, kuyruk {cfg.INFERENCE_QUEUE_MAX})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+
+def ping_url(url: str, timeout: float) -> dict:
+    """Uygulama bağlamı olmadan tek ping (healthcheck)."""
+    family, addr = _parse(url)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(addr)
+        _send(sock, {"op": "ping"})
+        return _recv(sock)[0]
+
+def main():
+    from ..config import Config
+    ap = argparse.ArgumentParser(description="SBERT + duygu analizi çıkarım sunucusu")
+    ap.add_argument("--bind", default=Config.INFERENCE_URL or DEFAULT_URL,
+                    help="unix:/yol.sock ya da tcp:host:port (varsayılan: INFERENCE_URL)")
+    ap.add_argument("--ping", action="store_true",
+                    help="sunucu --bind adresinde yanıt veriyor mu (çıkış kodu 0/1)")
+    args = ap.parse_args()
+    if args.ping:
+        try:
+            ok = bool(ping_url(args.bind, Config.INFERENCE_TIMEOUT).get("ok"))
+        except (OSError, ValueError, struct.error):
+            ok = False
+        raise SystemExit(0 if ok else 1)
+    serve(args.bind, Config)
@@ -0,0 +1,73 @@
+# app/services/maintenance.py
+"""Bakım komutları (eski `python app.py warmup` yerine tek CLI):
+
+    flask --app wsgi warmup --tasks sbert,candidates
+    flask --app wsgi rebuild-cache          # aday havuzu + gömmeler + bellek önbelleği
+    flask --app wsgi reembed [--all]        # model değiştiğinde gömmeleri baştan hesapla
+    flask --app wsgi rescore [--user 42]    # kullanıcı profilleri + user_recommendations
+
+`python app.py <komut>` da aynı komutları çalıştırır.
+"""
+import time
+import click
+from flask.cli import with_appcontext
+from ..db import db
+from .embeddings import ensure_embeddings
+from .recommender import get_candidate_cache, get_or_build_user_profile, invalidate_user_cache, score_user
+
+@click.command("rebuild-cache")
+@with_appcontext
+def rebuild_cache_command():
+    """Aday havuzunu TMDB'den yeniden kurar ve bellek önbelleğini tazeler."""
+    t0 = time.perf_counter()
+    cand = get_candidate_cache(force=True)
+    print(f"[maintenance] aday havuzu: {len(cand['ids'])} film, {time.perf_counter() - t0:.1f} sn")
+
+@click.command("reembed")
+@click.option("--all", "all_rows", is_flag=True, help="movie_embeddings'teki tüm filmler (varsayılan: aday havuzu).")
+@click.option("--batch", default=256, show_default=True, help="Tur başına film sayısı.")
+@with_appcontext
+def reembed_command(all_rows, batch):
+    """Metin değişmemiş olsa da film gömmelerini yeniden hesaplar."""
+    with db() as con, con.cursor() as cur:
+        table = "movie_embeddings" if all_rows else "candidate_movies"
+        cur.execute(f"SELECT movie_id FROM {table} ORDER BY movie_id")
+        ids = [r["movie_id"] for r in cur.fetchall()]
+
+    t0 = time.perf_counter()
+    done = 0
+    for i in range(0, len(ids), batch):
+        done += len(ensure_embeddings(ids[i:i + batch], force=True))
+        print(f"[maintenance] reembed {min(i + batch, len(ids))}/{len(ids)}")
+    print(f"[maintenance] {done} gömme yazıldı, {time.perf_counter() - t0:.1f} sn")
+
+@click.command("rescore")
+@click.option("--user", "user_ids", type=int, multiple=True, help="Yalnız bu kullanıcılar (tekrarlanabilir).")
+@with_appcontext
+def rescore_command(user_ids):
+    """Kullanıcı profillerini ve kişisel önerileri yeniden hesaplar."""
+    if not user_ids:
+        with db() as con, con.cursor() as cur:
+            cur.execute("""
+                SELECT user_id FROM favorites
+                UNION SELECT user_id FROM ratings
+                UNION SELECT user_id FROM trailer_events
+                ORDER BY user_id
+            """)
+            user_ids = [r["user_id"] for r in cur.fetchall()]
+
+    t0 = time.perf_counter()
+    scored = skipped = 0
+    for uid in user_ids:
+        invalidate_user_cache(uid)
+        sig, user_vec = get_or_build_user_profile(uid)
+        if user_vec is None:
+            skipped += 1
+            continue
+        if score_user(uid, sig, user_vec) is None:
+            print("[maintenance] aday havuzu boş; önce `rebuild-cache`")
+            break
+        scored += 1
+    print(f"[maintenance] rescore: {scored} kullanıcı, {skipped} sinyalsiz, {time.perf_counter() - t0:.1f} sn")
+
+COMMANDS = (rebuild_cache_command, reembed_command, rescore_command)
@@ -0,0 +1,317 @@
+# app/services/metrics.py
+"""Prometheus metin formatında /metrics.
+
+Sıcak yolda yalnızca süreç içi sayaç/gauge/histogram güncellenir (tek kilit +
+dict artırımı). Önbellek ve TMDB istatistikleri gibi zaten tutulan değerler
+kayıt anında toplayıcılardan (collector) okunur.
+
+gunicorn'da her worker kendi anlık görüntüsünü METRICS_DIR/<pid>.json olarak
+METRICS_FLUSH_SEC aralıkla yazar; /metrics'e gelen worker kendi görüntüsünü
+tazeleyip dizindeki hepsini toplar. Ölü worker'ların sayaç/histogramları
+korunur (sayaçlar geri gitmesin), gauge'ları atılır. METRICS_DIR boşsa tek
+süreç modu: dosya yazılmaz. Dizin sunucu başlarken boşaltılmalıdır
+(docker/entrypoint.sh).
+"""
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from flask import request, g, Response
+
+_META = {
+    "http_requests_total": ("counter", "Tamamlanan HTTP istekleri"),
+    "http_request_duration_seconds": ("histogram", "Rota bazlı istek süresi"),
+    "http_requests_in_flight": ("gauge", "Şu an işlenen istekler"),
+    "span_duration_seconds": ("histogram", "db/tmdb/model/sentiment/events blok süreleri"),
+    "db_connections_open": ("gauge", "Açık Postgres bağlantıları"),
+    "db_connections_total": ("counter", "Açılan Postgres bağlantıları"),
+    "db_async_pool": ("gauge", "ASGI async havuz istatistikleri"),
+    "tmdb_events_total": ("counter", "TMDB istemci olayları (çağrı, hata, retry, 429 ...)"),
+    "tmdb_stale_entries": ("gauge", "TMDB bayat yanıt önbelleği girdileri"),
+    "tmdb_breaker_open": ("gauge", "Devre kesici açık olan worker sayısı"),
+    "tmdb_replay_total": ("counter", "TMDB replay fixture sonuçları"),
+    "cache_hits_total": ("counter", "Önbellek isabetleri"),
+    "cache_misses_total": ("counter", "Önbellek ıskaları"),
+    "cache_entries": ("gauge", "Önbellekteki girdi sayısı"),
+    "image_errors_total": ("counter", "Görsel proxy indirme/dönüştürme hataları"),
+    "image_pruned_total": ("counter", "Boyut sınırı nedeniyle silinen önbellek görselleri"),
+    "candidate_pool_size": ("gauge", "Bellekteki aday matrisi satır sayısı"),
+    "events_pending": ("gauge", "Yazılmakta olan user_events kayıtları"),
+    "events_written_total": ("counter", "user_events yazımları"),
+    "inference_fallback_total": ("counter", "Çıkarım sunucusu yerine fallback (busy/down/error)"),
+}
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_hists = {}
+_collectors = []
+_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_state = {"dir": None, "flush": 5.0, "flusher": False}
+
+# ---------------- Sıcak yol ----------------
+
+def inc(name: str, labels: tuple = (), n: float = 1):
+    key = (name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+def gauge_add(name: str, n: float, labels: tuple = ()):
+    key = (name, labels)
+    with _lock:
+        _gauges[key] = _gauges.get(key, 0) + n
+
+def observe(name: str, value: float, labels: tuple = ()):
+    i = bisect.bisect_left(_buckets, value)
+    key = (name, labels)
+    with _lock:
+        h = _hists.get(key)
+        if h is None:
+            h = _hists[key] = [[0] * (len(_buckets) + 1), 0.0]
+        h[0][i] += 1
+        h[1] += value
+
+def register_collector(fn):
+    """fn() -> (tür, ad, etiketler, değer) demetleri; yalnızca kayıt anında çağrılır."""
+    _collectors.append(fn)
+
+def _after_fork():
+    # fork öncesi (preload) sayılanlar her worker'da tekrar sayılmasın
+    global _lock
+    _lock = threading.Lock()
+    _counters.clear()
+    _gauges.clear()
+    _hists.clear()
+    _state["flusher"] = False
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+# ---------------- Anlık görüntü + toplama ----------------
+
+def _snapshot() -> dict:
+    with _lock:
+        counters = [[n, l, v] for (n, l), v in _counters.items()]
+        gauges = [[n, l, v] for (n, l), v in _gauges.items()]
+        hists = [[n, l, list(c), s] for (n, l), (c, s) in _hists.items()]
+    for fn in _collectors:
+        try:
+            for kind, name, labels, value in fn():
+                (counters if kind == "counter" else gauges).append([name, labels, value])
+        except Exception as e:
+            print("[metrics] toplayıcı hatası:", e)
+    return {"pid": os.getpid(), "ts": time.time(), "buckets": list(_buckets),
+            "counters": counters, "gauges": gauges, "hists": hists}
+
+def _write(snap: dict):
+    fn = os.path.join(_state["dir"], f"{snap['pid']}.json")
+    tmp = f"{fn}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snap, f)
+    os.replace(tmp, fn)
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _gather() -> list:
+    own = _snapshot()
+    if not _state["dir"]:
+        return [own]
+    _write(own)
+    snaps = [own]
+    for name in os.listdir(_state["dir"]):
+        if not name.endswith(".json") or name == f"{own['pid']}.json":
+            continue
+        try:
+            with open(os.path.join(_state["dir"], name), encoding="utf-8") as f:
+                snaps.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snaps
+
+def _flush_loop():
+    while True:
+        time.sleep(_state["flush"])
+        try:
+            _write(_snapshot())
+        except Exception as e:
+            print("[metrics] görüntü yazılamadı:", e)
+
+def _start_flusher():
+    with _lock:
+        if _state["flusher"]:
+            return
+        _state["flusher"] = True
+    threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+def _final_flush():
+    if _state["dir"]:
+        try:
+            _write(_snapshot())
+        except Exception:
+            pass
+
+atexit.register(_final_flush)
+
+# ---------------- Metin formatı ----------------
+
+def _key(labels) -> tuple:
+    return tuple(tuple(p) for p in labels)
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in pairs) + "}"
+
+def _num(v) -> str:
+    v = float(v)
+    return str(int(v)) if v.is_integer() else repr(v)
+
+def render(snaps: list) -> str:
+    own_pid = os.getpid()
+    buckets = list(_buckets)
+    series = {}
+    hists = {}
+    for s in snaps:
+        live = s["pid"] == own_pid or _alive(s["pid"])
+        for n, l, v in s["counters"] + (s["gauges"] if live else []):
+            k = (n, _key(l))
+            series[k] = series.get(k, 0) + v
+        if s["buckets"] != buckets:
+            continue
+        for n, l, c, sm in s["hists"]:
+            h = hists.setdefault((n, _key(l)), [[0] * len(c), 0.0])
+            h[0] = [a + b for a, b in zip(h[0], c)]
+            h[1] += sm
+
+    by_name = {}
+    for (n, l), v in series.items():
+        by_name.setdefault(n, []).append((l, v))
+    for (n, l), h in hists.items():
+        by_name.setdefault(n, []).append((l, h))
+
+    out = []
+    for name in sorted(by_name):
+        kind, help_text = _META.get(name, ("untyped", name))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        for labels, v in sorted(by_name[name], key=lambda x: x[0]):
+            if kind != "histogram":
+                out.append(f"{name}{_labels(labels)} {_num(v)}")
+                continue
+            counts, total = v
+            acc = 0
+            for le, c in zip(buckets + ["+Inf"], counts):
+                acc += c
+                le = le if le == "+Inf" else _num(le)
+                out.append(f"{name}_bucket{_labels(labels, (('le', le),))} {acc}")
+            out.append(f"{name}_sum{_labels(labels)} {_num(total)}")
+            out.append(f"{name}_count{_labels(labels)} {acc}")
+    return "\n".join(out) + "\n"
+
+# ---------------- Servis toplayıcıları ----------------
+
+def _service_samples():
+    from .tmdb import tmdb_metrics, get_genres
+    from .render_cache import render_cache_metrics
+    from .query_cache import query_cache_metrics
+    from .images import image_metrics
+    from .tmdb_replay import replay_metrics
+    from .embeddings import movie_text_en
+    from .recommender import candidate_metrics
+    from ..db import async_pool_metrics
+
+    tm = tmdb_metrics()
+    yield "gauge", "tmdb_stale_entries", (), tm.pop("stale_entries")
+    yield "gauge", "tmdb_breaker_open", (), int(tm.pop("breaker") == "open")
+    for k, v in tm.items():
+        yield "counter", "tmdb_events_total", (("event", k),), v
+    for k, v in replay_metrics().items():
+        yield "counter", "tmdb_replay_total", (("result", k),), v
+
+    for name, fn in (("movie_text_en", movie_text_en), ("get_genres", get_genres)):
+        ci = fn.cache_info()
+        yield "counter", "cache_hits_total", (("cache", name),), ci.hits
+        yield "counter", "cache_misses_total", (("cache", name),), ci.misses
+        yield "gauge", "cache_entries", (("cache", name),), ci.currsize
+
+    rc = render_cache_metrics()
+    yield "gauge", "cache_entries", (("cache", "render"),), rc["entries"]
+    for name, st in rc["by_name"].items():
+        yield "counter", "cache_hits_total", (("cache", f"render:{name}"),), st["hit"]
+        yield "counter", "cache_misses_total", (("cache", f"render:{name}"),), st["miss"]
+
+    qc = query_cache_metrics()
+    yield "gauge", "cache_entries", (("cache", "query"),), qc["entries"]
+    for ep, st in qc["by_endpoint"].items():
+        yield "counter", "cache_hits_total", (("cache", f"query:{ep}"),), st["hit"] + st["prefix_hit"]
+        yield "counter", "cache_misses_total", (("cache", f"query:{ep}"),), st["miss"]
+
+    im = image_metrics()
+    yield "counter", "cache_hits_total", (("cache", "images"),), im["hit"]
+    yield "counter", "cache_misses_total", (("cache", "images"),), im["miss"]
+    yield "counter", "image_errors_total", (), im["errors"]
+    yield "counter", "image_pruned_total", (), im["pruned"]
+
+    cm = candidate_metrics()
+    yield "counter", "cache_hits_total", (("cache", "candidates"),), cm["hit"]
+    yield "counter", "cache_misses_total", (("cache", "candidates"),), cm["miss"]
+    yield "gauge", "candidate_pool_size", (), cm["size"]
+
+    for k, v in async_pool_metrics().items():
+        yield "gauge", "db_async_pool", (("stat", k),), v
+
+# ---------------- Flask entegrasyonu ----------------
+
+def metrics_view():
+    return Response(render(_gather()), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+def register_metrics(app):
+    global _buckets
+    cfg = app.config
+    if not cfg["METRICS"]:
+        return
+    _buckets = tuple(sorted(float(b) for b in cfg["METRICS_BUCKETS"]))
+    _state["flush"] = cfg["METRICS_FLUSH_SEC"]
+    if cfg["METRICS_DIR"]:
+        os.makedirs(cfg["METRICS_DIR"], exist_ok=True)
+        _state["dir"] = cfg["METRICS_DIR"]
+    register_collector(_service_samples)
+
+    @app.before_request
+    def _metrics_start():
+        if _state["dir"] and not _state["flusher"]:
+            _start_flusher()
+        g._metrics_t0 = time.perf_counter()
+        gauge_add("http_requests_in_flight", 1)
+
+    @app.after_request
+    def _metrics_status(resp):
+        g._metrics_status = resp.status_code
+        return resp
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        t0 = g.pop("_metrics_t0", None)
+        if t0 is None:
+            return
+        gauge_add("http_requests_in_flight", -1)
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        status = g.pop("_metrics_status", 500)
+        inc("http_requests_total", (("method", request.method), ("route", route), ("status", str(status))))
+        observe("http_request_duration_seconds", time.perf_counter() - t0,
+                (("method", request.method), ("route", route)))
+
+    app.add_url_rule("/metrics", "metrics", metrics_view)
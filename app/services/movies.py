@@ -0,0 +1,132 @@
+# app/services/movies.py
+"""`movies` tablosu: /movie/{id} TMDB yanıtları için kalıcı read-through önbellek.
+
+Her (movie_id, variant) satırı tam TMDB payload'ını, ETag'ini ve son çekilme
+zamanını tutar. variant, api_key dışındaki istek parametrelerinin normalize
+halidir (dil, append_to_response ...). Bayat satırlar hemen döndürülür ve
+arka planda ETag ile yeniden doğrulanır.
+"""
+import json
+import threading
+from urllib.parse import parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from ..db import db
+from .utils import now_utc
+from .tmdb import tmdb_fetch
+from . import typeahead
+
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="movie-refresh")
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+def _variant(params) -> str:
+    params = dict(params or {})
+    params.setdefault("language", "tr-TR")
+    params.pop("api_key", None)
+    return urlencode(sorted(params.items()), safe=",")
+
+def _params(variant: str) -> dict:
+    return dict(parse_qsl(variant, keep_blank_values=True))
+
+def _is_stale(row) -> bool:
+    age = (now_utc() - row["fetched_at"]).total_seconds()
+    return age > current_app.config["MOVIE_TTL_SEC"]
+
+def _save(movie_id: int, variant: str, data, etag):
+    with db() as con, con.cursor() as cur:
+        if data is None:
+            cur.execute(
+                "UPDATE movies SET fetched_at=%s WHERE movie_id=%s AND variant=%s",
+                (now_utc(), movie_id, variant),
+            )
+        else:
+            cur.execute(
+                """
+                INSERT INTO movies(movie_id, variant, data, etag, fetched_at)
+                VALUES (%s,%s,%s,%s,%s)
+                ON CONFLICT (movie_id, variant)
+                DO UPDATE SET data=EXCLUDED.data,
+                              etag=EXCLUDED.etag,
+                              fetched_at=EXCLUDED.fetched_at
+                """,
+                (movie_id, variant, json.dumps(data), etag, now_utc()),
+            )
+        con.commit()
+
+def _fetch_and_save(movie_id: int, variant: str, etag=None):
+    # yalnız gerçek 200/304 yanıtı saklanır; bellekteki stale kopya taze diye yazılmasın
+    data, new_etag = tmdb_fetch(f"/movie/{movie_id}", _params(variant), etag=etag, fallback=False)
+    _save(movie_id, variant, data, new_etag or etag)
+    if data is not None and _params(variant).get("language") == "tr-TR":
+        typeahead.add_items([data])
+    return data
+
+def _schedule_refresh(movie_id: int, variant: str, etag):
+    key = (movie_id, variant)
+    with _inflight_lock:
+        if key in _inflight:
+            return
+        _inflight.add(key)
+    app = current_app._get_current_object()
+
+    def job():
+        try:
+            with app.app_context():
+                _fetch_and_save(movie_id, variant, etag)
+        except Exception as e:
+            print(f"[movies] {movie_id} yenilenemedi: {e}")
+        finally:
+            with _inflight_lock:
+                _inflight.discard(key)
+
+    _refresh_pool.submit(job)
+
+def schedule_fetch(movie_ids, params=None):
+    """Depoda olmayan kayıtları istek yolunu bekletmeden arka planda çeker."""
+    variant = _variant(params)
+    for mid in movie_ids:
+        _schedule_refresh(int(mid), variant, None)
+
+def get_movies(movie_ids, params=None) -> dict:
+    """movie_id -> TMDB detay payload'ı; eksikler TMDB'den çekilip saklanır."""
+    movie_ids = [int(x) for x in dict.fromkeys(movie_ids or []) if x]
+    if not movie_ids:
+        return {}
+    variant = _variant(params)
+
+    with db() as con, con.cursor() as cur:
+        cur.execute(
+            "SELECT movie_id, data, etag, fetched_at FROM movies WHERE variant=%s AND movie_id = ANY(%s)",
+            (variant, movie_ids),
+        )
+        rows = {r["movie_id"]: r for r in cur.fetchall()}
+
+    out = {}
+    for mid in movie_ids:
+        row = rows.get(mid)
+        if row is not None:
+            if _is_stale(row):
+                _schedule_refresh(mid, variant, row["etag"])
+            out[mid] = row["data"]
+            continue
+        try:
+            out[mid] = _fetch_and_save(mid, variant)
+        except Exception as e:
+            print(f"[movies] {mid} alınamadı: {e}")
+    return out
+
+def get_movie(movie_id: int, params=None):
+    variant = _variant(params)
+    with db() as con, con.cursor() as cur:
+        cur.execute(
+            "SELECT data, etag, fetched_at FROM movies WHERE movie_id=%s AND variant=%s",
+            (movie_id, variant),
+        )
+        row = cur.fetchone()
+
+    if row is not None:
+        if _is_stale(row):
+            _schedule_refresh(movie_id, variant, row["etag"])
+        return row["data"]
+    return _fetch_and_save(movie_id, variant)
@@ -0,0 +1,96 @@
+# app/services/payload.py
+"""JSON API yanıt hattı: kırpma -> hızlı serileştirme -> sıkıştırma.
+
+- trim_list: TMDB liste payload'larını main.js'in çizdiği alanlara indirir
+  (movieCard / featCard: id, title, poster_path, backdrop_path,
+  vote_average, release_date).
+- FastJSONProvider: orjson kuruluysa jsonify onu kullanır; değilse stdlib.
+- register_compression: Accept-Encoding'e göre br (brotli kuruluysa) ya da
+  gzip; COMPRESS_MIN_SIZE altındaki gövdeler sıkıştırılmaz.
+"""
+import gzip
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # opsiyonel
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # opsiyonel
+    brotli = None
+
+CARD_FIELDS = ("id", "title", "poster_path", "backdrop_path", "vote_average", "release_date")
+_LIST_FIELDS = ("page", "total_pages", "total_results")
+
+def card(m: dict) -> dict:
+    return {k: m.get(k) for k in CARD_FIELDS}
+
+def trim_list(data):
+    """{"results": [...], "page": ...} -> yalnız kart alanları."""
+    if not data:
+        return data
+    out = {k: data[k] for k in _LIST_FIELDS if k in data}
+    out["results"] = [card(m) for m in data.get("results") or []]
+    return out
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson ile str'ye çevirmeden doğrudan bytes gövde üretir."""
+
+    def _orjson(self, obj) -> bytes:
+        # datetime'lar stdlib provider ile aynı biçimde (http_date) kalsın
+        opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=opts)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs.get("indent") or kwargs.get("cls"):
+            return super().dumps(obj, **kwargs)
+        return self._orjson(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson(obj), mimetype=self.mimetype)
+
+def _encoding():
+    accept = request.accept_encodings
+    if brotli is not None and accept.quality("br") > 0:
+        return "br"
+    if accept.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+def register_compression(app):
+    @app.after_request
+    def _compress(resp):
+        cfg = app.config
+        if not cfg["COMPRESS"] or resp.status_code != 200:
+            return resp
+        if resp.direct_passthrough or resp.is_streamed or "Content-Encoding" in resp.headers:
+            return resp
+        if resp.mimetype not in cfg["COMPRESS_MIMETYPES"]:
+            return resp
+        resp.vary.add("Accept-Encoding")
+        if (resp.content_length or 0) < cfg["COMPRESS_MIN_SIZE"]:
+            return resp
+        encoding = _encoding()
+        if encoding is None:
+            return resp
+
+        resp.set_data(compress(resp.get_data(), encoding, cfg["COMPRESS_LEVEL"]))
+        resp.headers["Content-Encoding"] = encoding
+        # kodlanmış gövde bayt bayt aynı değil: güçlü ETag'i zayıfa çevir
+        tag, weak = resp.get_etag()
+        if tag and not weak:
+            resp.set_etag(tag, weak=True)
+        return resp
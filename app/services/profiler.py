@@ -0,0 +1,137 @@
+# app/services/profiler.py
+"""Çalışan worker için isteğe bağlı örnekleyici profiler (varsayılan kapalı).
+
+Ek bağımlılık yok: ayrı bir thread her PROFILE_INTERVAL_MS'de
+sys._current_frames() ile tüm thread'lerin yığınını okur ve "collapsed"
+formatta sayar (flamegraph.pl ve speedscope doğrudan açar).
+
+PROFILING=1 ve PROFILE_TOKEN ayarlıysa:
+  GET /_profile?seconds=10             -> isteği alan worker'ı N sn örnekler,
+                                          collapsed metin döner (&download=1: dosya)
+  X-Profile: 1 başlıklı herhangi bir istek -> yalnız o isteğin thread'i örneklenir;
+                                          sonuç PROFILE_DIR'e yazılır, adı
+                                          X-Profile-File başlığında döner
+  GET /_profile/files/<ad>              -> kaydedilmiş profil
+Tüm uçlar X-Profile-Token (ya da Authorization: Bearer) ister.
+"""
+import os
+import sys
+import time
+import hmac
+import threading
+from collections import Counter
+from flask import request, g, abort, Response, send_from_directory
+
+class Sampler:
+    def __init__(self, interval: float, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.counts = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self.started = time.time()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own or (self.thread_id is not None and tid != self.thread_id):
+                    continue
+                self.counts[_collapse(names.get(tid, str(tid)), frame)] += 1
+            self.samples += 1
+
+    def stop(self) -> "Sampler":
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.most_common())
+
+def _collapse(thread_name: str, frame) -> str:
+    parts = []
+    while frame is not None:
+        co = frame.f_code
+        parts.append(f"{co.co_name} ({os.path.basename(co.co_filename)}:{co.co_firstlineno})")
+        frame = frame.f_back
+    parts.append(thread_name)
+    return ";".join(reversed(parts))
+
+_busy = threading.Lock()
+
+def profile_for(seconds: float, interval: float) -> Sampler:
+    """Süreç genelinde örnekleme; aynı anda tek profil (meşgulse None)."""
+    if not _busy.acquire(blocking=False):
+        return None
+    try:
+        sampler = Sampler(interval).start()
+        time.sleep(seconds)
+        return sampler.stop()
+    finally:
+        _busy.release()
+
+def _save(directory: str, sampler: Sampler, tag: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    name = f"{os.getpid()}-{int(sampler.started * 1000)}-{tag}.folded"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write(sampler.collapsed())
+    return name
+
+def register_profiling(app):
+    cfg = app.config
+    if not cfg["PROFILING"]:
+        return
+    if not cfg["PROFILE_TOKEN"]:
+        print("[profiler] PROFILING=1 ama PROFILE_TOKEN boş; profiler kapalı.")
+        return
+    interval = cfg["PROFILE_INTERVAL_MS"] / 1000.0
+
+    def _authorized() -> bool:
+        token = request.headers.get("X-Profile-Token", "")
+        auth = request.headers.get("Authorization", "")
+        if not token and auth.startswith("Bearer "):
+            token = auth[7:]
+        return hmac.compare_digest(token.encode(), cfg["PROFILE_TOKEN"].encode())
+
+    @app.before_request
+    def _profile_start():
+        if request.headers.get("X-Profile") == "1" and _authorized():
+            g._profiler = Sampler(interval, threading.get_ident()).start()
+
+    @app.after_request
+    def _profile_finish(resp):
+        sampler = g.pop("_profiler", None)
+        if sampler is not None:
+            sampler.stop()
+            name = _save(cfg["PROFILE_DIR"], sampler, request.endpoint or "unmatched")
+            resp.headers["X-Profile-File"] = name
+            resp.headers["X-Profile-Samples"] = str(sampler.samples)
+        return resp
+
+    def profile_view():
+        if not _authorized():
+            abort(403)
+        seconds = min(max(request.args.get("seconds", 10, type=float), 0.1), cfg["PROFILE_MAX_SEC"])
+        sampler = profile_for(seconds, interval)
+        if sampler is None:
+            return Response("Bu worker'da zaten bir profil çalışıyor.\n", status=409, mimetype="text/plain")
+        headers = {"X-Profile-Pid": str(os.getpid()), "X-Profile-Samples": str(sampler.samples)}
+        if request.args.get("download") == "1":
+            name = _save(cfg["PROFILE_DIR"], sampler, "worker")
+            headers["Content-Disposition"] = f"attachment; filename={name}"
+        return Response(sampler.collapsed(), mimetype="text/plain", headers=headers)
+
+    def profile_file(name):
+        if not _authorized():
+            abort(403)
+        return send_from_directory(cfg["PROFILE_DIR"], name, mimetype="text/plain", as_attachment=True)
+
+    app.add_url_rule("/_profile", "profile", profile_view)
+    app.add_url_rule("/_profile/files/<name>", "profile_file", profile_file)
+    print(f"[profiler] açık (aralık {cfg['PROFILE_INTERVAL_MS']} ms, en fazla {cfg['PROFILE_MAX_SEC']} sn)")
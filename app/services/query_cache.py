@@ -0,0 +1,93 @@
+# app/services/query_cache.py
+"""/search ve /api/search_suggest için normalize sorgu -> TMDB sonuç önbelleği (LRU + TTL).
+
+Ardışık tuş vuruşları ("inc" -> "ince" -> "incep") daraltmadır: daha kısa
+bir sorgunun önbellekteki 1. sayfası, başlık/orijinal başlıkta (typeahead
+ile aynı Türkçe katlamayla) süzülünce öneri listesini (need) dolduruyorsa
+yeni sorgu TMDB'ye gitmeden yanıtlanır. TMDB alternatif başlık ve
+çevriyazımlarla da eşleştiğinden süzme eksik kalabilir: need'den az kayıt
+kalırsa, ya da tam liste isteniyorsa (need=0, /search) TMDB'ye gidilir.
+"""
+import time
+import threading
+from collections import OrderedDict
+from flask import current_app
+from .typeahead import fold
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+_stats = {}
+_MIN_PREFIX = 2
+
+def _count(endpoint, field):
+    with _lock:
+        st = _stats.setdefault(endpoint, {"hit": 0, "prefix_hit": 0, "miss": 0})
+        st[field] += 1
+
+def _get(key):
+    with _lock:
+        item = _cache.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.monotonic():
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return item[1]
+
+def _matches(m, norm):
+    return norm in fold(m.get("title")) or norm in fold(m.get("original_title"))
+
+def _from_prefix(endpoint, norm, need):
+    for i in range(len(norm) - 1, _MIN_PREFIX - 1, -1):
+        broader = _get((endpoint, norm[:i], 1))
+        if broader is None:
+            continue
+        hits = [m for m in (broader.get("results") or []) if _matches(m, norm)]
+        if len(hits) >= need:
+            return {"results": hits, "page": 1, "total_pages": 1, "total_results": len(hits)}
+    return None
+
+def lookup(endpoint: str, q: str, page: int = 1, need: int = 0):
+    """Tam eşleşme, yoksa önek daraltması; ikisi de yoksa None.
+
+    Önek daraltması yalnız need > 0 iken ve süzülen sonuç en az `need`
+    kayıt veriyorsa kullanılır (öneri kutusu için yeterli).
+    """
+    norm = fold(q)
+    data = _get((endpoint, norm, page))
+    if data is not None:
+        _count(endpoint, "hit")
+        return data
+    if page == 1 and need > 0 and len(norm) > _MIN_PREFIX:
+        data = _from_prefix(endpoint, norm, need)
+        if data is not None:
+            _count(endpoint, "prefix_hit")
+            return data
+    _count(endpoint, "miss")
+    return None
+
+def store(endpoint: str, q: str, page: int, data):
+    cfg = current_app.config
+    key = (endpoint, fold(q), page)
+    with _lock:
+        _cache[key] = (time.monotonic() + cfg["QUERY_CACHE_TTL"], data)
+        _cache.move_to_end(key)
+        while len(_cache) > cfg["QUERY_CACHE_MAX"]:
+            _cache.popitem(last=False)
+
+def cached_search(endpoint: str, q: str, page: int, fetch, need: int = 0):
+    data = lookup(endpoint, q, page, need)
+    if data is None:
+        data = fetch()
+        store(endpoint, q, page, data)
+    return data
+
+def query_cache_metrics():
+    with _lock:
+        out = {ep: dict(st) for ep, st in _stats.items()}
+        entries = len(_cache)
+    for st in out.values():
+        total = st["hit"] + st["prefix_hit"] + st["miss"]
+        st["hit_ratio"] = round((st["hit"] + st["prefix_hit"]) / total, 4) if total else None
+    return {"entries": entries, "by_endpoint": out}
@@ -4,14 +4,23 @@ import time
 import threading
 import hashlib
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import current_app
 from ..db import db
 from .utils import now_utc
-from .tmdb import tmdb_get
+from .tmdb import tmdb_get, get_genres, limiter_budget
 from .embeddings import ensure_embeddings
+from .images import schedule_prefetch
 
 CAND_TTL_SEC = 60 * 60
 _mem_lock = threading.Lock()
+_mem_built = threading.Condition(_mem_lock)
 _mem_cand = {"ts": 0.0, "ids": [], "meta": {}, "mat": None}
+_building = False   # tek seferde bir yenileme; diğer istekler önceki havuzu kullanır
+RETRY_DEFERRED_SEC = 60
+_cand_stats = {"hit": 0, "miss": 0}
+_pool_ver = {"ts": 0.0, "v": None}
+POOL_VERSION_TTL_SEC = 60
 
 def user_signals_hash(uid: int) -> str:
     with db() as con, con.cursor() as cur:
@@ -30,13 +39,49 @@ def user_signals_hash(uid: int) -> str:
     raw = f"fav:{fmt(fav)}|rat:{fmt(rat)}|trl:{fmt(trl)}"
     return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
+def pool_version() -> str:
+    """Aday havuzunun son güncellenme zamanı (HTTP ETag'leri için, 60 sn önbellekli)."""
+    if _pool_ver["v"] is None or time.time() - _pool_ver["ts"] > POOL_VERSION_TTL_SEC:
+        with db() as con, con.cursor() as cur:
+            cur.execute("SELECT MAX(updated_at) AS m FROM candidate_movies")
+            m = cur.fetchone()["m"]
+        _pool_ver.update(ts=time.time(), v=m.isoformat() if m else "0")
+    return _pool_ver["v"]
+
 def invalidate_user_cache(uid: int):
     with db() as con, con.cursor() as cur:
         cur.execute("DELETE FROM user_profiles WHERE user_id=%s", (uid,))
         cur.execute("DELETE FROM user_recommendations WHERE user_id=%s", (uid,))
         con.commit()
 
+def _pool_jobs(cfg):
+    """(path, params, weight) listesi: sabit kaynaklar + tür/yıl bazlı discover sorguları."""
+    jobs = []
+    for src in cfg["CAND_SOURCES"]:
+        for p in range(1, int(src.get("pages", 1)) + 1):
+            jobs.append((src["path"], {**(src.get("params") or {}), "page": p}, float(src.get("weight", 1.0))))
+
+    pages = cfg["CAND_DISCOVER_PAGES"]
+    weight = cfg["CAND_DISCOVER_WEIGHT"]
+    base = {"sort_by": "popularity.desc", "vote_count.gte": 50}
+    if cfg["CAND_DISCOVER_GENRES"]:
+        try:
+            genre_ids = [g["id"] for g in get_genres()]
+        except Exception as e:
+            print("[candidates] tür listesi alınamadı:", e)
+            genre_ids = []
+        for gid in genre_ids:
+            for p in range(1, pages + 1):
+                jobs.append(("/discover/movie", {**base, "with_genres": gid, "page": p}, weight))
+
+    this_year = now_utc().year
+    for y in range(this_year, this_year - cfg["CAND_DISCOVER_YEARS"], -1):
+        for p in range(1, pages + 1):
+            jobs.append(("/discover/movie", {**base, "primary_release_year": y, "page": p}, weight))
+    return jobs
+
 def refresh_candidate_pool(force: bool = False):
+    """TMDB'den havuzu yeniler. Limiter bütçesi yetmezse ertelenir ve False döner."""
     with db() as con, con.cursor() as cur:
         cur.execute("SELECT MAX(updated_at) AS m FROM candidate_movies")
         row = cur.fetchone()
@@ -46,82 +91,157 @@ def refresh_candidate_pool(force: bool = False):
     if (not force) and age < CAND_TTL_SEC:
         return
 
-    def grab(path, pages):
-        out = []
-        for p in range(1, pages + 1):
+    cfg = current_app.config
+    # kullanıcı isteklerine bütçe kalsın: limiter'ın CAND_CRAWL_SEC içinde verebileceği kadar sayfa
+    budget = int(limiter_budget(cfg["CAND_CRAWL_SEC"]))
+    if budget < len(cfg["CAND_SOURCES"]):
+        print(f"[candidates] TMDB bütçesi yetersiz ({budget} istek); yenileme ertelendi.")
+        return False
+    jobs = _pool_jobs(cfg)[: min(cfg["CAND_MAX_PAGES"], budget)]
+    app = current_app._get_current_object()
+
+    def fetch(job):
+        path, params, weight = job
+        with app.app_context():
+            return weight, (tmdb_get(path, {**params, "language": "en-US"}).get("results") or [])
+
+    cand, failed = {}, 0
+    with ThreadPoolExecutor(max_workers=max(1, cfg["CAND_FETCH_WORKERS"])) as ex:
+        futures = {ex.submit(fetch, job): job for job in jobs}
+        for fut in as_completed(futures):
             try:
-                out.extend((tmdb_get(path, {"page": p, "language": "en-US"}).get("results") or []))
-            except Exception:
-                pass
-        return out
-
-    pool = []
-    pool += grab("/movie/popular", 3)
-    pool += grab("/movie/top_rated", 3)
-    pool += grab("/trending/movie/week", 3)
-    pool += grab("/movie/now_playing", 2)
-
-    cand = {}
-    for m in pool:
-        mid = m.get("id")
-        if not mid:
-            continue
-        if not (m.get("poster_path") or m.get("backdrop_path")):
-            continue
-        cand[mid] = {
-            "id": mid,
-            "title": m.get("title"),
-            "poster_path": m.get("poster_path"),
-            "vote_average": m.get("vote_average"),
-            "release_date": m.get("release_date"),
-        }
+                weight, results = fut.result()
+            except Exception as e:
+                failed += 1
+                path, params, _w = futures[fut]
+                print(f"[candidates] {path} {params} alınamadı: {e}")
+                continue
+            for m in results:
+                mid = m.get("id")
+                if not mid:
+                    continue
+                if not (m.get("poster_path") or m.get("backdrop_path")):
+                    continue
+                item = cand.get(mid)
+                if item is None:
+                    item = cand[mid] = {
+                        "id": mid,
+                        "title": m.get("title"),
+                        "poster_path": m.get("poster_path"),
+                        "vote_average": m.get("vote_average"),
+                        "release_date": m.get("release_date"),
+                        "backdrop_path": m.get("backdrop_path"),
+                        "genre_ids": m.get("genre_ids") or [],
+                        "popularity": m.get("popularity"),
+                        "vote_count": m.get("vote_count"),
+                        "original_language": m.get("original_language"),
+                        "pool_weight": 0.0,
+                    }
+                item["pool_weight"] = round(item["pool_weight"] + weight, 3)
+
+    if failed:
+        print(f"[candidates] {failed}/{len(jobs)} sayfa başarısız.")
+    if not cand:
+        return
 
     now = now_utc()
     with db() as con, con.cursor() as cur:
-        for mid, data in cand.items():
-            cur.execute(
-                """
-                INSERT INTO candidate_movies(movie_id, data, updated_at)
-                VALUES (%s,%s,%s)
-                ON CONFLICT (movie_id)
-                DO UPDATE SET data=EXCLUDED.data,
-                              updated_at=EXCLUDED.updated_at
-                """,
-                (mid, json.dumps(data), now),
-            )
+        cur.executemany(
+            """
+            INSERT INTO candidate_movies(movie_id, data, updated_at)
+            VALUES (%s,%s,%s)
+            ON CONFLICT (movie_id)
+            DO UPDATE SET data=EXCLUDED.data,
+                          updated_at=EXCLUDED.updated_at
+            """,
+            [(mid, json.dumps(data), now) for mid, data in cand.items()],
+        )
         con.commit()
+    schedule_prefetch()
+
+def _load_candidates(limit: int) -> dict:
+    with db() as con, con.cursor() as cur:
+        cur.execute(
+            """
+            SELECT movie_id, data FROM candidate_movies
+            -- eski yenilemelerden kalan satırlar yalnız havuz eksikse dolgu olur
+            ORDER BY updated_at >= (SELECT MAX(updated_at) FROM candidate_movies) DESC,
+                     (data->>'pool_weight')::float DESC NULLS LAST, updated_at DESC
+            LIMIT %s
+            """,
+            (limit,),
+        )
+        rows = cur.fetchall()
+
+    ids = [r["movie_id"] for r in rows]
+    meta = {r["movie_id"]: r["data"] for r in rows}
+    emb_map = ensure_embeddings(ids)
 
-def get_candidate_cache(force: bool = False, limit: int = 240):
-    global _mem_cand
+    mats, ok_ids = [], []
+    for mid in ids:
+        v = emb_map.get(mid)
+        if v is None:
+            continue
+        ok_ids.append(mid)
+        mats.append(v)
+
+    mat = np.vstack(mats) if mats else None
+    return {"ts": time.time(), "ids": ok_ids, "meta": meta, "mat": mat}
+
+def _rebuild(force: bool, limit: int):
+    """Kilit dışında: havuzu yeniler ve belleğe yükler; bitince bekleyenleri uyandırır."""
+    global _mem_cand, _building
+    try:
+        deferred = refresh_candidate_pool(force=force) is False
+        cand = _load_candidates(limit)
+        if deferred:
+            # bütçe yetmedi: DB'deki havuz kullanılır, kısa süre sonra yeniden denenir
+            cand["ts"] = time.time() - CAND_TTL_SEC + RETRY_DEFERRED_SEC
+        with _mem_lock:
+            _mem_cand = cand
+    finally:
+        with _mem_lock:
+            _building = False
+            _mem_built.notify_all()
+
+def get_candidate_cache(force: bool = False, limit: int | None = None):
+    """Bellekteki aday havuzu. Süresi dolmuşsa tek bir yenileme başlar;
+    önceki havuz varken istekler beklemez (yenileme arka planda), yoksa biter beklenir."""
+    global _building
+    limit = limit or current_app.config["CAND_POOL_LIMIT"]
     with _mem_lock:
-        if (not force) and _mem_cand["mat"] is not None and (time.time() - _mem_cand["ts"] < CAND_TTL_SEC):
+        have = _mem_cand["mat"] is not None
+        if (not force) and have and (time.time() - _mem_cand["ts"] < CAND_TTL_SEC):
+            _cand_stats["hit"] += 1
             return _mem_cand
+        _cand_stats["miss"] += 1
+        if _building:
+            if have and not force:
+                return _mem_cand
+            while _building:
+                _mem_built.wait()
+            return _mem_cand
+        _building = True
 
-        refresh_candidate_pool(force=force)
+    if have and not force:
+        app = current_app._get_current_object()
 
-        with db() as con, con.cursor() as cur:
-            cur.execute(
-                "SELECT movie_id, data FROM candidate_movies ORDER BY updated_at DESC LIMIT %s",
-                (limit,),
-            )
-            rows = cur.fetchall()
-
-        ids = [r["movie_id"] for r in rows]
-        meta = {r["movie_id"]: r["data"] for r in rows}
-        emb_map = ensure_embeddings(ids)
-
-        mats, ok_ids = [], []
-        for mid in ids:
-            v = emb_map.get(mid)
-            if v is None:
-                continue
-            ok_ids.append(mid)
-            mats.append(v)
+        def run():
+            try:
+                with app.app_context():
+                    _rebuild(False, limit)
+            except Exception as e:
+                print("[candidates] yenileme ERROR:", e)
 
-        mat = np.vstack(mats) if mats else None
-        _mem_cand = {"ts": time.time(), "ids": ok_ids, "meta": meta, "mat": mat}
+        threading.Thread(target=run, name="candidate-refresh", daemon=True).start()
         return _mem_cand
 
+    _rebuild(force, limit)
+    return _mem_cand
+
+def candidate_metrics():
+    return {**_cand_stats, "size": len(_mem_cand["ids"])}
+
 def get_or_build_user_profile(uid: int):
     sig = user_signals_hash(uid)
 
@@ -216,3 +336,57 @@ def get_or_build_user_profile(uid: int):
         con.commit()
 
     return sig, user_vec
+
+def rank_candidates(mat, ids, user_vec, seen, k=12):
+    """Kullanıcı vektörüne en yakın, görülmemiş k aday: [(skor, movie_id), ...]."""
+    scores = mat @ user_vec
+    pairs = [(float(scores[i]), mid) for i, mid in enumerate(ids) if mid not in seen]
+    pairs.sort(reverse=True, key=lambda x: x[0])
+    return pairs[:k]
+
+def score_user(uid: int, sig: str, user_vec) -> list | None:
+    """Adayları puanlar, user_recommendations'a yazar; aday havuzu boşsa None.
+
+    İstek bağlamı gerektirmez: /api/personalized ve `flask rescore` ortak kullanır.
+    """
+    cand = get_candidate_cache(force=False)
+    mat, ids, meta = cand["mat"], cand["ids"], cand["meta"]
+    if mat is None or not ids:
+        return None
+
+    seen = set()
+    with db() as con, con.cursor() as cur:
+        cur.execute("SELECT movie_id FROM favorites WHERE user_id=%s", (uid,))
+        seen.update([r["movie_id"] for r in cur.fetchall()])
+        cur.execute("SELECT movie_id FROM ratings WHERE user_id=%s", (uid,))
+        seen.update([r["movie_id"] for r in cur.fetchall()])
+        cur.execute("SELECT movie_id FROM trailer_events WHERE user_id=%s", (uid,))
+        seen.update([r["movie_id"] for r in cur.fetchall()])
+
+    top = rank_candidates(mat, ids, user_vec, seen)
+
+    results = []
+    now = now_utc()
+    with db() as con, con.cursor() as cur:
+        for score, mid in top:
+            d = meta.get(mid) or {"id": mid}
+            item = {
+                "id": d.get("id", mid),
+                "title": d.get("title"),
+                "poster_path": d.get("poster_path"),
+                "vote_average": d.get("vote_average"),
+                "release_date": d.get("release_date"),
+            }
+            results.append({**item, "sim": round(score, 4)})
+
+            cur.execute("""
+                INSERT INTO user_recommendations(user_id, movie_id, score, data, signals_hash, updated_at)
+                VALUES (%s,%s,%s,%s,%s,%s)
+                ON CONFLICT (user_id, movie_id)
+                DO UPDATE SET score=EXCLUDED.score,
+                              data=EXCLUDED.data,
+                              signals_hash=EXCLUDED.signals_hash,
+                              updated_at=EXCLUDED.updated_at
+            """, (uid, mid, score, json.dumps(item), sig, now))
+        con.commit()
+    return results
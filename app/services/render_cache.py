@@ -0,0 +1,98 @@
+# app/services/render_cache.py
+"""Render edilmiş HTML için süreç içi TTL önbelleği.
+
+- cached_page: anonim GET isteklerinde sayfanın tamamı (rota + argümanlar + dil).
+- fragment: giriş yapmış kullanıcılarda da paylaşılabilen statik parçalar
+  (trend listesi, benzer filmler ...). Kullanıcıya özel kısımlar her istekte
+  yeniden render edilir.
+TTL'ler Config.RENDER_CACHE_TTLS içinde parça adına göre tanımlanır.
+"""
+import time
+import threading
+from collections import OrderedDict
+from markupsafe import Markup
+from flask import current_app, request, session
+
+_lock = threading.Lock()
+_store = OrderedDict()
+_stats = {}
+
+def _lang() -> str:
+    return request.accept_languages.best_match(["tr", "en"]) or "tr"
+
+def _ttl(name: str) -> int:
+    return int(current_app.config["RENDER_CACHE_TTLS"].get(name, 0))
+
+def _count(name: str, field: str):
+    st = _stats.setdefault(name, {"hit": 0, "miss": 0})
+    st[field] += 1
+
+def _lookup(name, key):
+    now = time.monotonic()
+    with _lock:
+        item = _store.get(key)
+        if item is not None and item[0] > now:
+            _store.move_to_end(key)
+            _count(name, "hit")
+            return item[1]
+        if item is not None:
+            del _store[key]
+        _count(name, "miss")
+    return None
+
+def _remember(key, html, ttl):
+    with _lock:
+        _store[key] = (time.monotonic() + ttl, html)
+        _store.move_to_end(key)
+        while len(_store) > current_app.config["RENDER_CACHE_MAX"]:
+            _store.popitem(last=False)
+
+def fragment(name: str, parts: tuple, render) -> Markup:
+    """`render()` çıktısını (name, parts, dil) anahtarıyla önbellekler."""
+    ttl = _ttl(name)
+    if not (current_app.config["RENDER_CACHE"] and ttl > 0):
+        return Markup(render())
+    key = (name, *parts, _lang())
+    html = _lookup(name, key)
+    if html is None:
+        html = Markup(render())
+        _remember(key, html, ttl)
+    return html
+
+def cached_page(name: str, render, *parts):
+    """Anonim ve flash mesajı olmayan GET isteklerinde sayfanın tamamını önbellekler.
+
+    `parts` invalidate() ile hedeflenebilen anahtar önekidir (ör. movie_id).
+    """
+    ttl = _ttl(name)
+    cacheable = (
+        current_app.config["RENDER_CACHE"] and ttl > 0
+        and request.method == "GET"
+        and "user_id" not in session
+        and not session.get("_flashes")
+    )
+    if not cacheable:
+        return render()
+
+    key = (name, *parts, request.path, tuple(sorted(request.args.items(multi=True))), _lang())
+    html = _lookup(name, key)
+    if html is None:
+        html = render()
+        _remember(key, html, ttl)
+    return html
+
+def invalidate(name: str, *parts):
+    """Anahtarı (name, *parts) ile başlayan tüm girdileri siler."""
+    prefix = (name, *parts)
+    with _lock:
+        for key in [k for k in _store if k[:len(prefix)] == prefix]:
+            del _store[key]
+
+def render_cache_metrics():
+    with _lock:
+        out = {name: dict(st) for name, st in _stats.items()}
+        entries = len(_store)
+    for st in out.values():
+        total = st["hit"] + st["miss"]
+        st["hit_ratio"] = round(st["hit"] / total, 4) if total else None
+    return {"entries": entries, "by_name": out}
@@ -0,0 +1,61 @@
+# app/services/timing.py
+"""İstek kapsamlı süre/sayı ölçümü: db, db_connect, tmdb, model, sentiment.
+
+span("tmdb") gibi bloklar süreyi ve çağrı sayısını o anki isteğin `g`
+nesnesine ekler; süre her durumda (arka plan thread'leri dahil) /metrics
+histogramına da düşer. Özet Server-Timing başlığı olarak döner,
+user_events.payload'a yazılır ve SLOW_REQUEST_MS'i aşan istekler
+örneklenerek loglanır.
+"""
+import time
+import random
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from .metrics import observe
+
+@contextmanager
+def span(category: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        observe("span_duration_seconds", dt, (("category", category),))
+        if has_request_context() and "_timing" in g:
+            st = g._timing.setdefault(category, [0, 0.0])
+            st[0] += 1
+            st[1] += dt
+
+def summary() -> dict:
+    """{kategori: {"n": sayı, "ms": süre}} + toplam "ms"; istek dışında boş."""
+    if not has_request_context() or "_timing" not in g:
+        return {}
+    out = {k: {"n": n, "ms": round(sec * 1000, 1)} for k, (n, sec) in g._timing.items()}
+    out["ms"] = round((time.perf_counter() - g._timing_t0) * 1000, 1)
+    return out
+
+def server_timing(s: dict) -> str:
+    parts = [f'{k};dur={v["ms"]};desc="{v["n"]}x"' for k, v in s.items() if k != "ms"]
+    parts.append(f'app;dur={s["ms"]}')
+    return ", ".join(parts)
+
+def _breakdown(s: dict) -> str:
+    return " ".join(f'{k}={v["n"]}x{v["ms"]:.0f}ms' for k, v in s.items() if k != "ms")
+
+def register_request_timing(app):
+    @app.before_request
+    def _timing_start():
+        g._timing = {}
+        g._timing_t0 = time.perf_counter()
+
+    @app.after_request
+    def _timing_finish(resp):
+        if request.path.startswith("/static") or "_timing" not in g:
+            return resp
+        s = summary()
+        if app.config["SERVER_TIMING"]:
+            resp.headers["Server-Timing"] = server_timing(s)
+        if s["ms"] >= app.config["SLOW_REQUEST_MS"] and random.random() < app.config["SLOW_REQUEST_SAMPLE"]:
+            print(f"[slow] {request.method} {request.full_path.rstrip('?')} {resp.status_code} "
+                  f"{s['ms']:.0f}ms {_breakdown(s)}")
+        return resp
@@ -1,16 +1,331 @@
 # app/services/tmdb.py
-import requests
+import re
+import time
+import asyncio
+import random
+import threading
+import email.utils
+from collections import OrderedDict, deque
 from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
 from flask import current_app
+from . import tmdb_replay
+from .timing import span
+
+class TMDBUnavailable(requests.RequestException):
+    """Devre kesici açıkken veya hız limiti beklemesi aşıldığında fırlatılır."""
+
+class TokenBucket:
+    """Thread'ler arası paylaşılan token bucket; Retry-After ile tüm çağrıları durdurabilir."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take(self) -> float:
+        """Token alınabildiyse 0, aksi halde beklenmesi gereken süre."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.blocked_until and self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return max(self.blocked_until - now, (1.0 - self.tokens) / self.rate)
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self._take()
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, 0.25))
+
+    async def acquire_async(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self._take()
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(min(wait, 0.25))
+
+    def budget(self, seconds: float) -> float:
+        """Önümüzdeki `seconds` içinde alınabilecek token sayısı (Retry-After beklemesinde 0)."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return 0.0
+            return self.tokens + self.rate * seconds
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+class CircuitBreaker:
+    """Son `window` çağrının hata oranı eşiği aşınca `cooldown` saniye boyunca açılır."""
+
+    def __init__(self, window: int, threshold: float, min_calls: int, cooldown: float):
+        self.results = deque(maxlen=window)
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            st = self.state
+            if st == "closed":
+                return True
+            if st == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record(self, ok: bool):
+        with self.lock:
+            if self.opened_at is not None:
+                self.probing = False
+                if ok:
+                    self.opened_at = None
+                    self.results.clear()
+                else:
+                    self.opened_at = time.monotonic()
+                return
+            self.results.append(ok)
+            fails = self.results.count(False)
+            if len(self.results) >= self.min_calls and fails / len(self.results) >= self.threshold:
+                self.opened_at = time.monotonic()
+                print(f"[tmdb] devre kesici açıldı ({fails}/{len(self.results)} hata)")
+
+_state_lock = threading.Lock()
+_session = None
+_limiter = None
+_breaker = None
+_stale = OrderedDict()
+_stats = {
+    "calls": 0, "ok": 0, "errors": 0, "retries": 0, "throttled": 0,
+    "short_circuited": 0, "stale_served": 0, "not_modified": 0, "memo_hits": 0,
+}
+_memo = OrderedDict()
+_MOVIE_PATH = re.compile(r"^/movie/(\d+)$")
+
+def _bump(key, n=1):
+    with _state_lock:
+        _stats[key] += n
+
+def _init(cfg):
+    global _session, _limiter, _breaker
+    with _state_lock:
+        if _session is None:
+            s = requests.Session()
+            s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=cfg["TMDB_POOL_SIZE"]))
+            tmdb_replay.mount(s, cfg)
+            _limiter = TokenBucket(cfg["TMDB_RPS"], cfg["TMDB_BURST"])
+            _breaker = CircuitBreaker(
+                window=cfg["TMDB_BREAKER_WINDOW"],
+                threshold=cfg["TMDB_BREAKER_THRESHOLD"],
+                min_calls=cfg["TMDB_BREAKER_MIN_CALLS"],
+                cooldown=cfg["TMDB_BREAKER_COOLDOWN"],
+            )
+            _session = s
+
+def _stale_get(key):
+    with _state_lock:
+        return _stale.get(key)
+
+def _stale_put(key, data, limit):
+    with _state_lock:
+        _stale[key] = data
+        _stale.move_to_end(key)
+        while len(_stale) > limit:
+            _stale.popitem(last=False)
+
+def _retry_after(resp) -> float:
+    raw = resp.headers.get("Retry-After")
+    if not raw:
+        return 1.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        try:
+            dt = email.utils.parsedate_to_datetime(raw)
+            return max(0.0, dt.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 1.0
+
+def _fallback(key, err):
+    stale = _stale_get(key)
+    if stale is not None:
+        _bump("stale_served")
+        return stale
+    raise err
+
+# ---- tmdb_fetch ve AsyncTMDB.get'in ortak retry / devre kesici kararları ----
+
+def _prepare(path, params, cfg):
+    """(gönderilecek parametreler, stale önbellek anahtarı); çağrı sayacını artırır."""
+    params = dict(params or {})
+    params.setdefault("language", "tr-TR")
+    key = (path, tuple(sorted((k, str(v)) for k, v in params.items())))
+    params["api_key"] = cfg["TMDB_API_KEY"]
+    _bump("calls")
+    return params, key
+
+def _short_circuit(path):
+    """Devre açıksa fallback'e verilecek hata, aksi halde None."""
+    if _breaker.allow():
+        return None
+    _bump("short_circuited")
+    return TMDBUnavailable(f"TMDB devre kesici açık: {path}")
+
+def _limit_exceeded(path):
+    return TMDBUnavailable(f"TMDB hız limiti beklemesi aşıldı: {path}")
+
+def _retry_reason(resp, path):
+    """429/5xx ise yeniden denenecek hatanın mesajı; değilse devreye başarı yazılır ve None.
+
+    4xx (404 vb.) upstream sağlığıyla ilgili değil; devreyi etkilemez.
+    """
+    if resp.status_code == 429:
+        _bump("throttled")
+        _limiter.pause(_retry_after(resp))
+        return f"429 Too Many Requests: {path}"
+    if resp.status_code >= 500:
+        return f"{resp.status_code} Server Error: {path}"
+    _breaker.record(True)
+    return None
+
+def _backoff(attempt, cfg) -> float:
+    """Full jitter; 429'da Retry-After beklemesini limiter.acquire üstlenir."""
+    return random.uniform(0, cfg["TMDB_BACKOFF_BASE"] * (2 ** attempt))
+
+def _succeeded(key, data, cfg):
+    _bump("ok")
+    _stale_put(key, data, cfg["TMDB_STALE_MAX"])
+    return data
+
+def _failed(key, err, fallback=True):
+    """Tüm denemeler bitti: devreye hata yazılır, stale kopya ya da err."""
+    _bump("errors")
+    _breaker.record(False)
+    if not fallback:
+        raise err
+    return _fallback(key, err)
+
+def tmdb_fetch(path, params=None, etag=None, fallback=True):
+    """(data, etag) döndürür; `etag` upstream'de hâlâ geçerliyse (304) data None olur.
+
+    fallback=False ise hata halinde bellekteki stale kopya yerine hata fırlatılır
+    (yanıtı kalıcı olarak saklayan çağıranlar için).
+    """
+    cfg = current_app.config
+    _init(cfg)
+    params, key = _prepare(path, params, cfg)
+
+    err = _short_circuit(path)
+    if err is not None:
+        if not fallback:
+            raise err
+        return _fallback(key, err), None
+
+    url = f"{cfg['TMDB_BASE']}{path}"
+    headers = {"If-None-Match": etag} if etag else None
+    timeout = (cfg["TMDB_CONNECT_TIMEOUT"], cfg["TMDB_READ_TIMEOUT"])
+    retries = cfg["TMDB_RETRIES"]
+    for attempt in range(retries + 1):
+        if attempt:
+            _bump("retries")
+        if not _limiter.acquire(cfg["TMDB_ACQUIRE_TIMEOUT"]):
+            err = _limit_exceeded(path)
+            break
+
+        try:
+            with span("tmdb"):
+                r = _session.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            err = e
+        else:
+            reason = _retry_reason(r, path)
+            if reason:
+                err = requests.HTTPError(reason, response=r)
+            elif r.status_code == 304:
+                _bump("not_modified")
+                return None, etag
+            else:
+                r.raise_for_status()
+                return _succeeded(key, r.json(), cfg), r.headers.get("ETag")
+
+        if attempt < retries:
+            time.sleep(_backoff(attempt, cfg))
+
+    return _failed(key, err, fallback), None
+
+def limiter_budget(seconds: float) -> float:
+    """Toplu işler için: `seconds` içinde limiter'ın verebileceği istek sayısı; devre açıksa 0."""
+    _init(current_app.config)
+    if _breaker.state == "open":
+        return 0.0
+    return _limiter.budget(seconds)
 
 def tmdb_get(path, params=None):
-    params = params or {}
-    params["api_key"] = current_app.config["TMDB_API_KEY"]
+    m = _MOVIE_PATH.match(path)
+    if m and current_app.config["MOVIE_STORE"]:
+        from .movies import get_movie
+        return get_movie(int(m.group(1)), params)
+    return tmdb_fetch(path, params)[0]
+
+def tmdb_get_cached(path, params=None, ttl=None):
+    """Kısa ömürlü paylaşılan önbellek: liste uçları (now_playing, popular, trending ...)
+    aynı dakikalar içinde ana sayfa, /api/featured ve /api/home arasında tekrar çekilmez."""
+    cfg = current_app.config
+    params = dict(params or {})
     params.setdefault("language", "tr-TR")
-    base = current_app.config["TMDB_BASE"]
-    r = requests.get(f"{base}{path}", params=params, timeout=15)
-    r.raise_for_status()
-    return r.json()
+    key = (path, tuple(sorted((k, str(v)) for k, v in params.items())))
+    now = time.monotonic()
+    with _state_lock:
+        item = _memo.get(key)
+        if item is not None and item[0] > now:
+            _stats["memo_hits"] += 1
+            return item[1]
+
+    data = tmdb_get(path, params)
+    with _state_lock:
+        _memo[key] = (now + (ttl or cfg["TMDB_LIST_TTL"]), data)
+        _memo.move_to_end(key)
+        while len(_memo) > cfg["TMDB_STALE_MAX"]:
+            _memo.popitem(last=False)
+    return data
+
+def tmdb_metrics():
+    with _state_lock:
+        out = dict(_stats)
+        out["stale_entries"] = len(_stale)
+    out["breaker"] = _breaker.state if _breaker is not None else "closed"
+    return out
 
 @lru_cache(maxsize=512)
 def get_genres():
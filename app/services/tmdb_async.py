@@ -0,0 +1,59 @@
+# app/services/tmdb_async.py
+import asyncio
+import httpx
+from . import tmdb as _t
+from .tmdb_replay import async_transport
+
+class AsyncTMDB:
+    """ASGI modu için httpx tabanlı TMDB istemcisi.
+
+    Limiter, devre kesici, stale önbellek ve sayaçlar senkron `tmdb_get` ile
+    ortaktır; iki mod aynı süreçte çalışsa da TMDB bütçesi tek kalır.
+    """
+
+    def __init__(self, cfg, transport=None):
+        self.cfg = cfg
+        _t._init(cfg)
+        size = cfg["TMDB_POOL_SIZE"]
+        self.client = httpx.AsyncClient(
+            base_url=cfg["TMDB_BASE"],
+            timeout=httpx.Timeout(cfg["TMDB_READ_TIMEOUT"], connect=cfg["TMDB_CONNECT_TIMEOUT"]),
+            limits=httpx.Limits(max_connections=size * 4, max_keepalive_connections=size),
+            transport=transport or async_transport(cfg),
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def get(self, path, params=None):
+        cfg = self.cfg
+        params, key = _t._prepare(path, params, cfg)
+
+        err = _t._short_circuit(path)
+        if err is not None:
+            return _t._fallback(key, err)
+
+        retries = cfg["TMDB_RETRIES"]
+        for attempt in range(retries + 1):
+            if attempt:
+                _t._bump("retries")
+            if not await _t._limiter.acquire_async(cfg["TMDB_ACQUIRE_TIMEOUT"]):
+                err = _t._limit_exceeded(path)
+                break
+
+            try:
+                r = await self.client.get(path, params=params)
+            except httpx.HTTPError as e:
+                err = e
+            else:
+                reason = _t._retry_reason(r, path)
+                if reason:
+                    err = httpx.HTTPStatusError(reason, request=r.request, response=r)
+                else:
+                    r.raise_for_status()
+                    return _t._succeeded(key, r.json(), cfg)
+
+            if attempt < retries:
+                await asyncio.sleep(_t._backoff(attempt, cfg))
+
+        return _t._failed(key, err)
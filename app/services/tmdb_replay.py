@@ -0,0 +1,314 @@
+# app/services/tmdb_replay.py
+"""TMDB kayıt/tekrar oynatma katmanı (yük testleri için çevrimdışı TMDB).
+
+TMDB_MODE:
+  live   -> gerçek TMDB (varsayılan)
+  record -> gerçek TMDB; her yanıt TMDB_FIXTURES altına gzip'li JSON olarak yazılır
+  replay -> ağa hiç çıkılmaz; yanıtlar fixture'lardan, ayarlanabilir gecikme ve
+            hata enjeksiyonu ile (TMDB_REPLAY_*) döndürülür
+
+Katman requests transport adapter'ı (senkron) ve httpx transport'u (ASGI modu)
+olarak takılır; limiter, devre kesici, retry ve ETag yolları gerçek TMDB'deki
+gibi çalışır. Kayıtlı olmayan /movie/123 gibi yollar, TMDB_REPLAY_MISS=route
+ise aynı rota şablonundaki (/movie/{id}) bir fixture'dan id'si değiştirilerek
+deterministik olarak üretilir; aksi halde 404 döner.
+
+Fixture seti toplamak için:  TMDB_MODE=record flask tmdb-record
+"""
+import os
+import re
+import sys
+import gzip
+import asyncio
+import json
+import time
+import random
+import hashlib
+import threading
+from urllib.parse import urlsplit, parse_qsl
+import click
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from flask import current_app
+from flask.cli import with_appcontext
+
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+_SKIP_PARAMS = {"api_key"}
+
+def _route(path: str) -> str:
+    return _ID_RE.sub("/{id}", path)
+
+def _norm_params(query) -> tuple:
+    return tuple(sorted((k, v) for k, v in query if k not in _SKIP_PARAMS))
+
+class FixtureStore:
+    """root/<rota>/<sha1>.json.gz; her dosya tek bir (yol, parametre) yanıtı."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._by_route = None
+
+    def _file(self, path: str, params: tuple) -> str:
+        h = hashlib.sha1(json.dumps([path, params]).encode("utf-8")).hexdigest()[:20]
+        slug = _route(path).strip("/").replace("/", "_").replace("{id}", "id") or "root"
+        return os.path.join(self.root, slug, f"{h}.json.gz")
+
+    def get(self, path: str, params: tuple):
+        try:
+            with gzip.open(self._file(path, params), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, path: str, params: tuple, status: int, headers: dict, body: str):
+        fn = self._file(path, params)
+        os.makedirs(os.path.dirname(fn), exist_ok=True)
+        rec = {"path": path, "params": params, "status": status, "headers": headers, "body": body}
+        tmp = f"{fn}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(rec, f, ensure_ascii=False)
+        os.replace(tmp, fn)
+        with self._lock:
+            self._by_route = None
+
+    def _route_index(self):
+        with self._lock:
+            if self._by_route is None:
+                idx = {}
+                for dirpath, _dirs, names in os.walk(self.root):
+                    for n in sorted(names):
+                        if not n.endswith(".json.gz"):
+                            continue
+                        with gzip.open(os.path.join(dirpath, n), "rt", encoding="utf-8") as f:
+                            rec = json.load(f)
+                        idx.setdefault(_route(rec["path"]), []).append(rec)
+                self._by_route = idx
+            return self._by_route
+
+    def similar(self, path: str):
+        """Aynı rota şablonundan deterministik bir kayıt; id'ler istenen yola uyarlanır."""
+        recs = self._route_index().get(_route(path))
+        if not recs:
+            return None
+        pick = int(hashlib.sha1(path.encode()).hexdigest(), 16) % len(recs)
+        rec = dict(recs[pick])
+        ids = re.findall(r"/(\d+)", path)
+        if ids and rec["status"] == 200:
+            body = json.loads(rec["body"])
+            if isinstance(body, dict) and "id" in body:
+                body["id"] = int(ids[-1])
+                rec["body"] = json.dumps(body, ensure_ascii=False)
+        return rec
+
+    def count(self) -> int:
+        return sum(len(v) for v in self._route_index().values())
+
+class Faults:
+    """Gecikme + hata enjeksiyonu; TMDB_REPLAY_SEED ile tekrarlanabilir."""
+
+    def __init__(self, cfg):
+        self.latency = cfg["TMDB_REPLAY_LATENCY_MS"] / 1000.0
+        self.jitter = cfg["TMDB_REPLAY_JITTER_MS"] / 1000.0
+        self.error_rate = cfg["TMDB_REPLAY_ERROR_RATE"]
+        self.throttle_rate = cfg["TMDB_REPLAY_THROTTLE_RATE"]
+        self.rng = random.Random(cfg["TMDB_REPLAY_SEED"])
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """(gecikme sn, zorlanmış durum kodu ya da None)"""
+        with self.lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            x = self.rng.random()
+        if x < self.throttle_rate:
+            return delay, 429
+        if x < self.throttle_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+class Player:
+    """İstek (yol, sorgu) -> (durum, başlıklar, gövde); sync ve async transport ortak kullanır."""
+
+    def __init__(self, cfg):
+        self.store = FixtureStore(cfg["TMDB_FIXTURES"])
+        self.base_path = urlsplit(cfg["TMDB_BASE"]).path.rstrip("/")
+        self.miss = cfg["TMDB_REPLAY_MISS"]
+        self.faults = Faults(cfg)
+        self.stats = {"hit": 0, "similar": 0, "miss": 0, "injected": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, field):
+        with self._lock:
+            self.stats[field] += 1
+
+    def play(self, url: str, if_none_match=None):
+        parts = urlsplit(url)
+        path = parts.path[len(self.base_path):] if parts.path.startswith(self.base_path) else parts.path
+        params = _norm_params(parse_qsl(parts.query, keep_blank_values=True))
+        delay, forced = self.faults.draw()
+
+        if forced is not None:
+            self._count("injected")
+            headers = {"Retry-After": "1"} if forced == 429 else {}
+            return delay, forced, headers, '{"status_message": "injected"}'
+
+        rec = self.store.get(path, params)
+        if rec is not None:
+            self._count("hit")
+        elif self.miss == "route":
+            rec = self.store.similar(path)
+            if rec is not None:
+                self._count("similar")
+        if rec is None:
+            self._count("miss")
+            return delay, 404, {}, '{"status_message": "fixture yok"}'
+
+        headers = dict(rec.get("headers") or {})
+        if if_none_match and headers.get("ETag") == if_none_match:
+            return delay, 304, headers, ""
+        return delay, rec["status"], headers, rec["body"]
+
+class ReplayAdapter(BaseAdapter):
+    """requests için ağsız transport."""
+
+    def __init__(self, player: Player):
+        super().__init__()
+        self.player = player
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay, status, headers, body = self.player.play(request.url, request.headers.get("If-None-Match"))
+        if delay:
+            time.sleep(delay)
+        r = requests.Response()
+        r.status_code = status
+        r.headers.update({"Content-Type": "application/json;charset=utf-8", **headers})
+        r._content = body.encode("utf-8")
+        r.encoding = "utf-8"
+        r.url = request.url
+        r.request = request
+        return r
+
+    def close(self):
+        pass
+
+class RecordingAdapter(HTTPAdapter):
+    """Gerçek TMDB'ye gider; başarılı (2xx/404) yanıtları fixture olarak yazar."""
+
+    def __init__(self, store: FixtureStore, base_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.base_path = base_path
+
+    def send(self, request, **kwargs):
+        r = super().send(request, **kwargs)
+        if r.status_code < 300 or r.status_code == 404:
+            parts = urlsplit(request.url)
+            path = parts.path[len(self.base_path):]
+            params = _norm_params(parse_qsl(parts.query, keep_blank_values=True))
+            headers = {k: r.headers[k] for k in ("ETag",) if k in r.headers}
+            try:
+                self.store.put(path, params, r.status_code, headers, r.text)
+            except OSError as e:
+                print("[tmdb-replay] kayıt yazılamadı:", e)
+        return r
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """ASGI modundaki AsyncTMDB için ağsız transport."""
+
+    def __init__(self, player: Player):
+        self.player = player
+
+    async def handle_async_request(self, request):
+        delay, status, headers, body = self.player.play(str(request.url), request.headers.get("If-None-Match"))
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(status, headers={"Content-Type": "application/json", **headers},
+                              content=body.encode("utf-8"), request=request)
+
+_player = None
+
+def _get_player(cfg) -> Player:
+    global _player
+    if _player is None:
+        _player = Player(cfg)
+    return _player
+
+def mount(session, cfg):
+    """tmdb._init içinden: TMDB_MODE'a göre session'a adapter takar."""
+    mode = cfg["TMDB_MODE"]
+    base = cfg["TMDB_BASE"]
+    if mode == "replay":
+        session.mount(base, ReplayAdapter(_get_player(cfg)))
+    elif mode == "record":
+        store = FixtureStore(cfg["TMDB_FIXTURES"])
+        session.mount(base, RecordingAdapter(store, urlsplit(base).path.rstrip("/"),
+                                             pool_connections=4, pool_maxsize=cfg["TMDB_POOL_SIZE"]))
+    elif mode != "live":
+        raise ValueError(f"Geçersiz TMDB_MODE: {mode}")
+    if mode != "live":
+        print(f"[tmdb-replay] mod={mode} fixtures={cfg['TMDB_FIXTURES']}")
+
+def async_transport(cfg):
+    """AsyncTMDB için: replay modunda ağsız transport, diğer modlarda None."""
+    if cfg["TMDB_MODE"] == "replay":
+        return AsyncReplayTransport(_get_player(cfg))
+    return None
+
+def replay_metrics():
+    if _player is None:
+        return {}
+    with _player._lock:
+        return dict(_player.stats)
+
+# ---------------- Kayıt komutu ----------------
+
+RECORD_URLS = [
+    "/", "/?page=2",
+    "/api/featured", "/api/discover", "/api/discover?page=2",
+    "/api/discover?sort_by=vote_average.desc", "/api/discover?sort_by=primary_release_date.desc",
+    "/search?q=star", "/search?q=yüzüklerin",
+    "/api/search_suggest?q=ba", "/api/search_suggest?q=inter", "/api/search_suggest?q=matr",
+]
+
+# Kayıt sırasında TMDB'ye gitmeden yanıt veren tüm yerel kısayollar kapatılır;
+# aksi halde replay'de bu kısayollar ıskalayınca gereken fixture'lar hiç yazılmaz.
+RECORD_OVERRIDES = {
+    "RENDER_CACHE": False,                    # HTML parça önbelleği
+    "MOVIE_STORE": False,                     # /movie/{id} -> movies tablosu
+    "DISCOVER_LOCAL_MIN_RESULTS": sys.maxsize,  # yerel katalogdan /api/discover
+    "TYPEAHEAD_MIN_HITS": sys.maxsize,        # yerel öneri dizini
+    "QUERY_CACHE_TTL": 0,                     # arama sonucu önbelleği
+    "TMDB_LIST_TTL": 0,                       # tmdb_get_cached bellek önbelleği
+}
+
+@click.command("tmdb-record")
+@click.option("--movies", type=int, default=40, help="Detay sayfası kaydedilecek film sayısı.")
+@click.option("--genres/--no-genres", default=True, help="Tür bazlı /api/discover isteklerini de kaydet.")
+@with_appcontext
+def record_command(movies, genres):
+    """Uygulamanın kendi uçlarını gezerek TMDB fixture seti kaydeder (TMDB_MODE=record)."""
+    app = current_app._get_current_object()
+    if app.config["TMDB_MODE"] != "record":
+        raise click.UsageError("Önce TMDB_MODE=record ayarlayın.")
+    app.config.update(RECORD_OVERRIDES)
+
+    from .tmdb import tmdb_get, get_genres
+    urls = list(RECORD_URLS)
+    with app.app_context():
+        if genres:
+            urls += [f"/api/discover?genre_id={g['id']}" for g in get_genres()]
+        ids = []
+        for path in ("/movie/popular", "/movie/now_playing", "/trending/movie/week"):
+            ids += [m["id"] for m in tmdb_get(path, {"page": 1}).get("results") or []]
+        urls += [f"/movie/{mid}" for mid in list(dict.fromkeys(ids))[:movies]]
+
+    client = app.test_client()
+    failed = 0
+    for url in urls:
+        status = client.get(url).status_code
+        if status >= 500:
+            failed += 1
+            print(f"[tmdb-record] {url} -> {status}")
+    n = FixtureStore(app.config["TMDB_FIXTURES"]).count()
+    print(f"[tmdb-record] {len(urls)} URL gezildi ({failed} hata); toplam {n} fixture.")
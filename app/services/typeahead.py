@@ -0,0 +1,150 @@
+# app/services/typeahead.py
+"""/api/search_suggest için süreç içi başlık indeksi.
+
+Sıralı (anahtar, movie_id) dizisi + bisect ile önek araması yapılır. Her
+başlık, her kelime başlangıcından itibaren ayrı bir anahtar olarak eklenir
+("kara şövalye" -> "kara sovalye", "sovalye"); böylece kelime ortası
+önekleri de eşleşir. Anahtarlar Türkçe duyarlı katlanır (I/İ/ı -> i,
+aksanlar atılır). Kaynak: movies tablosunun tr-TR kayıtları (en-US çekilen
+aday havuzu kullanılmaz; öneriler TMDB yedeğiyle aynı dilde kalır). TMDB'den
+görülen yeni tr-TR başlıklar add_items() ile artımlı eklenir.
+
+İndeks istek yolunda kurulmaz: ensure_built() arka planda bir kuruluş başlatıp
+hemen döner (ya da ısınmada `typeahead` görevi kurar); kurulana kadar öneriler
+TMDB'den gelir. Başarısız kuruluş retry_sec geçmeden yeniden denenmez.
+"""
+import time
+import bisect
+import threading
+import unicodedata
+from ..db import db
+
+_CARD_FIELDS = ("id", "title", "poster_path", "vote_average", "release_date")
+_TR_MAP = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+_lock = threading.Lock()
+_keys = []      # sıralı (key, movie_id)
+_items = {}     # movie_id -> kart + popularity
+_seen = set()   # (movie_id, key) tekrar eklemeyi önler
+_built = False
+_building = False
+_failed_at = None  # son başarısız kuruluşun zamanı (monotonic)
+
+def fold(s: str) -> str:
+    s = (s or "").translate(_TR_MAP).casefold()
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.split())
+
+def _title_keys(title: str):
+    t = fold(title)
+    if not t:
+        return []
+    keys = [t]
+    for i, ch in enumerate(t):
+        if ch == " " and i + 1 < len(t):
+            keys.append(t[i + 1:])
+    return keys
+
+def _add_locked(m, batch):
+    mid = m.get("id")
+    if not mid:
+        return
+    old = _items.get(mid)
+    if old is None or (not old.get("poster_path") and m.get("poster_path")):
+        card = {k: m.get(k) for k in _CARD_FIELDS}
+        card["popularity"] = m.get("popularity") or (old or {}).get("popularity") or 0.0
+        card["_key"] = fold(card["title"])
+        _items[mid] = card
+    for title in {m.get("title"), m.get("original_title")}:
+        for key in _title_keys(title):
+            if (mid, key) in _seen:
+                continue
+            _seen.add((mid, key))
+            batch.append((key, mid))
+
+def add_items(movies):
+    """TMDB sonuçlarını / detay payload'larını indekse ekler (indeks kurulduysa)."""
+    if not _built:
+        return
+    with _lock:
+        batch = []
+        for m in movies or []:
+            _add_locked(m, batch)
+        if len(batch) > 64:
+            _keys.extend(batch)
+            _keys.sort()
+        else:
+            for entry in batch:
+                bisect.insort(_keys, entry)
+
+def build():
+    global _built
+    # yalnız tr-TR kayıtlar: aday havuzu en-US çekilir, TMDB yedeği ise tr-TR döner
+    with db() as con, con.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT ON (movie_id)
+                   movie_id AS id,
+                   data->>'title'          AS title,
+                   data->>'original_title' AS original_title,
+                   data->>'poster_path'    AS poster_path,
+                   (data->>'vote_average')::float AS vote_average,
+                   data->>'release_date'   AS release_date,
+                   (data->>'popularity')::float   AS popularity
+            FROM movies
+            WHERE variant LIKE %s
+            ORDER BY movie_id, fetched_at DESC
+        """, ("%language=tr-TR",))
+        rows = cur.fetchall()
+
+    with _lock:
+        batch = []
+        for m in rows:
+            _add_locked(m, batch)
+        _keys.extend(batch)
+        _keys.sort()
+        _built = True
+    print(f"[typeahead] {len(_items)} film, {len(_keys)} anahtar indekslendi.")
+
+def _build_bg():
+    global _building, _failed_at
+    try:
+        build()
+    except Exception as e:
+        _failed_at = time.monotonic()
+        print("[typeahead] indeks kurulamadı:", e)
+    finally:
+        _building = False
+
+def ensure_built(retry_sec: float = 60.0):
+    """Kurulu değilse arka planda kurar; beklemez. Hata sonrası retry_sec bekler."""
+    global _building
+    if _built or _building:
+        return
+    with _lock:
+        if _built or _building:
+            return
+        if _failed_at is not None and time.monotonic() - _failed_at < retry_sec:
+            return
+        _building = True
+    threading.Thread(target=_build_bg, name="typeahead-build", daemon=True).start()
+
+def is_built() -> bool:
+    return _built
+
+def suggest(q: str, limit: int = 8, scan: int = 200):
+    """Öneki `q` olan başlıklar: tam başlık öneki önce, sonra popülerlik."""
+    p = fold(q)
+    if not p or not _built:
+        return []
+    with _lock:
+        i = bisect.bisect_left(_keys, (p,))
+        found = {}
+        while i < len(_keys) and len(found) < scan:
+            key, mid = _keys[i]
+            if not key.startswith(p):
+                break
+            found[mid] = found.get(mid, False) or _items[mid]["_key"] == key
+            i += 1
+        ranked = sorted(found.items(), key=lambda kv: (not kv[1], -(_items[kv[0]].get("popularity") or 0.0)))
+        return [{k: _items[mid].get(k) for k in _CARD_FIELDS} for mid, _ in ranked[:limit]]
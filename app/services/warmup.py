@@ -0,0 +1,219 @@
+# app/services/warmup.py
+"""Ağır modellerin ve aday havuzunun önceden yüklenmesi.
+
+ML kütüphaneleri ilk kullanımda import edilir; worker /login gibi sayfaları
+hemen sunar. Isınma WARMUP ile seçilir:
+  off        -> hiçbir şey (ilk istek yükler)
+  background -> arka plan thread'inde, istekler beklemeden: gunicorn'da worker
+                açılınca, diğer sunucularda ilk istekle (CLI komutları
+                ısınma tetiklemez)
+  post_fork  -> gunicorn post_worker_init'te, worker istek almadan önce
+                (gunicorn.conf.py); gunicorn dışında background gibi davranır
+WARMUP_TASKS hangi parçaların ısıtılacağını belirler (sbert, sentiment,
+tmdb, candidates, typeahead). Elle:  flask warmup [--tasks sbert,sentiment]
+
+/healthz süreç ayakta mı (liveness), /readyz bu worker ısınmayı bitirdi ve
+DB'ye ulaşıyor mu (readiness) bilgisini verir; orkestratör trafiği ancak
+/readyz 200 dönünce yönlendirir. Başarısız ısınma WARMUP_RETRY_SEC sonra
+bir sonraki istekle yeniden denenir.
+
+PRELOAD=1 (gunicorn preload_app): model ağırlıkları create_app sırasında
+master'da yüklenir ve fork ile worker'lara copy-on-write paylaşılır. Master'da
+ileri geçiş yapılmaz (OpenMP/tokenizer thread havuzları fork'a dayanıklı
+değil); ilk çıkarım her worker'da WARMUP ya da ilk istekle olur.
+"""
+import os
+import sys
+import time
+import threading
+import click
+from flask import current_app, jsonify
+from flask.cli import with_appcontext
+from ..db import db
+
+_lock = threading.Lock()
+_status = {"state": "idle", "pid": None, "tasks": {}, "error": None, "finished": None}
+
+def _sbert():
+    from .embeddings import embeddings_available, embed_texts
+    from . import inference
+    if inference.enabled():
+        # yerel fallback yok: sunucu hazır değilse görev başarısız, /readyz 503 kalır
+        inference.embed(["warmup"])
+        return "çıkarım sunucusu"
+    if not embeddings_available():
+        return "sentence-transformers yok"
+    embed_texts(["warmup"])
+
+def _sentiment():
+    from .. import sentiment
+    from . import inference
+    if inference.enabled():
+        inference.sentiment(["warmup"])
+        return "çıkarım sunucusu"
+    if sentiment._load_pipeline() is None:
+        return "model yüklenemedi"
+    sentiment.analyze("warmup")
+
+def _tmdb():
+    """Ana sayfa, trend ve tür listeleri paylaşılan TMDB önbelleğine."""
+    from .tmdb import tmdb_get_cached, get_genres
+    from .discover import local_discover
+    from ..blueprints.api import discover_params
+    for path in ("/movie/popular", "/movie/now_playing", "/trending/movie/week"):
+        tmdb_get_cached(path, {"page": 1})
+    if local_discover({}) is None:
+        tmdb_get_cached("/discover/movie", discover_params({}))
+    return f"{len(get_genres())} tür"
+
+def _candidates():
+    from .recommender import get_candidate_cache
+    from . import inference
+    if inference.enabled():
+        inference.ping()  # eksik gömmeler sunucu yokken yerelde hesaplanmasın
+    cand = get_candidate_cache(force=False)
+    return f"{len(cand['ids'])} aday"
+
+def _typeahead():
+    from . import typeahead
+    if not typeahead.is_built():
+        typeahead.build()
+    return "hazır"
+
+TASKS = {"sbert": _sbert, "sentiment": _sentiment, "tmdb": _tmdb, "candidates": _candidates,
+         "typeahead": _typeahead}
+
+def preload(app):
+    """Yalnız ağırlıklar; DB/TMDB bağlantısı ve thread açmaz (fork'a güvenli)."""
+    if app.config["INFERENCE_URL"]:
+        print("[preload] INFERENCE_URL ayarlı; modeller çıkarım sunucusunda, yükleme atlandı")
+        return
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    # CUDA bağlamı fork sonrası kullanılamaz; master'da yüklenen model CPU'da kalır
+    os.environ.setdefault("HF_USE_CPU", "1")
+    t0 = time.perf_counter()
+    from .embeddings import SBERT_AVAILABLE, sbert
+    if SBERT_AVAILABLE:
+        try:
+            sbert()
+        except Exception as e:
+            print("[preload] SBERT yüklenemedi:", e)
+    from .. import sentiment
+    sentiment._load_pipeline()
+    print(f"[preload] modeller master'da yüklendi: {time.perf_counter() - t0:.1f} sn (pid {os.getpid()})")
+
+def after_fork(workers: int, threads: int = 0):
+    """gunicorn post_fork: worker başına torch thread'i (çekirdekler worker'lara bölünür)."""
+    n = threads or max(1, (os.cpu_count() or 1) // max(1, workers))
+    os.environ["OMP_NUM_THREADS"] = str(n)  # torch henüz import edilmediyse
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(n)
+
+def run(app, tasks=None):
+    """Görevleri sırayla çalıştırır; bir görevin hatası diğerlerini durdurmaz."""
+    tasks = tasks or app.config["WARMUP_TASKS"]
+    with _lock:
+        _status.update(state="running", pid=os.getpid(), tasks={}, error=None, finished=None)
+    t_all = time.perf_counter()
+    with app.app_context():
+        for name in tasks:
+            fn = TASKS.get(name)
+            if fn is None:
+                print(f"[warmup] bilinmeyen görev: {name}")
+                continue
+            t0 = time.perf_counter()
+            try:
+                note = fn()
+                ok = True
+            except Exception as e:
+                note, ok = str(e), False
+                with _lock:
+                    _status["error"] = f"{name}: {e}"
+            sec = round(time.perf_counter() - t0, 2)
+            with _lock:
+                _status["tasks"][name] = {"sec": sec, "ok": ok, "note": note}
+            print(f"[warmup] {name}: {sec} sn{' (' + note + ')' if note else ''}{'' if ok else ' HATA'}")
+    with _lock:
+        _status["state"] = "done" if _status["error"] is None else "failed"
+        _status["finished"] = time.monotonic()
+    print(f"[warmup] bitti: {time.perf_counter() - t_all:.1f} sn (pid {os.getpid()})")
+
+def start_background(app, retry_sec: float | None = None):
+    """Süreç başına bir kez; fork sonrası çocukta, başarısızsa retry_sec sonra yeniden."""
+    with _lock:
+        if _status["pid"] == os.getpid():
+            if (retry_sec is None or _status["state"] != "failed"
+                    or time.monotonic() - _status["finished"] < retry_sec):
+                return
+        _status.update(state="pending", pid=os.getpid())
+    threading.Thread(target=run, args=(app,), name="warmup", daemon=True).start()
+
+def warmup_status() -> dict:
+    with _lock:
+        return {**_status, "tasks": dict(_status["tasks"])}
+
+def readiness(app) -> tuple[bool, dict]:
+    """(hazır mı, ayrıntı). WARMUP=off iken ısınma beklenmez."""
+    st = warmup_status()
+    mine = st["pid"] == os.getpid()
+    out = {"pid": os.getpid(), "warmup": st["state"] if mine else "pending",
+           "tasks": st["tasks"] if mine else {}}
+    ok = app.config["WARMUP"] == "off" or (mine and st["state"] == "done")
+    if mine and st["error"]:
+        out["error"] = st["error"]
+    try:
+        with db() as con:
+            con.execute("SELECT 1")
+        out["db"] = "ok"
+    except Exception as e:
+        out["db"] = str(e)
+        ok = False
+    return ok, out
+
+def on_worker_init(app):
+    """gunicorn post_worker_init kancası (gunicorn.conf.py)."""
+    mode = app.config["WARMUP"]
+    if mode == "post_fork":
+        with _lock:
+            _status["pid"] = os.getpid()
+        run(app)
+    elif mode == "background":
+        start_background(app)
+
+@click.command("warmup")
+@click.option("--tasks", default=None, help="Virgülle ayrılmış görevler (varsayılan: WARMUP_TASKS).")
+@with_appcontext
+def warmup_command(tasks):
+    """Modelleri ve aday havuzunu şimdi yükler."""
+    app = current_app._get_current_object()
+    run(app, [t.strip() for t in tasks.split(",") if t.strip()] if tasks else None)
+
+def register_warmup(app):
+    app.cli.add_command(warmup_command)
+    mode = app.config["WARMUP"]
+    if mode not in ("off", "background", "post_fork"):
+        raise ValueError(f"Geçersiz WARMUP: {mode}")
+    if app.config["PRELOAD"]:
+        preload(app)
+
+    @app.get("/healthz")
+    def healthz():
+        return jsonify({"ok": True, "pid": os.getpid()})
+
+    @app.get("/readyz")
+    def readyz():
+        ok, out = readiness(app)
+        resp = jsonify({"ready": ok, **out})
+        resp.status_code = 200 if ok else 503
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    if mode == "off":
+        return
+
+    @app.before_request
+    def _warmup_kick():
+        # post_fork kancası çalıştıysa pid zaten bu süreçtir; /readyz de ısınmayı tetikler
+        if _status["pid"] != os.getpid() or _status["state"] == "failed":
+            start_background(app, app.config["WARMUP_RETRY_SEC"])
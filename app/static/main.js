@@ -5,8 +5,13 @@ async function fetchJson(url) {
   return await r.json();
 }
 
+// yerel görsel proxy'si (/img/<varyant>/<dosya>): thumb | card | detail | backdrop
+function imgUrl(path, variant) {
+  return path ? `/img/${variant}${path}` : "";
+}
+
 function movieCard(m) {
-  const img = m.poster_path ? `https://image.tmdb.org/t/p/w500${m.poster_path}` : "";
+  const img = imgUrl(m.poster_path, "card");
   const year = (m.release_date || "").slice(0, 4);
   const score = (m.vote_average != null) ? `<span class="chip">${m.vote_average.toFixed(1)}</span>` : "";
   return `
@@ -28,9 +33,7 @@ function debounce(fn, ms) {
 
 // ----------------- Öne Çıkanlar (carousel) -----------------
 function featCard(m) {
-  const img = m.backdrop_path
-    ? `https://image.tmdb.org/t/p/w780${m.backdrop_path}`
-    : (m.poster_path ? `https://image.tmdb.org/t/p/w500${m.poster_path}` : "");
+  const img = m.backdrop_path ? imgUrl(m.backdrop_path, "backdrop") : imgUrl(m.poster_path, "card");
   const year = (m.release_date || "").slice(0,4);
   const score = (m.vote_average != null) ? m.vote_average.toFixed(1) : "";
   return `
@@ -47,16 +50,10 @@ function featCard(m) {
   `;
 }
 
-async function loadFeatured() {
+function renderFeatured(results) {
   const row = document.getElementById("featuredRow");
   if (!row) return;
-  try {
-    const data = await fetchJson("/api/featured");
-    const items = (data.results || []).slice(0, 12);
-    row.innerHTML = items.map(featCard).join("");
-  } catch (e) {
-    // sessiz geç
-  }
+  row.innerHTML = (results || []).slice(0, 12).map(featCard).join("");
 }
 
 function bindFeaturedArrows() {
@@ -79,36 +76,44 @@ function bindFeaturedArrows() {
 }
 
 // ----------------- Size Özel Öneriler -----------------
-async function loadPersonalized() {
+function renderPersonalized(data) {
   const grid = document.getElementById("personalizedGrid");
   const info = document.getElementById("personalizedInfo");
-  if (!grid) return;
+  if (!grid || !data) return;
 
-  try {
-    const data = await fetchJson("/api/personalized");
-    const items = (data.results || []).slice(0, 9);
+  const items = (data.results || []).slice(0, 9);
+  if (!items.length) {
+    grid.innerHTML = `<div class="text-slate-400">Henüz yeterli sinyal yok. Birkaç film beğen / favorile / fragman izle 😊</div>`;
+    return;
+  }
 
-    if (!items.length) {
-      grid.innerHTML = `<div class="text-slate-400">Henüz yeterli sinyal yok. Birkaç film beğen / favorile / fragman izle 😊</div>`;
-      return;
-    }
+  grid.innerHTML = items.map(movieCard).join("");
+  if (info) info.textContent = "Beğenilerinize göre";
+}
+
+// ----------------- Ana sayfa açılışı (tek istek) -----------------
+// /api/home: öne çıkanlar + kişisel öneriler + varsayılan keşif sonuçları
+let homeDiscover = null;
 
-    grid.innerHTML = items.map(movieCard).join("");
-    if (info) info.textContent = "Beğenilerinize göre";
+async function loadHome() {
+  if (!document.getElementById("featuredRow") && !document.getElementById("personalizedGrid")) return;
+  try {
+    const data = await fetchJson("/api/home");
+    renderFeatured(data.featured);
+    renderPersonalized(data.personalized);
+    // keşif bölümü hata verdiyse varsayılan liste /api/discover'dan yüklenir
+    homeDiscover = (data.discover && !data.discover.note) ? data.discover : null;
   } catch (e) {
-    // giriş yoksa veya model yoksa sessiz geç
+    // sessiz geç
   }
 }
 
 // ----------------- Sayfa hazır -----------------
 document.addEventListener("DOMContentLoaded", () => {
-  // Öne çıkanlar
-  loadFeatured();
+  // Öne çıkanlar + size özel öneriler
+  loadHome();
   bindFeaturedArrows();
 
-  // Size özel öneriler
-  loadPersonalized();
-
   // ----- FILTRE ELEMANLARI -----
   const btn  = document.getElementById("fetchBtn");
   const genre = document.getElementById("genre");
@@ -139,7 +144,8 @@ document.addEventListener("DOMContentLoaded", () => {
     if (year?.value)  qs.set("year", year.value);
     if (vote?.value)  qs.set("vote_gte", vote.value);
 
-    const data = await fetchJson(`/api/discover?${qs.toString()}`);
+    const isDefault = page === 1 && qs.toString() === "page=1&sort_by=popularity.desc";
+    const data = (isDefault && homeDiscover) ? homeDiscover : await fetchJson(`/api/discover?${qs.toString()}`);
     totalPages = data.total_pages || 1;
 
     if (full && gridFull) {
@@ -189,7 +195,7 @@ document.addEventListener("DOMContentLoaded", () => {
   function render(list) {
     if (!list.length) { box.classList.add("hidden"); box.innerHTML = ""; return; }
     box.innerHTML = list.map((m, idx) => {
-      const img = m.poster_path ? `https://image.tmdb.org/t/p/w185${m.poster_path}` : "";
+      const img = imgUrl(m.poster_path, "thumb");
       const year = (m.release_date || "").slice(0,4);
       const score = (m.vote_average != null) ? m.vote_average.toFixed(1) : "";
       return `
@@ -0,0 +1,3 @@
+# asgi.py
+from app.asgi import create_asgi_app
+app = create_asgi_app()
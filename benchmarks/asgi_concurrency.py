@@ -0,0 +1,159 @@
+"""WSGI (gunicorn 1 worker x 4 thread) ile ASGI modunun tek süreçte eşzamanlılık karşılaştırması.
+
+TMDB yerine sabit gecikmeli sahte bir upstream kullanılır; DB'ye dokunulmaz.
+Her aşama yeni bir Flask uygulamasıyla ve benzersiz sorgularla çalışır; sorgu
+önbelleği (QUERY_CACHE_TTL=0) ve typeahead (TYPEAHEAD_MIN_HITS çok büyük)
+kapalıdır, yani her istek upstream'e gider. Üç aşama:
+
+  wsgi       Flask /api/search_suggest, 4 thread
+  asgi       native async /api/search_suggest (httpx)
+  asgi-wsgi  ASGI içinde WSGI köprüsüne devredilen senkron bir Flask rotası
+             (ASGI_WSGI_THREADS havuzu)
+
+"upstream maks" aynı anda uçuşta olan en yüksek sahte TMDB çağrısı sayısıdır;
+WSGI'de thread sayısıyla sınırlıdır.
+
+    python -m benchmarks.asgi_concurrency --requests 200 --concurrency 100 --latency 0.2
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+import httpx
+import requests
+from flask import Flask, jsonify, request
+
+from app.config import load_config
+from app.blueprints.api import bp as api_bp
+from app.services import tmdb as tmdb_mod
+from app.asgi import create_asgi_app
+
+BODY = {"results": [{"id": i, "title": f"Film {i}", "poster_path": "/p.jpg"} for i in range(20)]}
+
+class InFlight:
+    """Uçuştaki sahte upstream çağrıları ve görülen en yüksek sayı."""
+
+    def __init__(self):
+        self.now = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.now += 1
+            self.peak = max(self.peak, self.now)
+
+    def leave(self):
+        with self.lock:
+            self.now -= 1
+
+def _flask_app():
+    app = Flask("bench")
+    load_config(app)
+    app.config.update(TMDB_RPS=1e6, TMDB_BURST=10**6, TMDB_POOL_SIZE=256,
+                      QUERY_CACHE_TTL=0, TYPEAHEAD_MIN_HITS=10**9, TYPEAHEAD_RETRY_SEC=1e9)
+    app.register_blueprint(api_bp)
+
+    @app.get("/bench/sync_search")
+    def sync_search():
+        # köprü ölçümü: senkron TMDB çağrısı yapan, native karşılığı olmayan rota
+        return jsonify(tmdb_mod.tmdb_get("/search/movie", {"query": request.args["q"]}))
+
+    return app
+
+class _SlowSession:
+    def __init__(self, latency, inflight):
+        self.latency = latency
+        self.inflight = inflight
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.inflight.enter()
+        try:
+            time.sleep(self.latency)
+        finally:
+            self.inflight.leave()
+        r = requests.Response()
+        r.status_code = 200
+        r._content = json.dumps(BODY).encode()
+        return r
+
+def _queries(n):
+    # ortak önek yok: önek daraltması da devreye giremez
+    return [uuid.uuid4().hex for _ in range(n)]
+
+def _report(name, n, wall, lat, inflight):
+    lat.sort()
+    print(f"{name:9s} n={n} wall={wall:.2f}s rps={n / wall:7.1f} "
+          f"p50={lat[len(lat) // 2] * 1000:.0f}ms p99={lat[int(len(lat) * 0.99) - 1] * 1000:.0f}ms "
+          f"eşzamanlılık≈{sum(lat) / wall:.1f} upstream maks={inflight.peak}")
+
+def _use_slow_session(flask_app, latency):
+    inflight = InFlight()
+    tmdb_mod._init(flask_app.config)
+    tmdb_mod._session = _SlowSession(latency, inflight)
+    return inflight
+
+def bench_wsgi(n, latency, threads=4):
+    flask_app = _flask_app()
+    inflight = _use_slow_session(flask_app, latency)
+    qs = _queries(n)
+
+    def one(q):
+        t0 = time.perf_counter()
+        with flask_app.test_client() as c:
+            assert c.get(f"/api/search_suggest?q={q}").status_code == 200
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        lat = list(ex.map(one, qs))
+    _report("wsgi", n, time.perf_counter() - t0, lat, inflight)
+
+async def bench_asgi(n, concurrency, latency, path, name):
+    flask_app = _flask_app()
+    inflight = _use_slow_session(flask_app, latency)
+
+    async def upstream(request):
+        inflight.enter()
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            inflight.leave()
+        return httpx.Response(200, json=BODY)
+
+    app = create_asgi_app(flask_app, tmdb_transport=httpx.MockTransport(upstream), log_events=False)
+    sem = asyncio.Semaphore(concurrency)
+    qs = _queries(n)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+            async def one(q):
+                async with sem:
+                    t0 = time.perf_counter()
+                    r = await c.get(f"{path}?q={q}")
+                    assert r.status_code == 200
+                    return time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            lat = await asyncio.gather(*(one(q) for q in qs))
+    _report(name, n, time.perf_counter() - t0, list(lat), inflight)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=100)
+    ap.add_argument("--latency", type=float, default=0.2, help="sahte TMDB gecikmesi (sn)")
+    args = ap.parse_args()
+
+    bench_wsgi(args.requests, args.latency)
+    asyncio.run(bench_asgi(args.requests, args.concurrency, args.latency, "/api/search_suggest", "asgi"))
+    asyncio.run(bench_asgi(args.requests, args.concurrency, args.latency, "/bench/sync_search", "asgi-wsgi"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Film detay sayfası DB okumaları: eski sıralı yol ile pipeline yolu.
+
+Eski yol: 3 bağlantı, 6 sorgu (yorumlar, 2x COUNT, favori, kendi oyu,
+current_user). Yeni yol: tek bağlantı, 3 sorgu, pipeline ile tek Sync.
+Ağ gecikmesi arttıkça fark büyür; uzak DB'ye karşı ya da
+`tc qdisc ... netem delay` ile deneyin.
+
+    python -m benchmarks.seed --users 200 --movies 300
+    python -m benchmarks.detail_reads --repeat 200 --movie 900001 --user 1
+"""
+import os
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+from flask import Flask
+from app.config import load_config
+from app.db import db
+from app.services.detail_reads import COMMENTS_SQL, movie_detail_reads
+
+def legacy(movie_id, uid, tz):
+    params = {"mid": movie_id, "uid": uid, "tz": tz}
+    with db() as con, con.cursor() as cur:
+        cur.execute(COMMENTS_SQL, params)
+        cur.fetchall()
+    with db() as con, con.cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS c FROM ratings WHERE movie_id=%s AND value=1", (movie_id,))
+        cur.fetchone()
+        cur.execute("SELECT COUNT(*) AS c FROM ratings WHERE movie_id=%s AND value=-1", (movie_id,))
+        cur.fetchone()
+        cur.execute("SELECT 1 FROM favorites WHERE user_id=%s AND movie_id=%s", (uid, movie_id))
+        cur.fetchone()
+        cur.execute("SELECT value FROM ratings WHERE user_id=%s AND movie_id=%s", (uid, movie_id))
+        cur.fetchone()
+    with db() as con, con.cursor() as cur:
+        cur.execute("SELECT id, username, email FROM users WHERE id=%s", (uid,))
+        cur.fetchone()
+
+def measure(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return statistics.median(times) * 1000, times[int(len(times) * 0.95) - 1] * 1000
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--movie", type=int, required=True)
+    ap.add_argument("--user", type=int, required=True)
+    args = ap.parse_args()
+
+    app = Flask("bench")
+    load_config(app)
+    tz = app.config["TZ"]
+    with app.app_context():
+        rows = [("eski (3 bağlantı, 6 sorgu)", lambda: legacy(args.movie, args.user, tz))]
+        for pipeline in (False, True):
+            def run(pipeline=pipeline):
+                app.config["DB_PIPELINE"] = pipeline
+                movie_detail_reads(args.movie, args.user, tz)
+            rows.append((f"tek bağlantı, {'pipeline' if pipeline else 'sıralı'}", run))
+
+        print(f"== Detay okumaları ({args.repeat} tekrar) ==")
+        print(f"{'yol':32s} {'medyan':>9s} {'p95':>9s}")
+        for name, fn in rows:
+            p50, p95 = measure(fn, args.repeat)
+            print(f"{name:32s} {p50:7.2f}ms {p95:7.2f}ms")
+
+if __name__ == "__main__":
+    main()
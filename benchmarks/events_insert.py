@@ -0,0 +1,61 @@
+"""user_events yazma hızı tablo büyüdükçe: düz tablo ile bölümlü tablo.
+
+Her tur --batch satırı tek tek INSERT eder (log_event gibi, satır başına
+commit yok; tur sonunda commit) ve satır/sn raporlar. Bölümlü şemada
+yalnız son bölümün indeksleri güncellendiği için hız tablo büyüdükçe
+sabit kalmalı. Önce istenen şemayla uygulamayı bir kez başlatın:
+
+    EVENTS_PARTITION=off   python -m benchmarks.events_insert --rounds 20 --batch 50000
+    EVENTS_PARTITION=month python -m benchmarks.events_insert --rounds 20 --batch 50000
+
+--backfill-days > 0 ise satırlar geçmiş günlere yayılır (bölümler önceden açılır).
+"""
+import os
+import json
+import time
+import random
+import argparse
+import datetime
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+from app.config import Config
+from app.db import db, init_db
+from app.services.event_partitions import ensure_partitions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=10)
+    ap.add_argument("--batch", type=int, default=20000)
+    ap.add_argument("--backfill-days", type=int, default=0)
+    args = ap.parse_args()
+
+    init_db()
+    rng = random.Random(1)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with db() as con, con.cursor() as cur:
+        if Config.EVENTS_PARTITION != "off" and args.backfill_days:
+            ensure_partitions(cur, Config.EVENTS_PARTITION, Config.EVENTS_PARTITIONS_AHEAD,
+                              since=now - datetime.timedelta(days=args.backfill_days))
+            con.commit()
+        cur.execute("SELECT COUNT(*) AS n FROM user_events")
+        total = cur.fetchone()["n"]
+
+        print(f"== user_events INSERT (EVENTS_PARTITION={Config.EVENTS_PARTITION}) ==")
+        print(f"{'tablo boyutu':>14s} {'satır/sn':>10s}")
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            for _ in range(args.batch):
+                ts = now - datetime.timedelta(seconds=rng.randint(0, args.backfill_days * 86400))
+                cur.execute("""
+                    INSERT INTO user_events(user_id, session_id, event_type, path, method, status,
+                                            ip_hash, ua_hash, referrer, payload, created_at)
+                    VALUES (NULL,%s,'http_request',%s,'GET',200,NULL,NULL,'',%s,%s)
+                """, (f"s{rng.randint(1, 5000)}", f"/movie/{rng.randint(1, 900000)}",
+                      json.dumps({"ms": rng.randint(5, 400)}), ts))
+            con.commit()
+            total += args.batch
+            print(f"{total:>14,} {args.batch / (time.perf_counter() - t0):>10,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Fork öncesi model yükleme (PRELOAD) ile worker başına yükleme: bellek.
+
+Her mod için N worker fork edilir; her worker bir çıkarım yapar ve
+/proc/<pid>/smaps_rollup'tan RSS, PSS (paylaşılan sayfalar bölüştürülmüş) ve
+USS (yalnız o sürece ait) okunur. Toplam PSS, worker sayısı arttıkça gerçek
+bellek artışını gösterir. Yalnız Linux.
+
+    python -m benchmarks.fork_memory --workers 4
+    python -m benchmarks.fork_memory --workers 4 --synthetic-mb 500   # model yoksa
+
+sentence-transformers/transformers kurulu değilse ya da --synthetic-mb
+verilirse model yerine o büyüklükte bir float32 ağırlık matrisi kullanılır.
+"""
+import os
+import sys
+import argparse
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+import numpy as np
+
+def _smaps(pid: int) -> dict:
+    out = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                out[parts[0][:-1]] = int(parts[1]) / 1024.0
+    return out
+
+class Synthetic:
+    def __init__(self, mb: int):
+        rows = max(1, mb * 1024 * 1024 // (4 * 384))
+        self.w = np.random.default_rng(0).standard_normal((rows, 384), dtype=np.float32)
+
+    def infer(self):
+        return float((self.w[:256] @ self.w[0]).sum())
+
+class Real:
+    def __init__(self):
+        from flask import Flask
+        from app.config import load_config
+        from app.services import warmup
+        self.app = Flask("bench")
+        load_config(self.app)
+        warmup.preload(self.app)
+
+    def infer(self):
+        from app.services.embeddings import embed_texts
+        from app import sentiment
+        with self.app.app_context():
+            embed_texts(["bellek ölçümü"])
+        sentiment.analyze("memory benchmark")
+
+def _load(args):
+    if args.synthetic_mb:
+        return Synthetic(args.synthetic_mb)
+    from app.services.embeddings import SBERT_AVAILABLE
+    if not SBERT_AVAILABLE:
+        print("[fork_memory] sentence-transformers yok; --synthetic-mb 500 kullanılıyor")
+        args.synthetic_mb = 500
+        return Synthetic(500)
+    return Real()
+
+def run_mode(args, preload: bool):
+    model = _load(args) if preload else None
+    pids = []
+    release_r, release_w = os.pipe()
+    for _ in range(args.workers):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.close(r)
+                os.close(release_w)
+                m = model or _load(args)
+                m.infer()
+                os.write(w, b"1")
+                os.read(release_r, 1)  # ölçüm bitene kadar bekle (EOF)
+                code = 0
+            finally:
+                os._exit(code)
+        os.close(w)
+        os.read(r, 1)
+        os.close(r)
+        pids.append(pid)
+
+    stats = [_smaps(pid) for pid in pids]
+    parent = _smaps(os.getpid())
+    os.close(release_w)
+    os.close(release_r)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    name = "preload (fork öncesi)" if preload else "worker başına"
+    uss = [s.get("Private_Clean", 0) + s.get("Private_Dirty", 0) for s in stats]
+    pss = sum(s.get("Pss", 0) for s in stats) + (parent.get("Pss", 0) if preload else 0)
+    print(f"{name:24s} RSS/worker={np.mean([s.get('Rss', 0) for s in stats]):8.1f} MB  "
+          f"USS/worker={np.mean(uss):8.1f} MB  toplam PSS={pss:8.1f} MB")
+
+def main():
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("smaps_rollup yok (Linux 4.14+ gerekir)")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--synthetic-mb", type=int, default=0, help="gerçek model yerine bu boyutta ağırlık")
+    args = ap.parse_args()
+
+    print(f"== {args.workers} worker ==")
+    run_mode(args, preload=False)
+    run_mode(args, preload=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Uçtan uca yük testi: gerçek Flask uygulaması + Postgres, TMDB fixture'lardan (replay).
+
+Önce tohumlayın (benchmarks/seed.py), sonra:
+
+    python -m benchmarks.loadtest --threads 8 --duration 30 --fixtures fixtures/bench \\
+        --out benchmarks/results/$(git rev-parse --short HEAD).json \\
+        --compare benchmarks/results/baseline.json
+
+İstekler süreç içinde (Flask test client) sürülür. Böylece her istek için DB
+sorgu/bağlantı sayısı ve TMDB çağrı sayısı, isteği çalıştıran thread'e
+atfedilerek ölçülebilir. Sonuç JSON'u rota bazında throughput, p50/p95/p99,
+hata sayısı ve istek başına DB/TMDB sayaçlarını içerir; --compare ile önceki
+bir koşuya göre gerileme (p95 / rps, --tolerance) raporlanır ve çıkış kodu 1 olur.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+MIXES = {
+    # rota adı -> ağırlık
+    "default": {
+        "home": 20, "detail": 30, "search": 8, "suggest": 10, "discover": 10,
+        "home_api": 6, "personalized": 6, "favorites": 3, "favorite": 4, "rate": 3,
+    },
+    "read_only": {"home": 30, "detail": 40, "search": 10, "suggest": 10, "discover": 10},
+    "logged_in": {"home": 15, "detail": 30, "personalized": 20, "home_api": 10,
+                  "favorites": 10, "favorite": 8, "rate": 7},
+}
+LOGIN_ROUTES = {"personalized", "favorites", "favorite", "rate"}
+SEARCH_WORDS = ("kara", "gece", "yıldız", "şehir", "gölge", "kral", "rüya", "savaş", "ay", "inter")
+
+# ---------------- istek başına sayaçlar ----------------
+
+_tl = threading.local()
+
+def _bump(field):
+    c = getattr(_tl, "counters", None)
+    if c is not None:
+        c[field] += 1
+
+def install_counters():
+    """psycopg ve TMDB replay katmanını thread-yerel sayaçlarla sarar (yalnız bu süreçte)."""
+    import psycopg
+    from app.services import tmdb_replay
+
+    def wrap(cls, name, field):
+        orig = getattr(cls, name)
+
+        def inner(*a, **kw):
+            _bump(field)
+            return orig(*a, **kw)
+        setattr(cls, name, inner)
+
+    wrap(psycopg.Cursor, "execute", "db_queries")
+    wrap(psycopg.Cursor, "executemany", "db_queries")
+    wrap(psycopg.Cursor, "copy", "db_queries")
+    orig_connect = psycopg.Connection.connect.__func__
+
+    def connect(cls, *a, **kw):
+        _bump("db_conns")
+        return orig_connect(cls, *a, **kw)
+    psycopg.Connection.connect = classmethod(connect)
+    psycopg.connect = psycopg.Connection.connect
+    wrap(tmdb_replay.Player, "play", "tmdb_calls")
+
+# ---------------- trafik ----------------
+
+class VirtualUser:
+    def __init__(self, app, uid, rng, movie_ids):
+        self.client = app.test_client()
+        self.uid = uid
+        self.rng = rng
+        self.movie_ids = movie_ids
+        if uid is not None:
+            with self.client.session_transaction() as s:
+                s["user_id"] = uid
+
+    def movie(self):
+        # popüler filmlere yığılan (Zipf benzeri) erişim
+        i = min(int(self.rng.paretovariate(1.1)) - 1, len(self.movie_ids) - 1)
+        return self.movie_ids[i]
+
+    def request(self, route):
+        c, rng = self.client, self.rng
+        if route == "home":
+            return c.get("/" if rng.random() < 0.8 else f"/?page={rng.randint(2, 4)}")
+        if route == "detail":
+            return c.get(f"/movie/{self.movie()}")
+        if route == "search":
+            return c.get(f"/search?q={rng.choice(SEARCH_WORDS)}")
+        if route == "suggest":
+            w = rng.choice(SEARCH_WORDS)
+            return c.get(f"/api/search_suggest?q={w[:rng.randint(2, len(w))]}")
+        if route == "discover":
+            qs = rng.choice(["", "sort_by=vote_average.desc", "genre_id=28", "year=2015", "page=2"])
+            return c.get(f"/api/discover?{qs}")
+        if route == "home_api":
+            return c.get("/api/home")
+        if route == "personalized":
+            return c.get("/api/personalized")
+        if route == "favorites":
+            return c.get("/favorites")
+        if route == "favorite":
+            return c.post(f"/movie/{self.movie()}/favorite")
+        if route == "rate":
+            return c.post(f"/movie/{self.movie()}/rate", data={"value": rng.choice(("like", "dislike"))})
+        raise ValueError(route)
+
+def _load_ids(limit_users):
+    from app.db import db
+    with db() as con, con.cursor() as cur:
+        cur.execute("SELECT id FROM users ORDER BY id LIMIT %s", (limit_users,))
+        uids = [r["id"] for r in cur.fetchall()]
+        cur.execute("""
+            SELECT movie_id FROM candidate_movies
+            ORDER BY (data->>'popularity')::float DESC NULLS LAST
+        """)
+        mids = [r["movie_id"] for r in cur.fetchall()]
+    return uids, mids
+
+def _pct(sorted_vals, p):
+    if not sorted_vals:
+        return None
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p))]
+
+def _summary(samples, wall):
+    lat = sorted(s["ms"] for s in samples)
+    n = len(samples)
+    return {
+        "n": n,
+        "errors": sum(1 for s in samples if s["status"] >= 500),
+        "rps": round(n / wall, 2),
+        "p50_ms": round(_pct(lat, 0.50), 2) if n else None,
+        "p95_ms": round(_pct(lat, 0.95), 2) if n else None,
+        "p99_ms": round(_pct(lat, 0.99), 2) if n else None,
+        "db_queries": round(sum(s["db_queries"] for s in samples) / n, 2) if n else None,
+        "db_conns": round(sum(s["db_conns"] for s in samples) / n, 2) if n else None,
+        "tmdb_calls": round(sum(s["tmdb_calls"] for s in samples) / n, 2) if n else None,
+    }
+
+def run(app, args):
+    mix = MIXES[args.mix]
+    routes, weights = zip(*mix.items())
+    uids, mids = _load_ids(args.users)
+    if not mids:
+        sys.exit("candidate_movies boş; önce benchmarks.seed çalıştırın.")
+
+    stop_at = time.perf_counter() + args.warmup + args.duration
+    measure_from = time.perf_counter() + args.warmup
+    samples = defaultdict(list)
+    lock = threading.Lock()
+
+    def worker(wid):
+        rng = random.Random(args.seed * 1000 + wid)
+        users = {
+            True: VirtualUser(app, rng.choice(uids), rng, mids) if uids else None,
+            False: VirtualUser(app, None, rng, mids),
+        }
+        n = 0
+        while time.perf_counter() < stop_at:
+            n += 1
+            if uids and n % args.rotate_every == 0:
+                users[True] = VirtualUser(app, rng.choice(uids), rng, mids)
+            route = rng.choices(routes, weights=weights)[0]
+            logged_in = route in LOGIN_ROUTES or rng.random() < args.logged_in_share
+            vu = users[logged_in] or users[False]
+            if route in LOGIN_ROUTES and vu.uid is None:
+                continue
+            _tl.counters = defaultdict(int)
+            t0 = time.perf_counter()
+            try:
+                status = vu.request(route).status_code
+            except Exception as e:
+                print(f"[loadtest] {route}: {e}")
+                status = 599
+            ms = (time.perf_counter() - t0) * 1000
+            c, _tl.counters = _tl.counters, None
+            if t0 >= measure_from:
+                with lock:
+                    samples[route].append({"ms": ms, "status": status, **{
+                        k: c[k] for k in ("db_queries", "db_conns", "tmdb_calls")}})
+
+    with ThreadPoolExecutor(max_workers=args.threads) as ex:
+        list(ex.map(worker, range(args.threads)))
+
+    wall = args.duration
+    everything = [s for v in samples.values() for s in v]
+    return {
+        "meta": {
+            "git": _git_rev(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "mix": args.mix, "threads": args.threads, "duration": args.duration,
+            "tmdb_latency_ms": app.config["TMDB_REPLAY_LATENCY_MS"],
+            "users": len(uids), "movies": len(mids),
+        },
+        "total": _summary(everything, wall),
+        "routes": {r: _summary(samples[r], wall) for r in routes if samples[r]},
+    }
+
+def _git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+# ---------------- rapor / karşılaştırma ----------------
+
+def print_report(res):
+    cols = ("n", "rps", "p50_ms", "p95_ms", "p99_ms", "errors", "db_queries", "db_conns", "tmdb_calls")
+    print(f"{'rota':14s}" + "".join(f"{c:>11s}" for c in cols))
+    for name, st in [*res["routes"].items(), ("TOPLAM", res["total"])]:
+        print(f"{name:14s}" + "".join(f"{'-' if st[c] is None else st[c]:>11}" for c in cols))
+
+def compare(res, base, tolerance):
+    """p95 artışı ya da rps düşüşü `tolerance` oranını aşan rotalar."""
+    regressions = []
+    for name, st in [*res["routes"].items(), ("TOPLAM", res["total"])]:
+        old = base["total"] if name == "TOPLAM" else base["routes"].get(name)
+        if not old or not old.get("p95_ms") or not st.get("p95_ms"):
+            continue
+        d_p95 = st["p95_ms"] / old["p95_ms"] - 1
+        d_rps = st["rps"] / old["rps"] - 1 if old["rps"] else 0.0
+        mark = ""
+        if d_p95 > tolerance or d_rps < -tolerance:
+            mark = "  <-- GERİLEME"
+            regressions.append(name)
+        print(f"{name:14s} p95 {old['p95_ms']:8.1f} -> {st['p95_ms']:8.1f} ({d_p95:+.0%})  "
+              f"rps {old['rps']:8.1f} -> {st['rps']:8.1f} ({d_rps:+.0%}){mark}")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=30, help="ölçüm süresi (sn)")
+    ap.add_argument("--warmup", type=float, default=5, help="ölçülmeyen ısınma süresi (sn)")
+    ap.add_argument("--mix", choices=sorted(MIXES), default="default")
+    ap.add_argument("--users", type=int, default=1000, help="kullanılacak en fazla kullanıcı")
+    ap.add_argument("--logged-in-share", type=float, default=0.4)
+    ap.add_argument("--rotate-every", type=int, default=50, help="her thread kaç istekte bir kullanıcı değiştirir")
+    ap.add_argument("--fixtures", default=os.path.join("fixtures", "bench"))
+    ap.add_argument("--tmdb-latency-ms", type=float, default=80)
+    ap.add_argument("--tmdb-error-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="sonuç JSON dosyası")
+    ap.add_argument("--compare", help="karşılaştırılacak önceki sonuç JSON'u")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    os.environ.setdefault("TMDB_API_KEY", "bench")
+    os.environ.update({
+        "TMDB_MODE": "replay",
+        "TMDB_FIXTURES": args.fixtures,
+        "TMDB_REPLAY_LATENCY_MS": str(args.tmdb_latency_ms),
+        "TMDB_REPLAY_ERROR_RATE": str(args.tmdb_error_rate),
+        "TMDB_REPLAY_SEED": str(args.seed),
+        "IMAGE_PREFETCH": "0",
+    })
+    from app import create_app
+    install_counters()
+    app = create_app()
+
+    res = run(app, args)
+    print_report(res)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2, ensure_ascii=False)
+        print(f"\n-> {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        print(f"\n== {args.compare} ({base['meta'].get('git')}) ile karşılaştırma ==")
+        if compare(res, base, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
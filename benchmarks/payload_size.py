@@ -0,0 +1,88 @@
+"""/api/discover yanıtı: kablodaki bayt ve serileştirme CPU karşılaştırması.
+
+Tam TMDB payload'ı (20 sonuç, tüm alanlar) ile kırpılmış kart payload'ı;
+stdlib json ile orjson; sıkıştırmasız, gzip ve (kuruluysa) brotli.
+
+    python -m benchmarks.payload_size --repeat 2000
+"""
+import os
+import json
+import time
+import argparse
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+from flask import Flask
+
+from app.config import load_config
+from app.services.payload import FastJSONProvider, trim_list, compress, orjson, brotli
+
+WORDS = ("bir grup kaşif insanlığın geleceğini kurtarmak için solucan deliğinden geçerek "
+         "yeni bir yaşanabilir gezegen arar zaman uzay aile fedakarlık umut").split()
+
+def _overview(i):
+    # her sonuç için farklı metin: gzip'in tekrarları haksız yere ezmesini önler
+    return " ".join(WORDS[(i * 7 + k * 3) % len(WORDS)] for k in range(60))
+
+def tmdb_discover_page(n=20):
+    return {
+        "page": 1, "total_pages": 500, "total_results": 10000,
+        "results": [{
+            "adult": False,
+            "backdrop_path": f"/backdrop{i}.jpg",
+            "genre_ids": [12, 18, 878],
+            "id": 157336 + i,
+            "original_language": "en",
+            "original_title": f"Interstellar {i}",
+            "overview": _overview(i),
+            "popularity": 140.241 + i,
+            "poster_path": f"/poster{i}.jpg",
+            "release_date": "2014-11-05",
+            "title": f"Yıldızlararası {i}",
+            "video": False,
+            "vote_average": 8.4,
+            "vote_count": 35000 + i,
+        } for i in range(n)],
+    }
+
+def _time(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--level", type=int, default=6)
+    args = ap.parse_args()
+
+    app = Flask("bench")
+    load_config(app)
+    full = tmdb_discover_page()
+    trimmed = trim_list(full)
+
+    print("== Kablodaki bayt ==")
+    for name, obj in (("tam", full), ("kırpılmış", trimmed)):
+        body = json.dumps(obj, separators=(",", ":")).encode()
+        row = f"{name:10s} ham={len(body):6d}B gzip={len(compress(body, 'gzip', args.level)):6d}B"
+        if brotli is not None:
+            row += f" br={len(compress(body, 'br', args.level)):6d}B"
+        print(row)
+
+    print("\n== Serileştirme CPU (µs/yanıt) ==")
+    with app.app_context():
+        std = app.json
+        fast = FastJSONProvider(app)
+        for name, obj in (("tam", full), ("kırpılmış", trimmed)):
+            row = f"{name:10s} stdlib={_time(lambda: std.response(obj).get_data(), args.repeat):7.1f}"
+            if orjson is not None:
+                row += f" orjson={_time(lambda: fast.response(obj).get_data(), args.repeat):7.1f}"
+            print(row)
+        body = fast.response(trimmed).get_data()
+        print(f"\ngzip kırpılmış: {_time(lambda: compress(body, 'gzip', args.level), args.repeat):.1f} µs/yanıt")
+        if brotli is not None:
+            print(f"br   kırpılmış: {_time(lambda: compress(body, 'br', args.level), args.repeat):.1f} µs/yanıt")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Öneri motoru sıcak yolları için mikro benchmark'lar (Postgres ve SBERT gerekmez).
+
+Ölçülenler:
+  embed_texts           batch boyutuna göre
+  ensure_embeddings     soğuk (hepsi hesaplanır) / sıcak (hepsi tabloda)
+  get_candidate_cache   force=True (havuz TMDB yenilemesi hariç)
+  user_profile          get_or_build_user_profile, soğuk profil
+  rank                  api.rank_candidates
+
+SBERT yerine deterministik sahte bir model (hash'lenmiş kelime torbası x sabit
+rastgele projeksiyon) kullanılır; maliyeti metin uzunluğu, batch boyutu ve
+boyutla ölçeklenir. DB, bu yolların attığı sorguları karşılayan bellek içi bir
+stand-in'dir (JSONB sütunları gerçek sürücüdeki gibi json.loads ile çözülür).
+
+    python -m benchmarks.recommender_micro --catalog 500,2000,10000 --signals 20,200 --dim 384
+"""
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+import datetime
+import statistics
+import tracemalloc
+from contextlib import contextmanager
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+import numpy as np
+from flask import Flask
+
+from app.config import load_config
+from app.services import embeddings, recommender
+from app.blueprints import api
+
+WORDS = ("space time love war family robot city dream night ghost king ocean fire "
+         "secret road forest star lost hero island storm shadow empire machine").split()
+
+# ---------------- sahte model ----------------
+
+class FakeSBERT:
+    """SentenceTransformer.encode imzası; hash'lenmiş kelime torbası -> rastgele projeksiyon."""
+
+    def __init__(self, dim=384, vocab=1 << 14, seed=0):
+        rng = np.random.default_rng(seed)
+        self.proj = rng.standard_normal((vocab, dim)).astype(np.float32)
+        self.vocab = vocab
+
+    def _bow(self, texts):
+        m = np.zeros((len(texts), self.vocab), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for w in t.lower().split():
+                m[i, int(hashlib.md5(w.encode()).hexdigest()[:8], 16) % self.vocab] += 1.0
+        return m
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False):
+        out = []
+        for i in range(0, len(texts), batch_size):
+            v = self._bow(texts[i:i + batch_size]) @ self.proj
+            if normalize_embeddings:
+                v /= np.linalg.norm(v, axis=1, keepdims=True) + 1e-9
+            out.append(v)
+        return np.vstack(out) if out else np.zeros((0, self.proj.shape[1]), dtype=np.float32)
+
+# ---------------- bellek içi DB ----------------
+
+class MemoryDB:
+    """Bu benchmark'taki yolların SQL'lerini tanıyan minimal stand-in."""
+
+    def __init__(self):
+        self.embeddings = {}   # movie_id -> (text_hash, json)
+        self.candidates = {}   # movie_id -> data
+        self.favorites = {}    # uid -> [(movie_id, created_at)]
+        self.ratings = {}      # uid -> [(movie_id, value, created_at)]
+        self.trailers = {}     # uid -> [(movie_id, created_at)]
+        self.profiles = {}     # uid -> (signals_hash, json)
+        self.queries = 0
+        self.handlers = [
+            ("SELECT movie_id, text_hash, embedding FROM movie_embeddings", self._emb_full),
+            ("SELECT movie_id, embedding FROM movie_embeddings", self._emb),
+            ("INSERT INTO movie_embeddings", self._emb_put),
+            ("SELECT MAX(updated_at) AS m FROM candidate_movies", lambda p: [{"m": _NOW}]),
+            ("SELECT movie_id, data FROM candidate_movies", self._cand),
+            ("FROM favorites WHERE user_id=%s", self._fav),
+            ("FROM ratings WHERE user_id=%s", self._rat),
+            ("FROM trailer_events", self._trl),
+            ("SELECT signals_hash, embedding FROM user_profiles", self._prof),
+            ("INSERT INTO user_profiles", self._prof_put),
+        ]
+
+    def __call__(self):
+        return _Conn(self)
+
+    def run(self, sql, params):
+        self.queries += 1
+        sql = " ".join(sql.split())
+        for key, fn in self.handlers:
+            if key in sql:
+                self._sql = sql
+                return fn(params or ())
+        raise NotImplementedError(sql)
+
+    def _emb_full(self, p):
+        return [{"movie_id": m, "text_hash": self.embeddings[m][0], "embedding": json.loads(self.embeddings[m][1])}
+                for m in p[0] if m in self.embeddings]
+
+    def _emb(self, p):
+        return [{"movie_id": m, "embedding": json.loads(self.embeddings[m][1])} for m in p[0] if m in self.embeddings]
+
+    def _emb_put(self, p):
+        self.embeddings[p[0]] = (p[1], p[2])
+        return []
+
+    def _cand(self, p):
+        rows = sorted(self.candidates.items(), key=lambda kv: -kv[1].get("pool_weight", 0))
+        return [{"movie_id": m, "data": json.loads(json.dumps(d))} for m, d in rows[:p[0]]]
+
+    def _agg(self, rows, ts_idx):
+        return [{"c": len(rows), "m": max((r[ts_idx] for r in rows), default=None)}]
+
+    def _fav(self, p):
+        rows = self.favorites.get(p[0], [])
+        if "COUNT(*)" in self._sql:
+            return self._agg(rows, 1)
+        return [{"movie_id": m, "created_at": t} for m, t in rows[:60]]
+
+    def _rat(self, p):
+        rows = self.ratings.get(p[0], [])
+        if "COUNT(*)" in self._sql:
+            return self._agg(rows, 2)
+        return [{"movie_id": m, "value": v, "created_at": t} for m, v, t in rows[:250]]
+
+    def _trl(self, p):
+        rows = self.trailers.get(p[0], [])
+        if "GROUP BY" not in self._sql:
+            return self._agg(rows, 1)
+        g = {}
+        for m, t in rows:
+            c, last = g.get(m, (0, t))
+            g[m] = (c + 1, max(last, t))
+        return [{"movie_id": m, "c": c, "last_watch": t} for m, (c, t) in g.items()][:250]
+
+    def _prof(self, p):
+        row = self.profiles.get(p[0])
+        return [{"signals_hash": row[0], "embedding": json.loads(row[1])}] if row else []
+
+    def _prof_put(self, p):
+        self.profiles[p[0]] = (p[1], p[2])
+        return []
+
+class _Conn:
+    def __init__(self, mdb):
+        self.mdb = mdb
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return _Cursor(self.mdb)
+
+    def commit(self):
+        pass
+
+class _Cursor:
+    def __init__(self, mdb):
+        self.mdb = mdb
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.rows = self.mdb.run(sql, params)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+_NOW = datetime.datetime.now(datetime.timezone.utc)
+
+# ---------------- senaryo kurulumu ----------------
+
+def _text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 80)))
+
+def setup(catalog, signals, dim, seed=1):
+    rng = random.Random(seed)
+    mdb = MemoryDB()
+    ids = list(range(1, catalog + 1))
+    texts = {mid: _text(rng) for mid in ids}
+    for mid in ids:
+        mdb.candidates[mid] = {"id": mid, "title": f"Film {mid}", "pool_weight": rng.random()}
+    ago = lambda: _NOW - datetime.timedelta(days=rng.randint(0, 365))
+    mdb.favorites[1] = [(rng.choice(ids), ago()) for _ in range(signals // 4)]
+    mdb.ratings[1] = [(rng.choice(ids), rng.choice((1, -1)), ago()) for _ in range(signals // 2)]
+    mdb.trailers[1] = [(rng.choice(ids), ago()) for _ in range(signals - signals // 4 - signals // 2)]
+
+    embeddings.db = recommender.db = mdb
+    embeddings.movie_texts_en = lambda mids: {m: texts[m] for m in mids if m in texts}
+    model = FakeSBERT(dim=dim)
+    embeddings.sbert = lambda: model
+    recommender.refresh_candidate_pool = lambda force=False: None
+    return mdb, ids, texts
+
+# ---------------- ölçüm ----------------
+
+@contextmanager
+def _peak():
+    tracemalloc.start()
+    box = {}
+    try:
+        yield box
+    finally:
+        box["peak_mb"] = tracemalloc.get_traced_memory()[1] / (1 << 20)
+        tracemalloc.stop()
+
+def measure(fn, repeat, before=None):
+    """(medyan sn, en kötü sn, tepe bellek MB); bellek ayrı bir ön koşuda ölçülür
+    (tracemalloc süreleri şişirdiği için zamanlamaya katılmaz)."""
+    if before:
+        before()
+    with _peak() as box:
+        fn()
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), max(times), box["peak_mb"]
+
+def _row(name, params, res, extra=""):
+    med, worst, peak = res
+    print(f"{name:22s} {params:32s} med={med * 1000:9.2f}ms max={worst * 1000:9.2f}ms "
+          f"peak={peak:7.2f}MB {extra}")
+    return {"bench": name, "params": params, "median_ms": round(med * 1000, 3),
+            "max_ms": round(worst * 1000, 3), "peak_mb": round(peak, 3)}
+
+def run_case(app, catalog, signals, dim, batches, repeat):
+    out = []
+    mdb, ids, texts = setup(catalog, signals, dim)
+    p = f"catalog={catalog} signals={signals} dim={dim}"
+    with app.app_context():
+        sample = [texts[m] for m in ids[:min(512, catalog)]]
+        for bs in batches:
+            out.append(_row("embed_texts", f"n={len(sample)} batch={bs} dim={dim}",
+                            measure(lambda: embeddings.embed_texts(sample, batch_size=bs), repeat)))
+
+        out.append(_row("ensure_embeddings/cold", p,
+                        measure(lambda: embeddings.ensure_embeddings(ids), repeat,
+                                before=mdb.embeddings.clear)))
+        out.append(_row("ensure_embeddings/warm", p, measure(lambda: embeddings.ensure_embeddings(ids), repeat)))
+
+        app.config["CAND_POOL_LIMIT"] = catalog
+        out.append(_row("get_candidate_cache", p,
+                        measure(lambda: recommender.get_candidate_cache(force=True), repeat)))
+
+        q0 = mdb.queries
+        out.append(_row("user_profile/cold", p,
+                        measure(lambda: recommender.get_or_build_user_profile(1), repeat,
+                                before=mdb.profiles.clear),
+                        extra=f"sorgu/çağrı={(mdb.queries - q0) / (repeat + 1):.0f}"))
+        out.append(_row("user_profile/warm", p, measure(lambda: recommender.get_or_build_user_profile(1), repeat)))
+
+        cand = recommender.get_candidate_cache()
+        _sig, user_vec = recommender.get_or_build_user_profile(1)
+        seen = {m for m, *_ in mdb.favorites[1] + mdb.ratings[1] + mdb.trailers[1]}
+        out.append(_row("rank", p, measure(
+            lambda: api.rank_candidates(cand["mat"], cand["ids"], user_vec, seen), max(repeat, 20))))
+    return out
+
+def _ints(s):
+    return [int(x) for x in s.split(",") if x]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--catalog", default="500,2000", help="aday havuzu boyutları")
+    ap.add_argument("--signals", default="20,200", help="kullanıcı başına sinyal sayıları")
+    ap.add_argument("--dim", default="384", help="embedding boyutları")
+    ap.add_argument("--batch", default="16,32,64,128", help="embed_texts batch boyutları")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="sonuç JSON dosyası")
+    args = ap.parse_args()
+
+    app = Flask("bench")
+    load_config(app)
+    results = []
+    for dim in _ints(args.dim):
+        for catalog in _ints(args.catalog):
+            for signals in _ints(args.signals):
+                results += run_case(app, catalog, signals, dim, _ints(args.batch), args.repeat)
+                print()
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+        print(f"-> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Yük testi için Postgres + TMDB fixture tohumlama.
+
+İki kaynak:
+  --from-dump filmdb.sql  -> psql ile gerçek dökümü yükler
+  (varsayılan)            -> ölçeklenebilir sentetik veri (kullanıcı, favori,
+                             puan, yorum, olay) + aynı filmler için sentetik
+                             TMDB fixture'ları (TMDB_MODE=replay ile okunur)
+
+    python -m benchmarks.seed --reset --users 2000 --movies 3000 --fixtures fixtures/bench
+
+Tüm kullanıcıların şifresi BENCH_PASSWORD'dür; e-posta: u<i>@bench.local.
+"""
+import os
+import json
+import random
+import hashlib
+import argparse
+import datetime
+import subprocess
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+from werkzeug.security import generate_password_hash
+
+from app.config import Config
+from app.db import db, init_db, _pg_conninfo
+from app.services.event_partitions import ensure_partitions
+from app.services.tmdb_replay import FixtureStore
+
+BENCH_PASSWORD = "bench-pass"
+MOVIE_ID_BASE = 900000
+GENRES = [
+    (28, "Aksiyon"), (12, "Macera"), (16, "Animasyon"), (35, "Komedi"), (80, "Suç"),
+    (99, "Belgesel"), (18, "Dram"), (10751, "Aile"), (14, "Fantastik"), (36, "Tarih"),
+    (27, "Korku"), (10402, "Müzik"), (9648, "Gizem"), (10749, "Romantik"),
+    (878, "Bilim-Kurgu"), (53, "Gerilim"), (10752, "Savaş"), (37, "Vahşi Batı"),
+]
+WORDS = ("kara gece yıldız son büyük kayıp şehir deniz ateş gölge sessiz uzak kırmızı "
+         "eski yeni sır yol kral orman rüya zaman savaş aşk hayalet dağ ay güneş").split()
+TABLES = ("user_events", "trailer_events", "comments", "ratings", "favorites",
+          "user_recommendations", "user_profiles", "users", "candidate_movies", "movies")
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title()
+
+def synth_movies(n, rng):
+    out = []
+    for i in range(n):
+        mid = MOVIE_ID_BASE + i
+        year = rng.randint(1975, 2025)
+        title = _title(rng)
+        out.append({
+            "id": mid,
+            "title": title,
+            "original_title": title,
+            "original_language": rng.choice(["en", "en", "en", "tr", "fr"]),
+            "overview": " ".join(rng.choice(WORDS) for _ in range(40)).capitalize() + ".",
+            "poster_path": f"/bench{mid}.jpg",
+            "backdrop_path": f"/bench{mid}b.jpg",
+            "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "genre_ids": rng.sample([g for g, _ in GENRES], rng.randint(1, 3)),
+            "popularity": round(rng.paretovariate(1.2) * 10, 3),
+            "vote_average": round(rng.uniform(3, 9), 1),
+            "vote_count": rng.randint(10, 30000),
+            "adult": False,
+            "video": False,
+        })
+    return out
+
+def _page(results, page, size=20):
+    total = max(1, (len(results) + size - 1) // size)
+    return {"page": page, "results": results[(page - 1) * size: page * size],
+            "total_pages": total, "total_results": len(results)}
+
+def _detail(m, rng):
+    return {
+        **{k: v for k, v in m.items() if k != "genre_ids"},
+        "genres": [{"id": g, "name": dict(GENRES)[g]} for g in m["genre_ids"]],
+        "runtime": rng.randint(80, 180),
+        "tagline": "",
+        "videos": {"results": [{"key": "dQw4w9WgXcQ", "site": "YouTube", "type": "Trailer", "iso_639_1": "en"}]},
+        "credits": {"cast": [{"name": _title(rng), "character": _title(rng)} for _ in range(8)], "crew": []},
+        "release_dates": {"results": []},
+    }
+
+def write_fixtures(root, movies, rng):
+    """Uygulamanın çağırdığı her TMDB rotası için en az bir fixture."""
+    store = FixtureStore(root)
+    by_pop = sorted(movies, key=lambda m: -m["popularity"])
+    by_date = sorted(movies, key=lambda m: m["release_date"], reverse=True)
+
+    def put(path, params, body):
+        params = tuple(sorted((k, str(v)) for k, v in params.items()))
+        text = json.dumps(body, ensure_ascii=False)
+        store.put(path, params, 200, {"ETag": f'"{hashlib.sha1(text.encode()).hexdigest()[:16]}"'}, text)
+
+    put("/genre/movie/list", {"language": "tr-TR"}, {"genres": [{"id": g, "name": n} for g, n in GENRES]})
+    for page in range(1, 6):
+        for lang in ("tr-TR", "en-US"):
+            put("/movie/popular", {"language": lang, "page": page}, _page(by_pop, page))
+            put("/movie/now_playing", {"language": lang, "page": page}, _page(by_date, page))
+            put("/movie/top_rated", {"language": lang, "page": page},
+                _page(sorted(movies, key=lambda m: -m["vote_average"]), page))
+            put("/trending/movie/week", {"language": lang, "page": page}, _page(by_pop[::2], page))
+            put("/discover/movie", {"language": lang, "page": page}, _page(by_pop, page))
+    for word in WORDS:
+        hits = [m for m in by_pop if word in m["title"].lower()]
+        put("/search/movie", {"language": "tr-TR", "query": word, "page": 1, "include_adult": False}, _page(hits, 1))
+    for m in movies:
+        detail = _detail(m, rng)
+        put(f"/movie/{m['id']}/recommendations", {"language": "tr-TR", "page": 1},
+            _page(rng.sample(by_pop[:200], min(12, len(by_pop))), 1))
+        put(f"/movie/{m['id']}", {"language": "tr-TR", "append_to_response": "videos,credits,release_dates",
+                                   "include_video_language": "tr-TR,en-US,en,null"}, detail)
+        put(f"/movie/{m['id']}", {"language": "tr-TR"}, detail)
+        put(f"/movie/{m['id']}/videos", {"language": "en-US"}, detail["videos"])
+        put(f"/movie/{m['id']}", {"language": "en-US"}, detail)
+    print(f"[seed] {store.count()} TMDB fixture yazıldı -> {root}")
+
+def _copy(cur, sql, rows):
+    with cur.copy(sql) as cp:
+        for r in rows:
+            cp.write_row(r)
+
+def seed_db(args, movies, rng):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ago = lambda: now - datetime.timedelta(seconds=rng.randint(0, 90 * 86400))
+    pw = generate_password_hash(BENCH_PASSWORD)
+    ids = [m["id"] for m in movies]
+    weights = [m["popularity"] for m in movies]
+
+    with db() as con, con.cursor() as cur:
+        if args.reset:
+            cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        if Config.EVENTS_PARTITION != "off":
+            # olaylar son 90 güne yayılır; geçmiş bölümler önceden açılmalı
+            ensure_partitions(cur, Config.EVENTS_PARTITION, Config.EVENTS_PARTITIONS_AHEAD,
+                              since=now - datetime.timedelta(days=91))
+        _copy(cur, "COPY candidate_movies(movie_id, data, updated_at) FROM STDIN",
+              ((m["id"], json.dumps({**m, "pool_weight": 1.0}), now) for m in movies[:args.pool]))
+        cur.execute("SELECT COALESCE(MAX(id), 0) AS m FROM users")
+        first = cur.fetchone()["m"] + 1
+        _copy(cur, "COPY users(id, username, email, password_hash, created_at) FROM STDIN",
+              ((first + i, f"u{first + i}", f"u{first + i}@bench.local", pw, ago()) for i in range(args.users)))
+        cur.execute("SELECT setval(pg_get_serial_sequence('users','id'), (SELECT MAX(id) FROM users))")
+        uids = range(first, first + args.users)
+
+        def picks(k):
+            return set(rng.choices(ids, weights=weights, k=k))
+
+        _copy(cur, "COPY favorites(user_id, movie_id, created_at) FROM STDIN",
+              ((u, mid, ago()) for u in uids for mid in picks(args.favorites)))
+        _copy(cur, "COPY ratings(user_id, movie_id, value, created_at) FROM STDIN",
+              ((u, mid, rng.choice((1, 1, -1)), ago()) for u in uids for mid in picks(args.ratings)))
+        _copy(cur, "COPY comments(movie_id, user_id, content, is_spoiler, created_at, sentiment_label, sentiment_score) FROM STDIN",
+              ((mid, u, " ".join(rng.choice(WORDS) for _ in range(12)), False, ago(),
+                rng.choice(("POS", "NEG", "NEU")), round(rng.random(), 3))
+               for u in uids for mid in picks(args.comments)))
+        _copy(cur, "COPY trailer_events(user_id, movie_id, created_at) FROM STDIN",
+              ((u, mid, ago()) for u in uids for mid in picks(args.trailers)))
+        _copy(cur, "COPY user_events(user_id, session_id, event_type, path, method, status, payload, created_at) FROM STDIN",
+              ((u, f"s{u}", "http_request", f"/movie/{rng.choice(ids)}", "GET", 200, json.dumps({"ms": rng.randint(5, 400)}), ago())
+               for u in uids for _ in range(args.events)))
+        con.commit()
+        cur.execute("ANALYZE")
+    print(f"[seed] {args.users} kullanıcı, {len(movies)} film (havuz {min(args.pool, len(movies))}) yüklendi.")
+
+def load_dump(path):
+    subprocess.run(["psql", _pg_conninfo(), "-v", "ON_ERROR_STOP=1", "-q", "-f", path], check=True)
+    print(f"[seed] {path} yüklendi.")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--from-dump", help="pg_dump dosyası (ör. filmdb.sql)")
+    ap.add_argument("--reset", action="store_true", help="tabloları önce boşalt")
+    ap.add_argument("--users", type=int, default=500)
+    ap.add_argument("--movies", type=int, default=2000)
+    ap.add_argument("--pool", type=int, default=1000, help="candidate_movies satırı")
+    ap.add_argument("--favorites", type=int, default=8, help="kullanıcı başına")
+    ap.add_argument("--ratings", type=int, default=15, help="kullanıcı başına")
+    ap.add_argument("--comments", type=int, default=3, help="kullanıcı başına")
+    ap.add_argument("--trailers", type=int, default=4, help="kullanıcı başına")
+    ap.add_argument("--events", type=int, default=50, help="kullanıcı başına user_events")
+    ap.add_argument("--fixtures", default=os.path.join("fixtures", "bench"), help="sentetik TMDB fixture dizini")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    if args.from_dump:
+        load_dump(args.from_dump)
+        init_db()
+        return
+
+    rng = random.Random(args.seed)
+    init_db()
+    movies = synth_movies(args.movies, rng)
+    seed_db(args, movies, rng)
+    write_fixtures(args.fixtures, movies, rng)
+
+if __name__ == "__main__":
+    main()
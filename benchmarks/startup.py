@@ -0,0 +1,96 @@
+"""Worker açılış süresi: import, create_app, ilk istek ve (isteğe bağlı) ısınma.
+
+Her tekrar taze bir Python sürecinde ölçülür (import önbelleği yok). Ayrıca
+uygulamanın artık ilk kullanıma ertelediği ML kütüphanelerinin tek başına
+import maliyeti ve açılışta yanlışlıkla yüklenip yüklenmedikleri raporlanır.
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --import-only        # Postgres yoksa
+    python -m benchmarks.startup --warmup sbert,sentiment
+
+create_app() init_db çağırdığı için Postgres gerekir (DATABASE_URL/PG*).
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+os.environ.setdefault("TMDB_API_KEY", "bench")
+
+HEAVY = ("torch", "transformers", "sentence_transformers")
+
+CHILD = r"""
+import sys, time, json
+t0 = time.perf_counter()
+import app
+out = {"import": time.perf_counter() - t0}
+if not IMPORT_ONLY:
+    t = time.perf_counter()
+    a = app.create_app()
+    out["create_app"] = time.perf_counter() - t
+    t = time.perf_counter()
+    status = a.test_client().get("/login").status_code
+    out["first_request"] = time.perf_counter() - t
+    out["status"] = status
+    if WARMUP:
+        from app.services.warmup import run
+        t = time.perf_counter()
+        run(a, WARMUP)
+        out["warmup"] = time.perf_counter() - t
+out["total"] = time.perf_counter() - t0
+out["heavy_loaded"] = [m for m in HEAVY if m in sys.modules]
+print("RESULT " + json.dumps(out))
+"""
+
+def _child(import_only: bool, warmup: list, env: dict) -> dict:
+    code = (f"IMPORT_ONLY = {import_only!r}\nWARMUP = {warmup!r}\nHEAVY = {HEAVY!r}\n" + CHILD)
+    p = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    for line in p.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    raise RuntimeError(f"alt süreç başarısız:\n{p.stderr[-2000:]}")
+
+def _import_cost(mod: str, env: dict):
+    code = f"import time; t=time.perf_counter(); import {mod}; print(time.perf_counter()-t)"
+    p = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    return float(p.stdout.strip()) if p.returncode == 0 else None
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--import-only", action="store_true", help="create_app/ilk istek ölçme (DB gerekmez)")
+    ap.add_argument("--warmup", default="", help="ölçülecek ısınma görevleri, ör. sbert,sentiment")
+    ap.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    args = ap.parse_args()
+
+    env = {**os.environ, "WARMUP": "off", "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    warmup = [t for t in args.warmup.split(",") if t]
+    runs = [_child(args.import_only, warmup, env) for _ in range(args.repeat)]
+
+    print(f"== Açılış ({args.repeat} taze süreç, medyan / en kötü) ==")
+    summary = {}
+    for phase in ("import", "create_app", "first_request", "warmup", "total"):
+        vals = [r[phase] for r in runs if phase in r]
+        if vals:
+            summary[phase] = {"median_ms": round(statistics.median(vals) * 1000, 1),
+                              "max_ms": round(max(vals) * 1000, 1)}
+            print(f"{phase:14s} {summary[phase]['median_ms']:9.1f} ms  {summary[phase]['max_ms']:9.1f} ms")
+    loaded = sorted({m for r in runs for m in r["heavy_loaded"]})
+    print(f"\nAçılışta yüklenen ağır modüller: {', '.join(loaded) if loaded else 'yok'}"
+          f"{' (ısınma dahil)' if warmup else ''}")
+
+    print("\n== Ertelenen import'ların tek başına maliyeti ==")
+    costs = {}
+    for mod in HEAVY:
+        sec = _import_cost(mod, env)
+        costs[mod] = None if sec is None else round(sec * 1000, 1)
+        print(f"{mod:22s} {'kurulu değil' if sec is None else f'{sec * 1000:9.1f} ms'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"phases": summary, "heavy_loaded": loaded, "deferred_import_ms": costs, "runs": runs}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,9 @@ set -e
 
 cd /app
 
+# çok süreçli /metrics: önceki çalıştırmanın worker görüntülerini temizle
+if [ -n "$METRICS_DIR" ]; then
+  mkdir -p "$METRICS_DIR" && rm -f "$METRICS_DIR"/*.json
+fi
+
 exec "$@"
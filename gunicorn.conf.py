@@ -0,0 +1,29 @@
+# gunicorn.conf.py — gunicorn bu dosyayı çalışma dizininden otomatik okur;
+# komut satırı bayrakları buradaki değerleri ezer.
+import gc
+import os
+
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# PRELOAD=1: uygulama (ve model ağırlıkları, bkz. app/services/warmup.py)
+# master'da bir kez yüklenir; worker'lar belleği copy-on-write paylaşır
+preload_app = os.getenv("PRELOAD", "0") == "1"
+if preload_app:
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+def when_ready(server):
+    if preload_app:
+        # master'daki nesneleri GC taramasından çıkar: worker'larda sayfa kopyalanmasın
+        gc.collect()
+        gc.freeze()
+
+def post_fork(server, worker):
+    from app.services.warmup import after_fork
+    after_fork(server.cfg.workers, int(os.getenv("TORCH_THREADS", "0")))
+
+def post_worker_init(worker):
+    # WARMUP=post_fork: modeller worker istek almadan önce ısıtılır
+    from app.services.warmup import on_worker_init
+    on_worker_init(worker.wsgi)
@@ -0,0 +1,5 @@
+# inference_server.py — SBERT + duygu analizi çıkarım sunucusu (bkz. app/services/inference.py)
+from app.services.inference import main
+
+if __name__ == "__main__":
+    main()